@@ -0,0 +1,144 @@
+# agency_classifier.py - Single-pass country/region/specialty matcher for agency listing text
+
+import re
+
+# Canonical country -> every spelling that maps to it (English first, then German and French)
+COUNTRIES = {
+    'Germany': ['Germany', 'Deutschland', 'Allemagne'],
+    'Austria': ['Austria', 'Österreich', 'Autriche'],
+    'Switzerland': ['Switzerland', 'Schweiz', 'Suisse'],
+    'France': ['France', 'Frankreich'],
+    'Italy': ['Italy', 'Italien', 'Italie'],
+    'Spain': ['Spain', 'Spanien', 'Espagne'],
+    'United Kingdom': ['United Kingdom', 'Vereinigtes Königreich', 'Großbritannien', 'Royaume-Uni'],
+    'Netherlands': ['Netherlands', 'Niederlande', 'Pays-Bas'],
+    'Belgium': ['Belgium', 'Belgien', 'Belgique'],
+    'Denmark': ['Denmark', 'Dänemark', 'Danemark'],
+    'Sweden': ['Sweden', 'Schweden', 'Suède'],
+    'Norway': ['Norway', 'Norwegen', 'Norvège'],
+    'Poland': ['Poland', 'Polen', 'Pologne'],
+    'Czech': ['Czech', 'Tschechien', 'Tchéquie'],
+    'Portugal': ['Portugal'],
+    'Greece': ['Greece', 'Griechenland', 'Grèce'],
+    'Ireland': ['Ireland', 'Irland', 'Irlande'],
+    'Finland': ['Finland', 'Finnland', 'Finlande'],
+    'Hungary': ['Hungary', 'Ungarn', 'Hongrie'],
+    'Slovakia': ['Slovakia', 'Slowakei', 'Slovaquie'],
+    'Slovenia': ['Slovenia', 'Slowenien', 'Slovénie'],
+    'Croatia': ['Croatia', 'Kroatien', 'Croatie'],
+    'Bulgaria': ['Bulgaria', 'Bulgarien', 'Bulgarie'],
+    'Romania': ['Romania', 'Rumänien', 'Roumanie'],
+    'Latvia': ['Latvia', 'Lettland', 'Lettonie'],
+    'Lithuania': ['Lithuania', 'Litauen', 'Lituanie'],
+    'Estonia': ['Estonia', 'Estland', 'Estonie'],
+}
+
+REGIONS = ['D/A/CH', 'UK & Ireland', 'Benelux', 'Nordic', 'Iberia']
+
+# Canonical specialty -> spellings, matched case-insensitively
+SPECIALTIES = {
+    'Acting agency': ['Acting agency', 'Schauspielagentur', 'Agence artistique'],
+    'Artist management': ['Artist management', 'Künstlermanagement', "Management d'artistes"],
+    'Model agency': ['Model agency', 'Modelagentur', 'Agence de mannequins'],
+    'Voice Agency': ['Voice Agency', 'Sprecheragentur', 'Agence de voix'],
+    'Young talent': ['Young talent', 'Nachwuchs', 'Jeunes talents'],
+    'Casting': ['Casting'],
+    'Management': ['Management'],
+    'Talent agency': ['Talent agency', 'Talentagentur', 'Agence de talents'],
+}
+
+def trie_pattern(words):
+    """Regex for a set of literal words, factored by common prefix so each position costs one branch"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+    return build(trie)
+
+
+class AgencyClassifier:
+    """Finds country, regions and specialties in an agency's text with one regex scan.
+
+    Every spelling is lowercased into a single prefix-trie regex that is run
+    over the lowercased text; countries and regions are then checked against
+    the original casing, specialties match in any case. Overlapping terms
+    (e.g. 'Management' inside 'Artist management') are all found, exactly
+    like the substring checks this replaces. Results follow the per-line
+    rules of the original parser: the last line naming a country gives
+    country and address, the last line naming a region gives regions, and
+    every line contributes its specialties in keyword order.
+    """
+
+    def __init__(self, countries=COUNTRIES, regions=REGIONS, specialties=SPECIALTIES):
+        self.country_names = list(countries)
+        self.specialty_names = list(specialties)
+
+        # lowercased spelling -> (kind, canonical value, spelling to match exactly or None)
+        self.terms = {}
+        for i, (name, spellings) in enumerate(countries.items()):
+            for spelling in spellings:
+                self.terms[spelling.lower()] = ('country', i, spelling)
+        for region in regions:
+            self.terms[region.lower()] = ('region', region, region)
+        for i, (name, spellings) in enumerate(specialties.items()):
+            for spelling in spellings:
+                self.terms[spelling.lower()] = ('specialty', i, None)
+
+        # The regex reports the longest term at a position; shorter terms starting there ride along
+        self.hits = {term: tuple(self.terms[other] for other in self.terms if term.startswith(other))
+                     for term in self.terms}
+        self.pattern = re.compile(trie_pattern(self.terms))
+
+    def classify(self, text):
+        """Return {'country', 'address', 'regions', 'specialties'} for an agency's text"""
+        lowered = text.lower()
+        if len(lowered) != len(text):  # a few characters lowercase to two; keep offsets aligned
+            lowered = ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        countries = {}  # line -> best country index
+        region_line = None
+        specialties = set()  # (line, specialty index)
+
+        search = self.pattern.search
+        match = search(lowered)
+        while match:
+            start = match.start()
+            line = text.count('\n', 0, start)
+            for kind, value, exact in self.hits[match.group()]:
+                if exact and not text.startswith(exact, start):
+                    continue
+                if kind == 'country':
+                    countries[line] = min(value, countries.get(line, value))
+                elif kind == 'region':
+                    region_line = line
+                else:
+                    specialties.add((line, value))
+            match = search(lowered, start + 1)
+
+        result = {'country': '', 'address': '', 'regions': '', 'specialties': ''}
+        if not (countries or region_line is not None or specialties):
+            return result
+        lines = text.split('\n')
+        if countries:
+            line = max(countries)
+            result['country'] = self.country_names[countries[line]]
+            result['address'] = lines[line].strip()
+        if region_line is not None:
+            result['regions'] = lines[region_line].strip()
+        result['specialties'] = ', '.join(self.specialty_names[i] for line, i in sorted(specialties))
+        return result
+
+
+# Compiled once at import; safe to share across threads
+AGENCY_CLASSIFIER = AgencyClassifier()
@@ -0,0 +1,87 @@
+# agency_enricher.py - Complete filmmakers.eu agencies from their /agents/ profile pages, fetched concurrently
+
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+from http_fetcher import HttpFetcher
+from http_cache import open_cache
+from page_parser import parse_html, parse_agency_profile
+from rate_limiter import PerHostLimiter
+from log import get_logger
+from config import ENRICH_WORKERS, ENRICH_HOST_RATE, ENRICH_HOST_BURST, ENRICH_FIELDS
+
+log = get_logger('agency_enricher')
+
+# Shared by every enricher in the process, so a sharded crawl is paced per site, not per shard
+HOST_LIMITER = PerHostLimiter(ENRICH_HOST_RATE, ENRICH_HOST_BURST)
+
+
+def is_profile_link(url):
+    return '/agents/' in (url or '')
+
+
+def is_missing(agency, field):
+    value = agency.get(field)
+    return not value or (field == 'website' and is_profile_link(value))
+
+
+def needs_profile(agency, fields=ENRICH_FIELDS):
+    """True if the card links a profile and lacks one of `fields`"""
+    return is_profile_link(agency.get('website')) and any(is_missing(agency, field) for field in fields)
+
+
+def fill_missing(agency, profile):
+    """Copy profile fields into the agency where the listing card had nothing (a profile link is no website)"""
+    for field in agency.keys():
+        if profile.get(field) and is_missing(agency, field):
+            agency[field] = profile[field]
+
+
+class AgencyEnricher:
+    """Fetches agency profile pages on a bounded worker pool and fills in what the listing card left out.
+
+    `submit` returns at once, so a crawl can load its next listing page
+    while the profiles come in, and `collect` waits for them. All workers
+    share one pooled fetcher that goes through the HTTP cache, so a repeat
+    crawl costs 304s or nothing, and requests that do reach the network
+    are paced per host by HOST_LIMITER.
+    """
+
+    def __init__(self, workers=ENRICH_WORKERS, fetcher=None, limiter=HOST_LIMITER):
+        self.fetcher = fetcher or HttpFetcher(max_idle_per_host=workers, cache=open_cache(), throttle=limiter.acquire)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enrich')
+
+    def submit(self, agencies):
+        """Start fetching the profile of every agency with missing fields; returns the handle for `collect`"""
+        return [(agency, self.pool.submit(self._fetch_profile, agency)) for agency in agencies if needs_profile(agency)]
+
+    def collect(self, pending):
+        """Wait for submitted profiles and fill the agencies in place; returns how many gained an email"""
+        gained = 0
+        for agency, future in pending:
+            profile = future.result()
+            if profile is None:
+                continue
+            had_email = bool(agency.get('email'))
+            fill_missing(agency, profile)
+            gained += not had_email and bool(agency.get('email'))
+        metrics.count('enriched', len(pending), site='filmmakers')
+        return gained
+
+    def enrich(self, agencies):
+        """Fill the missing fields of each agency from its profile page, in place; returns how many gained an email"""
+        return self.collect(self.submit(agencies))
+
+    def _fetch_profile(self, agency):
+        try:
+            with metrics.span('filmmakers.enrich'):
+                response = self.fetcher.get(agency['website'])
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                return parse_agency_profile(parse_html(response.text), agency['name'], response.url)
+        except Exception as e:
+            log.warning("   ⚠️  Couldn't read the profile of %s: %s", agency['name'], e, url=agency['website'])
+            return None
+
+    def close(self):
+        self.pool.shutdown()
+        self.fetcher.close()
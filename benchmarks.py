@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the scraper hot paths
+Usage: python benchmarks.py [benchmark_name ...]   (no name runs all)
+"""
+
+import os
+import sys
+import time
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _timeit(func, repeat):
+    """Return the best per-call time in seconds over `repeat` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_snapshot_parse():
+    """Per-page cost of snapshot extraction, and the WebDriver calls the element walk issues instead.
+
+    Only the snapshot side is timed here; e2e_benchmark.py --modes snapshot,selenium
+    times both extraction modes in a real browser against the same pages.
+    """
+    from page_parser import parse_html, parse_crew_jobs, find_target_job_nodes
+    from config import TARGET_CATEGORIES
+
+    # A realistic listing page has ~25 jobs; tile the fixture to that size
+    html = _read_fixture('crew_united', 'jobs_page1.html')
+    head, _, rest = html.partition('<ul class="cu-jobs-list">')
+    items, _, tail = rest.partition('</ul>')
+    page = head + '<ul class="cu-jobs-list">' + items * 5 + '</ul>' + tail
+
+    seconds = _timeit(lambda: parse_crew_jobs(page, TARGET_CATEGORIES), repeat=20)
+
+    # WebDriver round-trips the element walk makes for the same page
+    root = parse_html(page)
+    breadcrumbs = sum(1 for span in root.iter('span') if span.has_class('cu-ui-common-breadcrumb-part'))
+    jobs = find_target_job_nodes(root, TARGET_CATEGORIES)
+    rpcs = 1 + breadcrumbs + len(jobs) * 4  # find_elements, .text per breadcrumb, ancestor + text + 2 link lookups per job
+
+    print(f"📄 Page size: {len(page) // 1024} KB, {len(jobs)} target jobs")
+    print(f"⚡ Snapshot parse: {seconds * 1000:.1f} ms/page (1 page_source call)")
+    print(f"🐢 Element walk: ≥{rpcs} WebDriver calls/page (timed by e2e_benchmark.py --modes snapshot,selenium)")
+
+
+# Bytes the page and all of its subresources actually pulled over the network
+TRANSFER_SIZE_SCRIPT = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .forEach(function (entry) { total += entry.transferSize || 0; });
+return total;
+"""
+
+
+def bench_driver_profiles(rounds=3):
+    """Bytes transferred and time per page with the 'normal' vs 'lite' Chrome profile (needs Chrome + network)"""
+    from driver_manager import create_chrome_driver, close_driver
+    from readiness import ReadinessWaiter, DomQuiescence
+    from config import JOBS_URL
+
+    urls = [JOBS_URL, 'https://www.filmmakers.eu/talent_agency_search/new']
+    results = {}
+
+    for profile in ('normal', 'lite'):
+        driver = create_chrome_driver(profile=profile)
+        ready = ReadinessWaiter(driver)
+        try:
+            seconds = []
+            transferred = []
+            for _ in range(rounds):
+                for url in urls:
+                    start = time.perf_counter()
+                    driver.get(url)
+                    ready.wait(url, DomQuiescence(quiet_ms=300))
+                    seconds.append(time.perf_counter() - start)
+                    transferred.append(driver.execute_script(TRANSFER_SIZE_SCRIPT))
+                    driver.get('about:blank')
+            results[profile] = (sum(seconds) / len(seconds), sum(transferred) / len(transferred))
+        finally:
+            close_driver(driver)
+
+    for profile, (avg_seconds, avg_bytes) in results.items():
+        print(f"🌐 {profile:>6}: {avg_seconds:.2f} s/page, {avg_bytes / 1024:.0f} KB/page")
+    normal_seconds, normal_bytes = results['normal']
+    lite_seconds, lite_bytes = results['lite']
+    if normal_bytes and normal_seconds:
+        print(f"📉 lite saves {100 * (1 - lite_bytes / normal_bytes):.0f}% bytes, "
+              f"{100 * (1 - lite_seconds / normal_seconds):.0f}% time per page")
+
+
+def bench_contact_store():
+    """Dedup lookup cost as the contact history grows"""
+    import tempfile
+    from contact_store import ContactStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ContactStore(os.path.join(tmp, 'contacts.db')) as store:
+            size = 0
+            for target in (1_000, 10_000, 100_000, 300_000):
+                store.record([f"user{i}@agency{i % 997}.de" for i in range(size, target)], 'bench')
+                size = target
+                batch = [f"user{i}@agency{i % 997}.de" for i in range(0, size, size // 500)]
+                batch += [f"new{i}@agency.de" for i in range(500)]
+                seconds = _timeit(lambda: store.known(batch), repeat=5)
+                print(f"📇 {size:>7} contacts: {seconds * 1000:.1f} ms per {len(batch)} lookups")
+
+
+def bench_smtp_connection(messages=40):
+    """Messages/sec with a fresh SMTP login per message vs. one persistent connection"""
+    from email_sender import EmailSender
+    from smtp_standin import SMTPStandIn
+
+    # ~50 ms handshake and ~30 ms login, roughly what STARTTLS + AUTH costs against a hosted provider
+    for mode in ('per-message', 'persistent'):
+        with SMTPStandIn(connect_delay=0.05, auth_delay=0.03) as server:
+            sender = EmailSender('127.0.0.1', server.port, use_tls=False)
+            sender.sender_email, sender.password = 'bench@localhost', 'secret'
+            start = time.perf_counter()
+            for i in range(messages):
+                sender._send_email(to_email=f"agency{i}@example.com")
+                if mode == 'per-message':
+                    sender.close()
+            sender.close()
+            seconds = time.perf_counter() - start
+            print(f"✉️  {mode:>11}: {messages / seconds:6.1f} msgs/sec "
+                  f"({server.connections} connections for {server.messages} messages)")
+
+
+def bench_send_rate(messages=40):
+    """Throughput and latency of the paced sender at different concurrency levels"""
+    import tempfile
+    from email_sender import EmailSender
+    from smtp_standin import SMTPStandIn
+
+    with tempfile.TemporaryDirectory() as tmp:
+        email_file = os.path.join(tmp, 'emails.txt')
+        with open(email_file, 'w') as f:
+            f.write('\n'.join(f"agency{i}@example.com" for i in range(messages)))
+
+        # ~100 ms per accepted message, a typical hosted-provider round-trip
+        for concurrency in (1, 4, 8):
+            with SMTPStandIn(connect_delay=0.05, auth_delay=0.03, message_delay=0.1) as server:
+                sender = EmailSender('127.0.0.1', server.port, use_tls=False)
+                sender.sender_email, sender.password = 'bench@localhost', 'secret'
+                if os.path.exists(email_file + '.journal'):
+                    os.remove(email_file + '.journal')  # start each run with an empty outbox
+                print(f"\n🔀 concurrency={concurrency}, rate limit 50 msgs/sec")
+                sender.send_emails_from_file(email_file, rate=50, burst=5, concurrency=concurrency)
+
+
+LEGACY_COUNTRIES = ['Germany', 'Austria', 'Switzerland', 'France', 'Italy', 'Spain', 'United Kingdom',
+                    'Netherlands', 'Belgium', 'Denmark', 'Sweden', 'Norway', 'Poland', 'Czech',
+                    'Portugal', 'Greece', 'Ireland', 'Finland', 'Hungary', 'Slovakia', 'Slovenia',
+                    'Croatia', 'Bulgaria', 'Romania', 'Latvia', 'Lithuania', 'Estonia']
+LEGACY_SPECIALTIES = ['Acting agency', 'Artist management', 'Model agency', 'Voice Agency',
+                      'Young talent', 'Casting', 'Management', 'Talent agency']
+
+
+def _legacy_classify(agency_text, countries=LEGACY_COUNTRIES, specialties_keywords=LEGACY_SPECIALTIES):
+    """The per-line substring checks parse_agency_text used before agency_classifier"""
+    agency_data = {'country': '', 'address': '', 'regions': '', 'specialties': ''}
+    for line in agency_text.split('\n'):
+        line_clean = line.strip()
+        for country in countries:
+            if country in line_clean:
+                agency_data['country'] = country
+                agency_data['address'] = line_clean
+                break
+        if any(region in line_clean for region in ['D/A/CH', 'UK & Ireland', 'Benelux', 'Nordic', 'Iberia']):
+            agency_data['regions'] = line_clean
+        for keyword in specialties_keywords:
+            if keyword.lower() in line_clean.lower():
+                if agency_data['specialties']:
+                    agency_data['specialties'] += f", {keyword}"
+                else:
+                    agency_data['specialties'] = keyword
+    return agency_data
+
+
+def bench_agency_classifier(blocks=5_000):
+    """Single-scan agency classifier vs. the old per-line substring loops"""
+    import random
+    from agency_classifier import AGENCY_CLASSIFIER, COUNTRIES, SPECIALTIES
+
+    rng = random.Random(42)
+    countries = ['Germany', 'Austria', 'United Kingdom', 'Denmark', 'Spain', 'Czech Republic', 'Ireland']
+    regions = ['Regions: D/A/CH', 'Regions: UK & Ireland', 'Regions: Benelux', 'Regions: Nordic countries']
+    specialties = ['Acting agency', 'Artist management', 'Voice Agency, Casting', 'Young talent', 'Model agency']
+    texts = [
+        '\n'.join([
+            f"Agency {i}",
+            f"Street {i}, {rng.randint(10000, 99999)} City, {rng.choice(countries)}",
+            f"+49 30 {rng.randint(100, 999)} {rng.randint(10000, 99999)}",
+            f"info@agency{i}.de",
+            rng.choice(regions),
+            rng.choice(specialties),
+            "Representing actors for film, TV and theatre since 1998",
+        ])
+        for i in range(blocks)
+    ]
+
+    mismatches = sum(1 for text in texts if AGENCY_CLASSIFIER.classify(text) != _legacy_classify(text))
+    legacy = _timeit(lambda: [_legacy_classify(text) for text in texts], repeat=5)
+    # The old loops cost grows with every spelling added; give them the classifier's vocabulary too
+    all_countries = [spelling for spellings in COUNTRIES.values() for spelling in spellings]
+    all_specialties = [spelling for spellings in SPECIALTIES.values() for spelling in spellings]
+    legacy_all = _timeit(lambda: [_legacy_classify(text, all_countries, all_specialties) for text in texts], repeat=5)
+    single_scan = _timeit(lambda: [AGENCY_CLASSIFIER.classify(text) for text in texts], repeat=5)
+
+    print(f"🏢 {blocks} agency blocks, {mismatches} results differ from the old parser")
+    for label, seconds in [("Per-line loops, English names", legacy),
+                           ("Per-line loops, all spellings", legacy_all),
+                           ("Single-scan classifier", single_scan)]:
+        print(f"   {label:<31} {seconds * 1000:7.1f} ms ({seconds / blocks * 1e6:.1f} µs/agency)")
+    print(f"📈 Speedup: {legacy / single_scan:.1f}x vs. the old parser, "
+          f"{legacy_all / single_scan:.1f}x vs. the same loops with every spelling")
+
+
+def bench_dedup(total=100_000, page_size=20):
+    """Per-page dedup cost as a crawl grows to `total` agencies: list scans vs. DedupState"""
+    from dedup import DedupState, agency_email
+
+    def make_page(start):
+        # Half the page repeats earlier agencies, like overlapping listings do
+        return [{'name': f"Agency {i}", 'email': f"info@agency{i}.de"}
+                for i in range(max(0, start - page_size // 2), start + page_size // 2)]
+
+    def old_page(page, all_agencies, all_emails):
+        page_emails = [agency['email'] for agency in page if agency.get('email')]
+        new_emails = [email for email in page_emails if email not in all_emails]
+        existing_emails = {agency['email'] for agency in all_agencies if agency.get('email')}
+        new_agencies = [agency for agency in page if agency.get('email') and agency['email'] not in existing_emails]
+        all_emails.extend(new_emails)
+        all_agencies.extend(new_agencies)
+
+    def new_page(page, all_agencies, all_emails):
+        all_emails.add_all(agency['email'] for agency in page if agency.get('email'))
+        all_agencies.add_all(page)
+
+    # Full 100k crawl with DedupState, timing every page
+    all_agencies, all_emails = DedupState(key=agency_email), DedupState()
+    page_seconds = {}
+    start = 0
+    while len(all_agencies) < total:
+        page = make_page(start)
+        began = time.perf_counter()
+        new_page(page, all_agencies, all_emails)
+        page_seconds[len(all_agencies)] = time.perf_counter() - began
+        start += page_size // 2
+
+    sizes = [1_000, 10_000, total]
+    for size in sizes:
+        # The list version is quadratic, so only time one page at each size
+        old_agencies = [{'name': f"Agency {i}", 'email': f"info@agency{i}.de"} for i in range(size)]
+        old_emails = [agency['email'] for agency in old_agencies]
+        old = _timeit(lambda: old_page(make_page(size), list(old_agencies), list(old_emails)), repeat=3)
+        nearby = [seconds for count, seconds in page_seconds.items() if size * 0.9 <= count <= size]
+        new = sorted(nearby)[len(nearby) // 2]
+        print(f"🧮 {size:>7} agencies collected: lists {old * 1000:8.2f} ms/page, "
+              f"DedupState {new * 1e6:6.1f} µs/page")
+    snapshot_seconds = _timeit(lambda: DedupState.restore(all_agencies.snapshot(), key=agency_email), repeat=3)
+    print(f"💾 Snapshot + restore of {len(all_agencies)} agencies: {snapshot_seconds * 1000:.1f} ms")
+
+
+def bench_records_memory(total=20_000):
+    """Peak memory of a full comprehensive crawl's agencies: 8-key dicts vs. slotted AgencyRecords"""
+    import random
+    import tracemalloc
+    from dedup import DedupState, agency_email
+    from page_parser import parse_agency_text
+    from records import AgencyRecord
+
+    rng = random.Random(7)
+    regions = ['Regions: D/A/CH', 'Regions: UK & Ireland', 'Regions: Benelux', 'Regions: Nordic countries']
+    specialties = ['Acting agency', 'Artist management\nVoice Agency, Casting', 'Young talent', 'Model agency']
+    cards = [(f"Agency {i}", f"https://www.filmmakers.eu/agents/{i}", '\n'.join([
+        f"Agency {i}",
+        f"Street {i}, {rng.randint(10000, 99999)} City, {rng.choice(['Germany', 'Austria', 'Denmark'])}",
+        f"+49 30 {rng.randint(100, 999)} {rng.randint(10000, 99999)}",
+        f"info@agency{i}.de",
+        rng.choice(regions),
+        rng.choice(specialties),
+    ])) for i in range(total)]
+
+    def as_dict(name, website, text):
+        # What the crawl kept before: the same parse filling a plain 8-key dict, nothing interned
+        return parse_agency_text(name, website, text, dict.fromkeys(AgencyRecord.FIELDS, ''))
+
+    def crawl(parse):
+        tracemalloc.start()
+        agencies = DedupState(key=agency_email)
+        for card in cards:
+            agencies.add(parse(*card))
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current, peak
+
+    results = [("Dicts", crawl(as_dict)), ("AgencyRecords", crawl(parse_agency_text))]
+    print(f"🏢 {total} agencies held through a crawl")
+    for label, (current, peak) in results:
+        print(f"   {label:<14} retained {current / 2**20:6.1f} MiB, peak {peak / 2**20:6.1f} MiB "
+              f"({current / total:.0f} B/agency)")
+    (_, (old_current, old_peak)), (_, (new_current, new_peak)) = results
+    print(f"📉 Peak memory {100 * (1 - new_peak / old_peak):.0f}% lower, "
+          f"retained {100 * (1 - new_current / old_current):.0f}% lower")
+
+
+BENCHMARKS = {
+    'snapshot_parse': bench_snapshot_parse,
+    'driver_profiles': bench_driver_profiles,
+    'contact_store': bench_contact_store,
+    'smtp_connection': bench_smtp_connection,
+    'send_rate': bench_send_rate,
+    'agency_classifier': bench_agency_classifier,
+    'dedup': bench_dedup,
+    'records_memory': bench_records_memory,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        print(f"\n⏱️  {name}")
+        print("=" * 50)
+        BENCHMARKS[name]()
@@ -0,0 +1,42 @@
+# checkpoint.py - Atomic JSON checkpoints so long crawls can resume after a crash
+
+import json
+import os
+from datetime import datetime, timedelta
+
+
+class Checkpoint:
+    """A single JSON document rewritten atomically (write temp file, fsync, rename).
+
+    A crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path, max_age_hours=None):
+        self.path = path
+        self.max_age_hours = max_age_hours
+
+    def save(self, state):
+        state = dict(state, saved_at=datetime.now().isoformat(timespec='seconds'))
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """Return the saved state, or None if there is none or it is older than `max_age_hours`"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age_hours is not None:
+            saved_at = datetime.fromisoformat(state.get('saved_at', '1970-01-01T00:00:00'))
+            if datetime.now() - saved_at > timedelta(hours=self.max_age_hours):
+                return None
+        return state
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -6,11 +6,136 @@ JOBS_URL = 'https://www.crew-united.com/en/jobs/'
 
 # Navigation settings
 WAIT_TIMEOUT = 15  # Seconds to wait for elements
-PAGE_LOAD_DELAY = 10  # Seconds to wait for JavaScript to load jobs
+PAGE_LOAD_DELAY = 10  # Max seconds to wait for JavaScript to load jobs
+
+# Readiness detection - waits return as soon as the page is ready, these are upper bounds
+READY_TIMEOUT = 10  # Max seconds for any single readiness wait
+READY_POLL_INTERVAL = 0.1  # Seconds between readiness checks
+CDP_PERFORMANCE_LOG = True  # Record CDP network events so waits can detect network idle
 KEEP_BROWSER_OPEN = 60  # Seconds to keep browser open for inspection
 
+# Crew United job categories to collect - any budget for actors/speakers
+TARGET_CATEGORIES = [
+    "no budget (actors*actresses and speakers)",
+    "low budget (actors*actresses and speakers)",
+    "normal budget (actors*actresses and speakers)"
+]
+
 # Debug settings
 import os as _os
 HEADLESS = _os.environ.get('AUTOMATED', '0') == '1'  # True when run by scheduler
 KEEP_BROWSER_OPEN = 0 if _os.environ.get('AUTOMATED', '0') == '1' else 60
-VERBOSE = True    # Print detailed logs
\ No newline at end of file
+VERBOSE = True    # Print detailed logs
+
+# Logging for the scraping hot paths (see log.py)
+LOG_LEVEL = _os.environ.get('LOG_LEVEL', 'INFO')  # DEBUG adds one line per breadcrumb, email and agency
+LOG_MODULE_LEVELS = dict(  # per-module overrides, e.g. LOG_MODULE_LEVELS=filmmakers_scraper=DEBUG,job_scraper=WARNING
+    item.split('=', 1) for item in _os.environ.get('LOG_MODULE_LEVELS', '').split(',') if '=' in item
+)
+LOG_FORMAT = _os.environ.get('LOG_FORMAT', 'json' if _os.environ.get('AUTOMATED', '0') == '1' else 'text')
+LOG_REPEAT_LIMIT = 20  # Debug lines kept per call site before the rest are suppressed
+
+# Driver startup
+# Resolved chromedriver path is cached so webdriver-manager only runs when the cache goes stale
+DRIVER_CACHE_FILE = '.chromedriver_cache.json'
+DRIVER_CACHE_MAX_AGE_DAYS = 7  # Re-resolve weekly to pick up Chrome updates
+CHROMEDRIVER_PATH = _os.environ.get('CHROMEDRIVER_PATH')  # Pin a binary and skip resolution entirely
+# Attach to a long-lived browser/driver instead of booting one (see `make chrome-daemon`)
+CHROME_DEBUGGER_ADDRESS = _os.environ.get('CHROME_DEBUGGER_ADDRESS')  # e.g. 127.0.0.1:9222
+CHROMEDRIVER_URL = _os.environ.get('CHROMEDRIVER_URL')  # e.g. http://127.0.0.1:9515
+
+# Browser profile: 'lite' skips everything the scrapers never read (images, fonts, media,
+# ads/analytics), disables background services and returns from page loads at DOMContentLoaded.
+# 'normal' loads pages exactly like a regular browser.
+DRIVER_PROFILE = _os.environ.get('DRIVER_PROFILE', 'lite')
+BLOCKED_URL_PATTERNS = [
+    # Images, fonts and media
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.m4a',
+    # Ads and analytics (the consent banner is deliberately not blocked)
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*matomo*', '*piwik*',
+]
+LITE_CHROME_ARGS = [
+    '--disable-background-networking',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-gpu',
+    '--mute-audio',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# Browser identity shared by Chrome and the plain HTTP fetcher
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# Fetch backend per site: 'http' fetches server-rendered pages without a browser
+# (falling back to Chrome when a page needs JavaScript), 'selenium' always uses Chrome
+FETCH_BACKENDS = {
+    'crew_united': 'selenium',  # job list is rendered by JavaScript
+    'filmmakers': _os.environ.get('FILMMAKERS_BACKEND', 'http'),
+}
+
+# Sharded filmmakers.eu crawl: one search per country filter (the form's `country` select), crawled in parallel
+FILMMAKERS_SHARD_COUNTRIES = [
+    'de', 'at', 'ch', 'fr', 'it', 'es', 'gb', 'nl', 'be', 'dk', 'se', 'no', 'pl', 'cz',
+    'pt', 'gr', 'ie', 'fi', 'hu', 'sk', 'si', 'hr', 'bg', 'ro', 'lv', 'lt', 'ee',
+]
+SHARD_WORKERS = int(_os.environ.get('SHARD_WORKERS', '6'))  # Shards crawled at once (and max browsers started)
+
+# Crash recovery: filmmakers.eu crawls checkpoint after every page and resume from it on restart
+FILMMAKERS_CHECKPOINT = 'filmmakers_checkpoint.json'
+CHECKPOINT_MAX_AGE_HOURS = 24  # Older checkpoints are ignored and the crawl starts over
+PROGRESS_FSYNC_EVERY = 50  # Progress-log records per fsync (pages are also synced before each checkpoint)
+
+# Contact history used for dedup across all previous scrapes
+CONTACT_DB_PATH = 'contacts.db'
+
+# Incremental crawling: stop paginating once a page holds only listings seen on earlier runs
+INCREMENTAL_CRAWL = _os.environ.get('INCREMENTAL_CRAWL', '1') == '1'
+FULL_REFRESH_DAYS = int(_os.environ.get('FULL_REFRESH_DAYS', '7'))  # Force a complete crawl at least this often
+DELTA_STOP_AFTER_KNOWN_PAGES = 1  # Consecutive all-known pages before stopping
+
+# On-disk HTTP response cache under the plain HTTP fetcher (see http_cache.py)
+HTTP_CACHE = _os.environ.get('HTTP_CACHE', '1') == '1'
+HTTP_CACHE_PATH = 'http_cache.db'
+HTTP_CACHE_TTL_HOURS = float(_os.environ.get('HTTP_CACHE_TTL_HOURS', '24'))  # Detail pages younger than this skip the network
+HTTP_CACHE_MAX_MB = 200  # Least recently used responses are evicted past this size
+HTTP_CACHE_MAX_AGE_DAYS = 30  # Responses not revalidated for this long are dropped
+
+# Agency enrichment: listing cards missing any of ENRICH_FIELDS are completed from the agency's /agents/ profile page
+ENRICH_AGENCIES = _os.environ.get('ENRICH_AGENCIES', '1') == '1'
+ENRICH_FIELDS = ('email', 'phone', 'address')  # every card links its profile, so a missing own website alone isn't worth a fetch
+ENRICH_WORKERS = int(_os.environ.get('ENRICH_WORKERS', '4'))  # Profile pages fetched at once
+ENRICH_HOST_RATE = float(_os.environ.get('ENRICH_HOST_RATE', '2'))  # Profile requests per second per host (cache hits are free)
+ENRICH_HOST_BURST = 2  # Profile requests allowed back-to-back before pacing kicks in
+ENRICH_MAX_PAGES_BEHIND = int(_os.environ.get('ENRICH_MAX_PAGES_BEHIND', '3'))  # Listing pages the crawl may run ahead of their profiles
+
+# Streaming pipeline: records buffered between scrapers and downstream stages before scrapers block
+PIPELINE_QUEUE_SIZE = int(_os.environ.get('PIPELINE_QUEUE_SIZE', '200'))
+
+# Run metrics: per-phase timings and counters, written as <run>.json and <run>.prom at the end of a run
+METRICS_DIR = _os.environ.get('METRICS_DIR', 'metrics')  # point node_exporter's textfile collector here
+
+# Profiling (--profile on the scraper and sender entry points)
+PROFILE_DIR = _os.environ.get('PROFILE_DIR', '.')  # reports land next to the email/CSV outputs
+PROFILE_TOP_N = 30  # Functions listed in each flat ranking
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples for the flamegraph dump
+
+# Email sending
+SMTP_TIMEOUT = 30  # Seconds before an SMTP command times out
+SMTP_MAX_MESSAGES_PER_CONNECTION = 50  # Reconnect after this many messages to stay under provider limits
+SEND_RATE = float(_os.environ.get('SEND_RATE', '0.5'))  # Messages per second (the old 2 s delay)
+SEND_BURST = int(_os.environ.get('SEND_BURST', '1'))  # Messages allowed back-to-back before pacing kicks in
+SEND_CONCURRENCY = int(_os.environ.get('SEND_CONCURRENCY', '4'))  # Deliveries in flight, one SMTP connection each
+SEND_MAX_ATTEMPTS = 3  # Give up on a recipient after this many tries across runs
+SEND_JOURNAL_FSYNC_EVERY = 20  # Journal lines per fsync; a crash can re-send at most this many
+
+# Extraction settings
+# 'snapshot' parses page_source once per page, 'js' runs one in-browser script per page,
+# 'selenium' walks elements over WebDriver
+EXTRACTION_MODE = _os.environ.get('EXTRACTION_MODE', 'snapshot')
+KEEP_RAW_TEXT = _os.environ.get('KEEP_RAW_TEXT', '1') == '1'  # 0 drops each job's listing text once parsed
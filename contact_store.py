@@ -0,0 +1,175 @@
+# contact_store.py - Indexed SQLite history of every email ever scraped
+
+import os
+import sqlite3
+from datetime import datetime
+from config import CONTACT_DB_PATH
+from log import get_logger
+
+log = get_logger('contact_store')
+
+# SQLite caps bound parameters per statement; look up in chunks below that
+LOOKUP_CHUNK = 500
+
+# Email file prefixes written by the scrapers, most specific first
+FILE_SOURCES = [
+    ('filmmakers_emails_', 'filmmakers'),
+    ('combined_emails_', 'combined'),
+    ('emails_', 'crew_united'),
+]
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+class ContactStore:
+    """Every scraped email with its source, first-seen and last-seen time.
+
+    Dedup is a primary-key lookup over the full history, so its cost stays
+    flat as the history grows.
+    """
+
+    def __init__(self, path=CONTACT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                email TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                times_seen INTEGER NOT NULL DEFAULT 1
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS listings (
+                fingerprint TEXT PRIMARY KEY,
+                site TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def _existing(self, table, column, keys):
+        keys = list(keys)
+        found = set()
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return found
+
+    def known(self, emails):
+        """Return the subset of `emails` (normalized) that has been seen before"""
+        return self._existing('contacts', 'email', {normalize_email(email) for email in emails})
+
+    def record(self, emails, source, seen_at=None):
+        """Insert new emails and bump last_seen for known ones"""
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        rows = [(normalize_email(email), source, seen_at, seen_at) for email in emails if email.strip()]
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO contacts (email, source, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(email) DO UPDATE SET
+                    first_seen = MIN(first_seen, excluded.first_seen),
+                    last_seen = MAX(last_seen, excluded.last_seen),
+                    times_seen = times_seen + 1
+            """, rows)
+
+    def filter_new(self, emails, source):
+        """Return the emails never seen before (order preserved) and record all of them"""
+        known = self.known(emails)
+        new_emails = []
+        seen = set()
+        for email in emails:
+            key = normalize_email(email)
+            if key and key not in known and key not in seen:
+                seen.add(key)
+                new_emails.append(email.strip())
+        self.record(emails, source)
+        return new_emails
+
+    def known_listings(self, fingerprints):
+        """Return the subset of listing fingerprints seen on an earlier crawl"""
+        return self._existing('listings', 'fingerprint', set(fingerprints))
+
+    def record_listings(self, fingerprints, site, seen_at=None):
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO listings (fingerprint, site, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(fingerprint) DO UPDATE SET last_seen = excluded.last_seen
+            """, [(fingerprint, site, seen_at, seen_at) for fingerprint in set(fingerprints)])
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_archive(self, archive_dir="archived_scrapes", force=False):
+        """One-time import of every email file under `archive_dir`.
+
+        Email files in the current directory are not read: runs archive the
+        previous files before scraping, so whatever is there belongs to the
+        current run and must not be counted as already seen.
+        Returns the number of emails read, or 0 if the archive was already imported.
+        """
+        if self.get_meta('archive_imported') and not force:
+            return 0
+
+        paths = []
+        if os.path.exists(archive_dir):
+            for root, dirs, files in os.walk(archive_dir):
+                paths.extend(os.path.join(root, name) for name in files)
+
+        imported = 0
+        for path in paths:
+            name = os.path.basename(path)
+            source = next((src for prefix, src in FILE_SOURCES if name.startswith(prefix)), None)
+            if source is None or not name.endswith('.txt'):
+                continue
+            try:
+                seen_at = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds')
+                with open(path, 'r', encoding='utf-8') as f:
+                    emails = [line.strip() for line in f if line.strip()]
+                self.record(emails, source, seen_at)
+                imported += len(emails)
+            except Exception as e:
+                log.warning("⚠️  Could not import %s: %s", path, e)
+
+        self.set_meta('archive_imported', datetime.now().isoformat(timespec='seconds'))
+        return imported
+
+
+if __name__ == '__main__':
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    with ContactStore() as store:
+        if command == 'import':
+            archive_dir = sys.argv[2] if len(sys.argv) > 2 else "archived_scrapes"
+            count = store.import_archive(archive_dir, force=True)
+            print(f"📥 Imported {count} emails from {archive_dir}")
+        print(f"📇 {store.count()} contacts in {store.path}")
@@ -0,0 +1,54 @@
+# dedup.py - Insertion-ordered dedup state with O(1) membership, shared by the scrapers
+
+class DedupState:
+    """Keeps the first item seen for each key, in the order they arrived.
+
+    `key` maps an item to its dedup key (identity by default). Items whose
+    key is empty are ignored, like agencies without an email. `snapshot`
+    returns a JSON-friendly list that `restore` turns back into the state,
+    which is how checkpoints carry it across a restart.
+    """
+
+    def __init__(self, items=(), key=None):
+        self.key = key
+        self._items = {}  # key -> item; dicts preserve insertion order
+        self.add_all(items)
+
+    def _key(self, item):
+        return self.key(item) if self.key else item
+
+    def add(self, item):
+        """Add `item`; returns True if its key had not been seen"""
+        key = self._key(item)
+        if not key or key in self._items:
+            return False
+        self._items[key] = item
+        return True
+
+    def add_all(self, items):
+        """Add every item; returns the ones that were new, in order"""
+        return [item for item in items if self.add(item)]
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def items(self):
+        return list(self._items.values())
+
+    def snapshot(self):
+        return self.items()
+
+    @classmethod
+    def restore(cls, snapshot, key=None):
+        return cls(snapshot or (), key=key)
+
+
+def agency_email(agency):
+    """Dedup key for agency records"""
+    return agency.get('email')
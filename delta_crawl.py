@@ -0,0 +1,88 @@
+# delta_crawl.py - Incremental crawling: stop paginating once a page holds only known listings
+
+import hashlib
+import re
+from datetime import datetime, timedelta
+from contact_store import ContactStore
+from config import INCREMENTAL_CRAWL, FULL_REFRESH_DAYS, DELTA_STOP_AFTER_KNOWN_PAGES
+from log import get_logger
+
+log = get_logger('delta_crawl')
+
+
+def fingerprint(*parts):
+    """Stable hash of a listing's identifying fields, whitespace- and case-insensitive"""
+    normalized = '\x1f'.join(' '.join(str(part or '').split()).lower() for part in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+# Crew United card lines that change while the posting doesn't: the "NEW" badge and its age
+VOLATILE_LINE = re.compile(r'new|just now|today|yesterday|\d+\s+(second|minute|hour|day|week|month|year)s?\s+old',
+                           re.IGNORECASE)
+
+
+def stable_listing_text(raw_text):
+    """Listing text without the badge and age lines, so a posting keeps its fingerprint as it ages"""
+    return '\n'.join(line for line in (raw_text or '').splitlines() if not VOLATILE_LINE.fullmatch(line.strip()))
+
+
+def job_fingerprint(job):
+    return fingerprint(job.get('email'), job.get('title'), stable_listing_text(job.get('raw_text')))
+
+
+def agency_fingerprint(agency):
+    return fingerprint(agency.get('email'), agency.get('name'), agency.get('website'))
+
+
+def email_fingerprint(email):
+    return fingerprint(email)
+
+
+class DeltaCrawl:
+    """Decides per page whether an incremental crawl can stop.
+
+    Fingerprints seen this run are only written to the contact store in
+    `finish`, once the scraper has its results in hand, so a crawl that
+    crashes before returning is not treated as seen next time.
+    A full crawl is forced every FULL_REFRESH_DAYS (or always, with
+    INCREMENTAL_CRAWL off) to pick up changes further down the catalogue.
+    """
+
+    def __init__(self, site, store=None, incremental=INCREMENTAL_CRAWL, refresh_days=FULL_REFRESH_DAYS,
+                 stop_after=DELTA_STOP_AFTER_KNOWN_PAGES):
+        self.site = site
+        self.store = store or ContactStore()
+        self.owns_store = store is None
+        self.stop_after = stop_after
+        self.seen = []
+        self.known_streak = 0
+
+        last_full = self.store.get_meta(f'full_crawl:{site}')
+        refresh_due = last_full is None or datetime.now() - datetime.fromisoformat(last_full) >= timedelta(days=refresh_days)
+        self.full_refresh = not incremental or refresh_due
+        if self.full_refresh:
+            log.info("🔄 %s: full crawl (last complete crawl: %s)", site, last_full or 'never', site=site)
+        else:
+            log.info("⚡ %s: incremental crawl, stopping at the first page of known listings", site, site=site)
+
+    def should_stop(self, fingerprints):
+        """Record a page's fingerprints; True once `stop_after` pages in a row were all known"""
+        self.seen.extend(fingerprints)
+        if self.full_refresh or not fingerprints:
+            self.known_streak = 0
+            return False
+        if len(self.store.known_listings(fingerprints)) == len(set(fingerprints)):
+            self.known_streak += 1
+        else:
+            self.known_streak = 0
+        return self.known_streak >= self.stop_after
+
+    def finish(self, completed=True):
+        """Persist this run's fingerprints; a full crawl that reached the end resets the refresh clock"""
+        try:
+            self.store.record_listings(self.seen, self.site)
+            if self.full_refresh and completed:
+                self.store.set_meta(f'full_crawl:{self.site}', datetime.now().isoformat(timespec='seconds'))
+        finally:
+            if self.owns_store:
+                self.store.close()
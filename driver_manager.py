@@ -1,73 +1,216 @@
 # driver_manager.py - Phase 1: Chrome Driver Management
 
+import json
+import os
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from config import HEADLESS, VERBOSE
+from selenium.common.exceptions import SessionNotCreatedException
+from config import (HEADLESS, USER_AGENT, CDP_PERFORMANCE_LOG, CHROMEDRIVER_PATH, CHROMEDRIVER_URL,
+                    CHROME_DEBUGGER_ADDRESS, DRIVER_CACHE_FILE, DRIVER_CACHE_MAX_AGE_DAYS,
+                    DRIVER_PROFILE, BLOCKED_URL_PATTERNS, LITE_CHROME_ARGS)
+import metrics
+from log import get_logger
 
-def create_chrome_driver():
-    """Create and configure Chrome driver for scraping"""
+log = get_logger('driver_manager')
+
+# Startup latency of every driver created in this process: [{'mode', 'profile', 'seconds'}, ...]
+startup_timings = []
+
+def resolve_chromedriver_path(refresh=False):
+    """Return a chromedriver binary path, resolving it with webdriver-manager only when the cache is stale.
+
+    `refresh` ignores the cache, e.g. after Chrome updated itself and the cached driver no longer matches.
+    """
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    
+    # Cheap validity check: cached binary still exists, is executable and isn't too old
+    try:
+        if refresh:
+            os.remove(DRIVER_CACHE_FILE)
+        with open(DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        age_days = (time.time() - cached['resolved_at']) / 86400
+        if os.access(cached['path'], os.X_OK) and age_days < DRIVER_CACHE_MAX_AGE_DAYS:
+            log.debug("   → Using cached chromedriver (%.1f days old)", age_days)
+            return cached['path']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    log.info("   → Resolving chromedriver version (cache missing or stale)...")
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    
+    try:
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+    except OSError as e:
+        log.warning("   ⚠️  Could not cache chromedriver path: %s", e)
+    return path
+
+def create_chrome_driver(profile=None, headless=None):
+    """Create and configure Chrome driver for scraping (profile: 'lite' or 'normal', default DRIVER_PROFILE;
+    headless defaults to HEADLESS)"""
+    
+    profile = profile or DRIVER_PROFILE
+    headless = HEADLESS if headless is None else headless
+    
+    log.debug("🔧 Setting up Chrome driver (%s profile)...", profile)
     
-    if VERBOSE:
-        print("🔧 Setting up Chrome driver...")
+    start = time.perf_counter()
     
     # Chrome options
     chrome_options = Options()
     
-    # Browser behavior
-    if HEADLESS:
-        chrome_options.add_argument("--headless")
-        if VERBOSE:
-            print("   → Running in headless mode (no visible browser)")
+    if CHROME_DEBUGGER_ADDRESS:
+        # Attach to a long-lived Chrome (make chrome-daemon) - no browser boot at all.
+        # Launch-time switches don't apply to an already running browser.
+        chrome_options.add_experimental_option("debuggerAddress", CHROME_DEBUGGER_ADDRESS)
+        mode = 'attach'
+        log.debug("   → Attaching to running Chrome at %s", CHROME_DEBUGGER_ADDRESS)
     else:
-        if VERBOSE:
-            print("   → Running with visible browser (you'll see Chrome open)")
-    
-    # Standard options for better compatibility
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    # User agent to look more like a real browser
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
+        mode = 'launch'
+        
+        # Browser behavior
+        if headless:
+            chrome_options.add_argument("--headless")
+            log.debug("   → Running in headless mode (no visible browser)")
+        else:
+            log.debug("   → Running with visible browser (you'll see Chrome open)")
+        
+        # Standard options for better compatibility
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # User agent to look more like a real browser
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        
+        if profile == 'lite':
+            for argument in LITE_CHROME_ARGS:
+                chrome_options.add_argument(argument)
+    
+    if profile == 'lite':
+        # Return from driver.get() at DOMContentLoaded; readiness waits cover the rest
+        chrome_options.page_load_strategy = 'eager'
+    
+    # CDP network events for network-idle readiness detection
+    if CDP_PERFORMANCE_LOG:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
     
     # Create driver
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        if CHROMEDRIVER_URL:
+            # Reuse a chromedriver that is already running - skips binary resolution and process start
+            driver = webdriver.Remote(command_executor=CHROMEDRIVER_URL, options=chrome_options)
+            mode += '+remote-chromedriver'
+        else:
+            try:
+                driver = webdriver.Chrome(service=Service(resolve_chromedriver_path()), options=chrome_options)
+            except SessionNotCreatedException:
+                if CHROMEDRIVER_PATH:
+                    raise
+                # Usually Chrome auto-updated past the cached driver's version: resolve again, once
+                log.warning("   ⚠️  Chrome rejected the cached chromedriver (browser updated?) - resolving it again...")
+                driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(refresh=True)), options=chrome_options)
+        
+        if profile == 'lite':
+            # Requests for these never leave the browser
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                log.warning("   ⚠️  Could not block resources via CDP: %s", e)
         
         # Remove webdriver property to avoid detection
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        try:
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        except Exception:
+            pass  # Already redefined on a page of an attached browser
         
-        if VERBOSE:
-            print("   ✅ Chrome driver created successfully")
+        seconds = time.perf_counter() - start
+        startup_timings.append({'mode': mode, 'profile': profile, 'seconds': round(seconds, 3)})
+        metrics.observe('driver_start', seconds)
+        
+        log.info("   ✅ Chrome driver created successfully in %.2fs (%s)", seconds, mode, seconds=round(seconds, 3), mode=mode)
         
         return driver
         
     except Exception as e:
-        print(f"   ❌ Failed to create Chrome driver: {e}")
+        log.error("   ❌ Failed to create Chrome driver: %s", e)
+        metrics.count('errors', phase='driver_start')
         raise
 
 def close_driver(driver, delay_seconds=0):
     """Close the Chrome driver with optional delay"""
     
     if delay_seconds > 0:
-        if VERBOSE:
-            print(f"⏰ Keeping browser open for {delay_seconds} seconds...")
-            print("   (You can inspect the page during this time)")
+        log.info("⏰ Keeping browser open for %s seconds (you can inspect the page meanwhile)...", delay_seconds)
         
-        import time
         time.sleep(delay_seconds)
     
     if driver:
-        if VERBOSE:
-            print("🚪 Closing Chrome browser...")
+        if CHROME_DEBUGGER_ADDRESS:
+            # Ends the session only; the long-lived browser keeps running for the next run
+            log.debug("🔌 Detaching from Chrome (browser keeps running)...")
+            driver.quit()
+            return
+        log.debug("🚪 Closing Chrome browser...")
         driver.quit()
-        if VERBOSE:
-            print("   ✅ Browser closed")
\ No newline at end of file
+        log.debug("   ✅ Browser closed")
+
+
+class DriverPool:
+    """Bounded pool of Chrome drivers shared by scrapers running concurrently.
+
+    Drivers are created on first demand, so sites that never need a browser
+    (e.g. the filmmakers.eu HTTP backend) never start one. When attaching to
+    a running Chrome (CHROME_DEBUGGER_ADDRESS) every session would drive the
+    same tab, so the pool holds a single driver.
+    """
+    
+    def __init__(self, size=2):
+        import threading
+        if CHROME_DEBUGGER_ADDRESS and size > 1:
+            log.info("   → Attached browser has one tab to drive: scrapers take turns with it")
+            size = 1
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._all = []
+    
+    def acquire(self):
+        """Borrow a driver, blocking while all `size` drivers are in use"""
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            driver = create_chrome_driver()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._all.append(driver)
+        return driver
+    
+    def release(self, driver):
+        """Return a borrowed driver to the pool"""
+        with self._lock:
+            self._idle.append(driver)
+        self._slots.release()
+    
+    def close_all(self):
+        """Quit every driver the pool created"""
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+        for driver in drivers:
+            try:
+                close_driver(driver)
+            except Exception as e:
+                log.warning("   ⚠️  Error closing pooled driver: %s", e)
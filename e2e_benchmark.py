@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark: both scrapers against recorded pages served locally
+Usage: python e2e_benchmark.py [--pages N] [--backend http|selenium|both] [--modes snapshot,js,selenium] [--verbose]
+
+Recorded listing pages (fixtures/) are served with generated pagination and
+the cookie banner, so Crew United navigation, job pagination and the
+filmmakers.eu crawl run exactly as against the live sites, headless. Browser
+runs are repeated for each EXTRACTION_MODE in --modes, so the extraction
+strategies are compared on the same pages. Each run is appended to benchmark_results.jsonl with the commit it measured and
+compared with the last run of a different commit.
+"""
+
+import contextlib
+import functools
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from driver_manager import create_chrome_driver, close_driver
+from navigator import CrewUnitedNavigator
+from job_scraper import CrewUnitedJobScraper
+from filmmakers_scraper import FilmmakersScraper
+from agency_enricher import AgencyEnricher
+from rate_limiter import PerHostLimiter
+from record_log import AppendOnlyLog, replay
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(ROOT, 'fixtures')
+RESULTS_FILE = os.path.join(ROOT, 'benchmark_results.jsonl')
+LOCAL_LIMITER = PerHostLimiter(1000, 10)  # profile fetches; the recorded site is local, no need to be polite
+
+
+def _read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _unique_emails(html, page):
+    """Give every page its own addresses so records stay distinct, as on the live sites"""
+    return re.sub(r'(@|\$_isat_\$)', rf'+p{page}\1', html)
+
+
+def crew_page(page, pages):
+    """Recorded jobs page (cookie banner included) with a next button up to `pages`"""
+    html = _unique_emails(_read_fixture('crew_united', 'jobs_page1.html'), page)
+    if page < pages:
+        html = html.replace('</main>', f'<a class="btn icon icon-chevron-right" href="?page={page + 1}">Next</a></main>')
+    return html
+
+
+def filmmakers_page(page, pages):
+    """Recorded agency page with a 9-item pagination bar whose last item is the next link"""
+    html = _unique_emails(_read_fixture('filmmakers', 'page1.html' if page % 2 else 'page2.html'), page)
+    items = [f'<li class="page-item"><a class="page-link" href="?page={max(page - 1, 1)}">&laquo; Previous</a></li>']
+    items += [f'<li class="page-item{" active" if number == page else ""}"><a class="page-link" href="?page={number}">{number}</a></li>'
+              for number in range(1, 8)]
+    if page < pages:
+        items.append(f'<li class="page-item"><a class="page-link" rel="next" href="?page={page + 1}">Next &raquo;</a></li>')
+    else:
+        items.append('<li class="page-item disabled"><a class="page-link disabled" rel="next" href="#">Next &raquo;</a></li>')
+    nav = '<nav aria-label="Pagination"><ul class="pagination">' + ''.join(items) + '</ul></nav>'
+    return re.sub(r'<nav aria-label="Pagination">.*?</nav>', lambda match: nav, html, flags=re.S)
+
+
+class RecordedSiteHandler(BaseHTTPRequestHandler):
+    """/crew/jobs/?page=N, /filmmakers/search?page=N and /agents/<profile>; counts page views per site"""
+
+    def __init__(self, *args, pages, hits, **kwargs):
+        self.pages = pages
+        self.hits = hits
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        if url.path == '/crew/jobs/':
+            site, body = 'crew', crew_page(page, self.pages)
+        elif url.path == '/filmmakers/search':
+            site, body = 'filmmakers', filmmakers_page(page, self.pages)
+        elif url.path == '/agents/stimmwerk-voices':
+            site, body = 'profiles', _read_fixture('filmmakers', 'agents', 'stimmwerk-voices')
+        else:
+            self.send_error(404)
+            return
+        self.hits[site] = self.hits.get(site, 0) + 1
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_recorded_sites(pages):
+    """Start the local server; returns (server, base_url, hits)"""
+    hits = {}
+    handler = functools.partial(RecordedSiteHandler, pages=pages, hits=hits)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/", hits
+
+
+@contextlib.contextmanager
+def _phase(results, name):
+    """Record the seconds spent in the block as results[name]"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[name] = round(time.perf_counter() - start, 3)
+
+
+def browser_run_name(site, mode):
+    """'crew_united[selenium]' for the default snapshot extraction, '[selenium/js]' and '[selenium/elements]' otherwise"""
+    suffix = {'snapshot': '', 'selenium': '/elements'}.get(mode, '/' + mode)
+    return f"{site}[selenium{suffix}]"
+
+
+def run_crew_united(driver, base_url, hits, mode='snapshot'):
+    result = {}
+    with _phase(result, 'navigation_s'):
+        if not CrewUnitedNavigator(driver, base_url + 'crew/jobs/', base_url + 'crew/jobs/').navigate_to_jobs_page():
+            raise RuntimeError("navigation failed")
+    scraper = CrewUnitedJobScraper(driver, extraction_mode=mode)
+    with _phase(result, 'scrape_s'):
+        jobs = list(scraper.iter_jobs())
+    result.update(pages=hits.get('crew', 0), records=len(jobs), wait_s=round(scraper.ready.total_seconds(), 3))
+    return result
+
+
+def run_filmmakers(driver, backend, base_url, hits, mode='snapshot'):
+    result = {}
+    scraper = FilmmakersScraper(driver, backend=backend, base_url=base_url + 'filmmakers/search', extraction_mode=mode)
+    scraper.enricher = AgencyEnricher(limiter=LOCAL_LIMITER)
+    try:
+        with _phase(result, 'navigation_s'):
+            if not scraper.navigate_and_setup_filters():
+                raise RuntimeError("navigation failed")
+        with _phase(result, 'scrape_s'):
+            agencies, emails = scraper.scrape_all_pages(extract_full_data=True, save_results=False)
+    finally:
+        scraper.close_http()  # the driver belongs to the harness
+        scraper.close_enricher()
+    result.update(pages=hits.get('filmmakers', 0), records=len(agencies), profiles=hits.get('profiles', 0))
+    if scraper.ready and scraper.ready.timings:
+        result['wait_s'] = round(scraper.ready.total_seconds(), 3)
+    return result
+
+
+def git_commit():
+    """(short hash, whether tracked files have uncommitted changes)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '-uno'], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def run_benchmark(pages=10, backends=('http', 'selenium'), modes=('snapshot', 'js', 'selenium'), verbose=False):
+    """Run every scraper against `pages` recorded pages per site, browser runs once per extraction mode;
+    returns the result record"""
+    commit, dirty = git_commit()
+    record = {'at': datetime.now().isoformat(timespec='seconds'), 'commit': commit, 'dirty': dirty,
+              'pages': pages, 'runs': {}}
+    server, base_url, hits = serve_recorded_sites(pages)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    driver = None
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # contact store, checkpoints and progress logs stay out of the repo
+        try:
+            if 'selenium' in backends:
+                try:
+                    with output, _phase(record, 'driver_start_s'):
+                        driver = create_chrome_driver(headless=True)
+                except Exception as e:
+                    record.pop('driver_start_s', None)
+                    print(f"⚠️  Chrome unavailable ({str(e).splitlines()[0]}) - skipping browser runs")
+
+            runs = []
+            if driver:
+                for mode in modes:
+                    runs.append((browser_run_name('crew_united', mode),
+                                 functools.partial(run_crew_united, driver, base_url, hits, mode)))
+            if 'http' in backends:
+                runs.append(('filmmakers[http]', functools.partial(run_filmmakers, None, 'http', base_url, hits)))
+            if driver:
+                for mode in modes:
+                    runs.append((browser_run_name('filmmakers', mode),
+                                 functools.partial(run_filmmakers, driver, 'selenium', base_url, hits, mode)))
+
+            for name, run in runs:
+                hits.clear()
+                try:
+                    with output:
+                        result = run()
+                except Exception as e:
+                    print(f"❌ {name} failed: {str(e)}")
+                    continue
+                result['pages_per_sec'] = round(result['pages'] / result['scrape_s'], 2) if result['scrape_s'] else None
+                record['runs'][name] = result
+        finally:
+            os.chdir(cwd)
+            if driver:
+                close_driver(driver)
+            server.shutdown()
+    return record
+
+
+def previous_result(commit, path=RESULTS_FILE):
+    """The most recent stored result measured on a different commit"""
+    previous = None
+    for record in replay(path):
+        if record.get('commit') != commit:
+            previous = record
+    return previous
+
+
+def report(record, previous=None):
+    print(f"\n📊 End-to-end benchmark @ {record['commit']}{' (uncommitted changes)' if record['dirty'] else ''}, "
+          f"{record['pages']} pages per site")
+    if 'driver_start_s' in record:
+        print(f"   🚗 Chrome start: {record['driver_start_s']:.2f}s")
+    for name, run in record['runs'].items():
+        line = (f"   {name:<31} {run['pages']:>3} pages  {run['records']:>4} records  "
+                f"nav {run['navigation_s']:6.2f}s  scrape {run['scrape_s']:6.2f}s  "
+                f"{run['pages_per_sec'] or 0:7.2f} pages/s")
+        if 'wait_s' in run:
+            line += f"  (waits {run['wait_s']:.2f}s)"
+        before = (previous or {}).get('runs', {}).get(name)
+        if before and before.get('pages_per_sec') and run['pages_per_sec']:
+            change = 100 * (run['pages_per_sec'] / before['pages_per_sec'] - 1)
+            line += f"  {'📈' if change >= 0 else '📉'} {change:+.0f}% vs {previous['commit']}"
+        print(line)
+
+
+def _option(args, name, default):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    backend = _option(args, '--backend', 'both')
+    record = run_benchmark(
+        pages=int(_option(args, '--pages', '10')),
+        backends=('http', 'selenium') if backend == 'both' else (backend,),
+        modes=tuple(_option(args, '--modes', 'snapshot,js,selenium').split(',')),
+        verbose='--verbose' in args,
+    )
+    report(record, previous_result(record['commit']))
+    with AppendOnlyLog(RESULTS_FILE, fsync_every=1) as results:
+        results.append(record)
+    print(f"💾 Result stored in {os.path.basename(RESULTS_FILE)}")
@@ -2,19 +2,44 @@
 import os
 import time
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
+from config import SMTP_MAX_MESSAGES_PER_CONNECTION, SMTP_TIMEOUT, SEND_RATE, SEND_BURST, SEND_CONCURRENCY
+from rate_limiter import TokenBucket
+from send_journal import SendJournal, IN_FLIGHT, SENT, FAILED
+import metrics
+from profiling import maybe_profile, pop_profile_flag
 
 load_dotenv()
 
+# Server replies that mean "this connection is done, try again on a new one"
+# (421 service closing / too many messages, 451 local error, 452 too many recipients this session)
+RECONNECT_CODES = (421, 451, 452)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
 class EmailSender:
-    def __init__(self):
-        self.smtp_server = "smtp.zoho.eu"
-        self.port = 587
+    def __init__(self, smtp_server="smtp.zoho.eu", port=587, use_tls=True):
+        self.smtp_server = smtp_server
+        self.port = port
+        self.use_tls = use_tls
         self.sender_email = os.getenv('ZOHO_EMAIL')
         self.password = os.getenv('ZOHO_APP_PASSWORD')
         
+        # One authenticated connection reused across messages
+        self._server = None
+        self._sent_on_connection = 0
+        self.connections_opened = 0
+        
     def send_single_test(self):
         """Send a test email to yourself"""
         try:
@@ -27,52 +52,163 @@ class EmailSender:
         except Exception as e:
             print(f"❌ Error sending test email: {str(e)}")
             return False
+        finally:
+            self.close()
             
-    def send_emails_from_file(self, email_file, delay=2):
-        """Send emails to all addresses in the file"""
+    def send_emails_from_file(self, email_file, delay=None, rate=SEND_RATE, burst=SEND_BURST,
+                              concurrency=SEND_CONCURRENCY):
+        """Send emails to all addresses in the file, paced by a token bucket with `concurrency` in flight"""
+        if delay is not None:
+            rate, burst = (1 / delay, 1) if delay > 0 else (float('inf'), concurrency)
+        journal = None
         try:
             # Read emails from file
             with open(email_file, 'r') as f:
                 emails = [email.strip() for email in f.readlines() if email.strip()]
                 
+            # Resume from the outbox journal if a previous run was interrupted
+            journal = SendJournal.for_file(email_file)
+            pending = journal.resume(emails)
+            already_sent = sum(1 for email in emails if journal.state(email) == SENT)
+            
             print(f"📧 Found {len(emails)} emails to send")
-            print("Starting email dispatch...")
+            if len(pending) < len(emails):
+                print(f"📒 Resuming from {journal.path}: {already_sent} already sent, "
+                      f"{len(emails) - len(pending) - already_sent} gave up after retries, {len(pending)} to go")
+            print(f"Starting email dispatch ({concurrency} in flight, {rate:g} msgs/sec, burst {burst})...")
             
-            success_count = 0
-            failed_emails = []
+            bucket = TokenBucket(rate, burst) if rate != float('inf') else None
+            workers = []
+            local = threading.local()
+            
+            def worker_sender():
+                # Each worker thread keeps its own persistent SMTP connection
+                if not hasattr(local, 'sender'):
+                    local.sender = EmailSender(self.smtp_server, self.port, self.use_tls)
+                    local.sender.sender_email, local.sender.password = self.sender_email, self.password
+                    workers.append(local.sender)
+                return local.sender
             
-            for i, email in enumerate(emails, 1):
+            def deliver(email):
+                if bucket:
+                    metrics.observe('send.rate_wait', bucket.acquire())
+                journal.mark(email, IN_FLIGHT)
+                started = time.perf_counter()
                 try:
-                    print(f"\nSending email {i}/{len(emails)} to {email}...")
-                    self._send_email(to_email=email)
-                    success_count += 1
-                    print(f"✅ Sent successfully to {email}")
-                    
-                    if i < len(emails):  # Don't delay after the last email
-                        print(f"⏳ Waiting {delay} seconds before next email...")
-                        time.sleep(delay)
-                        
+                    worker_sender()._send_email(to_email=email)
                 except Exception as e:
-                    print(f"❌ Failed to send to {email}: {str(e)}")
-                    failed_emails.append(email)
+                    journal.mark(email, FAILED, error=str(e))
+                    raise
+                journal.mark(email, SENT)
+                return time.perf_counter() - started
+            
+            success_count = 0
+            failed_emails = []
+            latencies = []
+            start = time.perf_counter()
+            
+            try:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = {executor.submit(deliver, email): email for email in pending}
+                    for i, future in enumerate(as_completed(futures), 1):
+                        email = futures[future]
+                        try:
+                            latencies.append(future.result())
+                            success_count += 1
+                            metrics.count('emails', status='sent')
+                            print(f"✅ [{i}/{len(pending)}] Sent successfully to {email}")
+                        except Exception as e:
+                            print(f"❌ [{i}/{len(pending)}] Failed to send to {email}: {str(e)}")
+                            failed_emails.append(email)
+                            metrics.count('emails', status='failed')
+            finally:
+                for sender in workers:
+                    sender.close()
+            
+            elapsed = time.perf_counter() - start
                     
             # Print summary
             print("\n📊 Email Sending Summary")
             print("=" * 50)
             print(f"Total emails: {len(emails)}")
             print(f"Successfully sent: {success_count}")
+            if already_sent:
+                print(f"Sent in earlier runs: {already_sent}")
             print(f"Failed: {len(failed_emails)}")
+            if elapsed > 0:
+                print(f"Achieved rate: {success_count / elapsed:.2f} msgs/sec over {elapsed:.1f}s")
+            if latencies:
+                print(f"Latency p50/p90/p99: {percentile(latencies, 50):.2f}s / "
+                      f"{percentile(latencies, 90):.2f}s / {percentile(latencies, 99):.2f}s")
             
             if failed_emails:
                 print("\nFailed email addresses:")
                 for email in failed_emails:
                     print(f"- {email}")
                     
-            return success_count == len(emails)
+            return success_count + already_sent == len(emails)
             
         except Exception as e:
             print(f"❌ Error in email sending process: {str(e)}")
             return False
+        finally:
+            if journal:
+                journal.close()
+            self.close()
+    
+    @metrics.timed('smtp.connect')
+    def _connect(self):
+        """Open and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.port, timeout=SMTP_TIMEOUT)
+        if self.use_tls:
+            server.starttls()
+        server.login(self.sender_email, self.password)
+        self.connections_opened += 1
+        return server
+    
+    def _drop_connection(self):
+        """Close the current connection, ignoring errors from an already dead socket"""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                try:
+                    self._server.close()
+                except Exception:
+                    pass
+        self._server = None
+        self._sent_on_connection = 0
+    
+    @metrics.timed('smtp.send')
+    def _deliver(self, msg):
+        """Send over the persistent connection, reconnecting once on drops or server-imposed limits"""
+        for attempt in range(2):
+            if self._server is not None and self._sent_on_connection >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                self._drop_connection()  # stay under the provider's per-connection limit
+            
+            if self._server is None:
+                self._server = self._connect()
+            
+            try:
+                if self._sent_on_connection:
+                    self._server.rset()  # clean transaction state between messages
+                self._server.send_message(msg)
+                self._sent_on_connection += 1
+                return
+            except smtplib.SMTPRecipientsRefused:
+                raise  # a bad address, not a connection problem
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                self._drop_connection()
+                if attempt:
+                    raise
+            except smtplib.SMTPResponseException as e:
+                self._drop_connection()
+                if attempt or e.smtp_code not in RECONNECT_CODES:
+                    raise
+    
+    def close(self):
+        """Quit the persistent SMTP connection"""
+        self._drop_connection()
             
     def _send_email(self, to_email, is_test=False):
         """Send single email"""
@@ -97,31 +233,45 @@ Wilfredo"""
             
         msg.attach(MIMEText(body, 'plain'))
         
-        # Create SMTP session and send
-        server = smtplib.SMTP(self.smtp_server, self.port)
-        server.starttls()
-        server.login(self.sender_email, self.password)
-        server.send_message(msg)
-        server.quit()
+        # Send over the shared authenticated connection
+        self._deliver(msg)
+
+def _option(args, name, cast, default):
+    """Pop `--name value` from args, returning the cast value or `default`"""
+    if name in args:
+        index = args.index(name)
+        value = cast(args[index + 1])
+        del args[index:index + 2]
+        return value
+    return default
+
 
 if __name__ == "__main__":
     import sys
     
     sender = EmailSender()
+    profile = pop_profile_flag()
+    args = sys.argv[1:]
+    rate = _option(args, '--rate', float, SEND_RATE)
+    burst = _option(args, '--burst', int, SEND_BURST)
+    concurrency = _option(args, '--concurrency', int, SEND_CONCURRENCY)
     
-    if len(sys.argv) < 2:
+    if len(args) < 1:
         print("Usage:")
         print("  Test email:   python email_sender.py test")
         print("  Send emails:  python email_sender.py send path/to/emails.txt [delay_seconds]")
+        print("                  [--rate msgs_per_sec] [--burst n] [--concurrency n] [--profile]")
         sys.exit(1)
         
-    command = sys.argv[1]
+    command = args[0]
     
     if command == "test":
         sender.send_single_test()
     elif command == "send":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("❌ Please provide the path to the email file")
             sys.exit(1)
-        delay = int(sys.argv[3]) if len(sys.argv) > 3 else 2
-        sender.send_emails_from_file(sys.argv[2], delay)
+        delay = float(args[2]) if len(args) > 2 else None
+        with maybe_profile('send', profile):
+            sender.send_emails_from_file(args[1], delay, rate=rate, burst=burst, concurrency=concurrency)
+        metrics.emit('send')
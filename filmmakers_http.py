@@ -0,0 +1,67 @@
+# filmmakers_http.py - Browserless fetch backend for filmmakers.eu listing pages
+
+from urllib.parse import urljoin
+from http_fetcher import HttpFetcher
+from page_parser import (parse_html, parse_filmmakers_agencies, extract_page_emails,
+                         find_filmmakers_pagination, find_filmmakers_next_link,
+                         filmmakers_page_has_results)
+from log import get_logger
+
+log = get_logger('filmmakers_http')
+
+
+class NeedsJavaScript(Exception):
+    """Raised when a page can't be scraped from its HTML and needs a real browser"""
+
+
+class FilmmakersHttpSession:
+    """Walks the filmmakers.eu agency listing over plain HTTP, one parsed page at a time"""
+
+    def __init__(self, start_url, fetcher=None):
+        self.start_url = start_url
+        self.fetcher = fetcher or HttpFetcher()
+        self.url = None
+        self.root = None
+
+    def load(self, url):
+        """Fetch and parse a listing page; raise NeedsJavaScript if it isn't server-rendered"""
+        response = self.fetcher.get(url, max_age=0)  # listings change between runs; revalidate every time
+        if response.status != 200:
+            raise NeedsJavaScript(f"HTTP {response.status} for {url}")
+
+        root = parse_html(response.text)
+        if not parse_filmmakers_agencies(root) and find_filmmakers_pagination(root) is None:
+            raise NeedsJavaScript(f"No server-rendered agency list at {url}")
+
+        self.url = response.url
+        self.root = root
+        log.debug("   🌐 Fetched %s (%d KB, no browser)", url, len(response.body) // 1024, url=url)
+
+    def open_first_page(self):
+        self.load(self.start_url)
+
+    def has_results(self):
+        return filmmakers_page_has_results(self.root)
+
+    def extract_agencies(self):
+        return parse_filmmakers_agencies(self.root, self.url)
+
+    def extract_emails(self):
+        """Return (page_text, mailto_hrefs) like the Selenium path reads them"""
+        return extract_page_emails(self.root)
+
+    def next_page(self):
+        """Follow the 'next' link. Returns False on the last page."""
+        link = find_filmmakers_next_link(self.root)
+        if link is None or 'disabled' in link.get('class', ''):
+            return False
+
+        href = link.get('href', '').strip()
+        if not href or href == '#' or href.startswith('javascript:'):
+            raise NeedsJavaScript("Next page is only reachable through JavaScript")
+
+        self.load(urljoin(self.url, href))
+        return True
+
+    def close(self):
+        self.fetcher.close()
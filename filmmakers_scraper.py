@@ -4,23 +4,77 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException
-from config import WAIT_TIMEOUT, VERBOSE
+from config import (WAIT_TIMEOUT, EXTRACTION_MODE, FETCH_BACKENDS, FILMMAKERS_CHECKPOINT,
+                    CHECKPOINT_MAX_AGE_HOURS, PROGRESS_FSYNC_EVERY, ENRICH_AGENCIES, ENRICH_MAX_PAGES_BEHIND)
+from page_parser import (new_agency_data, parse_agency_text, parse_html, parse_filmmakers_agencies,
+                         extract_page_emails, EMAIL_PATTERN)
+from js_extractor import extract_agencies_js, extract_page_emails_js
+from filmmakers_http import FilmmakersHttpSession
+from http_fetcher import HttpFetcher
+from http_cache import open_cache
+from agency_enricher import AgencyEnricher
+from readiness import ReadinessWaiter, DomQuiescence, RecordCount, StalenessOf
+from delta_crawl import DeltaCrawl, agency_fingerprint, email_fingerprint
+from checkpoint import Checkpoint
+from record_log import AppendOnlyLog, replay
+from dedup import DedupState, agency_email
+from records import AgencyRecord, write_csv
+import metrics
+from profiling import maybe_profile, pop_profile_flag
+from log import get_logger
 import re
+import os
 import time
-import csv
+from collections import deque
 from datetime import datetime
 
+log = get_logger('filmmakers_scraper')
+
 class FilmmakersScraper:
     
-    def __init__(self, driver):
+    def __init__(self, driver, backend=None, driver_pool=None, shard=None, base_url=None, extraction_mode=None):
         self.driver = driver
-        self.base_url = "https://www.filmmakers.eu/talent_agency_search/new"
+        self.extraction_mode = extraction_mode or EXTRACTION_MODE  # how the 'selenium' backend reads a page
+        self.driver_pool = driver_pool  # borrow Chrome from a DriverPool instead of starting one
+        self.base_url = base_url or "https://www.filmmakers.eu/talent_agency_search/new"
+        self.shard = shard  # (name, query string) to crawl one filtered slice of the search
+        if shard:
+            self.base_url += f"?{shard[1]}"
+        self.checkpoint_path = FILMMAKERS_CHECKPOINT.replace('.json', f"_{shard[0]}.json") if shard else FILMMAKERS_CHECKPOINT
+        self.resumed = None  # checkpoint state this crawl picked up from
+        self.restored_records = []  # progress-log records collected before the restart
+        self.resume_seconds = None
         self.start_page = 1  # Can be overridden
+        self.backend = backend or FETCH_BACKENDS['filmmakers']
+        self.http = None  # FilmmakersHttpSession when using the 'http' backend
+        self.ready = ReadinessWaiter(driver) if driver else None
+        self.record_sink = None  # called with each new record as its page is scraped (streaming pipeline)
+        self.enricher = None  # AgencyEnricher, started with the first page that has incomplete agencies
         
+    @metrics.timed('filmmakers.navigation')
     def navigate_and_setup_filters(self):
         """Navigate to filmmakers.eu talent agency search"""
-        if VERBOSE:
-            print("🌐 Navigating to filmmakers.eu talent agency search...")
+        log.info("🌐 Navigating to filmmakers.eu talent agency search...")
+        
+        if self.backend == 'http':
+            try:
+                self.http = FilmmakersHttpSession(self.base_url, HttpFetcher(cache=open_cache()))
+                self.http.open_first_page()
+                log.info("✅ Page fetched over HTTP (no browser needed)")
+                log.info(self.scope_message())
+                return True
+            except Exception as e:
+                log.warning("⚠️  HTTP backend can't handle the search page (%s) - falling back to Chrome", e)
+                self.close_http()
+                self.backend = 'selenium'
+        
+        if self.driver is None:
+            if self.driver_pool:
+                self.driver = self.driver_pool.acquire()
+            else:
+                from driver_manager import create_chrome_driver
+                self.driver = create_chrome_driver()
+            self.ready = ReadinessWaiter(self.driver)
             
         try:
             # Navigate to the search page
@@ -31,95 +85,57 @@ class FilmmakersScraper:
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            if VERBOSE:
-                print("✅ Page loaded successfully")
-                print("🌍 Will scrape ALL regions for maximum email coverage")
+            log.info("✅ Page loaded successfully")
+            log.info(self.scope_message())
             
             return True
             
         except Exception as e:
-            print(f"❌ Error during navigation: {str(e)}")
+            log.error("❌ Error during navigation: %s", e)
             return False
     
-    def scrape_all_pages(self, extract_full_data=False):
+    def scope_message(self):
+        if self.shard:
+            return f"🧩 Will scrape shard '{self.shard[0]}' ({self.shard[1]})"
+        return "🌍 Will scrape ALL regions for maximum email coverage"
+    
+    def scrape_all_pages(self, extract_full_data=False, save_results=True):
         """Scrape all pages of talent agencies and extract emails or full agency data"""
-        all_emails = []
-        all_agencies = []
         page = getattr(self, 'start_page', 1)  # Start from specified page or page 1
         max_pages = 100  # Safety limit
+        delta = DeltaCrawl(f"filmmakers:{self.shard[0]}" if self.shard else 'filmmakers')
+        stopped_early = False
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S') + (f"_{self.shard[0]}" if self.shard else '')
+        
+        # Progressive save: every new record is appended to a JSONL log (a resumed crawl keeps its log)
+        progress_path = self.resumed['progress_log'] if self.resumed else f'filmmakers_progress_{timestamp}.jsonl'
+        restored = self.restored_records if self.resumed else []
         
-        # Create progressive save file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        progressive_filename = f'filmmakers_emails_progress_{timestamp}.txt'
-        progressive_csv_filename = f'filmmakers_agencies_progress_{timestamp}.csv'
+        # Insertion-ordered with O(1) lookups, so dedup cost per page stays flat
+        all_emails = DedupState(record['email'] for record in restored)
+        all_agencies = DedupState(restored if extract_full_data else (), key=agency_email)
+        progress = AppendOnlyLog(progress_path, fsync_every=PROGRESS_FSYNC_EVERY)
+        # Pages whose agencies wait for their profiles, oldest first: [page, agencies, enrichment, checkpoint].
+        # The crawl keeps paginating meanwhile; pages are recorded and checkpointed in order as profiles arrive.
+        backlog = deque()
         
         try:
             while page <= max_pages:
-                if VERBOSE:
-                    print(f"\n📖 Processing Page {page}")
-                    print("=" * 30)
+                log.info("📖 Processing page %d", page, page=page)
                 
                 # Check if we're actually on a valid page with content
-                try:
-                    # Look for the pagination container to verify page loaded
-                    pagination = self.driver.find_element(By.XPATH, "/html/body/main/div/div[3]/nav/ul")
-                    
-                    # Check if page has agency content
-                    page_text = self.driver.find_element(By.TAG_NAME, "body").text
-                    
-                    # If page shows no results or error, we've reached the end
-                    if ("no results" in page_text.lower() or 
-                        "not found" in page_text.lower() or
-                        len(page_text.strip()) < 500):  # Very short page likely means no content
-                        
-                        if VERBOSE:
-                            print("🏁 Reached end - no more content or invalid page")
-                        break
-                        
-                except Exception as e:
-                    if VERBOSE:
-                        print(f"🏁 Cannot find pagination or page content: {str(e)}")
+                if not self.page_has_results():
                     break
+                metrics.count('pages', site='filmmakers')
                 
                 # Extract data from current page
                 if extract_full_data:
                     page_agencies = self.extract_agencies_from_page()
+                    # Fingerprints come from the listing cards, before enrichment changes them
+                    page_fingerprints = [agency_fingerprint(agency) for agency in page_agencies]
                     
                     if page_agencies:
-                        # Extract just emails for compatibility
-                        page_emails = [agency['email'] for agency in page_agencies if agency.get('email')]
-                        
-                        # Filter out duplicates
-                        new_emails = [email for email in page_emails if email not in all_emails]
-                        new_agencies = []
-                        
-                        # Filter out duplicate agencies based on email
-                        existing_emails = {agency['email'] for agency in all_agencies if agency.get('email')}
-                        for agency in page_agencies:
-                            if agency.get('email') and agency['email'] not in existing_emails:
-                                new_agencies.append(agency)
-                        
-                        all_emails.extend(new_emails)
-                        all_agencies.extend(new_agencies)
-                        
-                        # Progressive save every 10 pages only (not every page)
-                        if page % 10 == 0:
-                            try:
-                                if all_agencies:
-                                    self.save_agencies_to_csv(all_agencies, f"{timestamp}_backup_page_{page}")
-                                if VERBOSE:
-                                    print(f"💾 Backup saved after page {page}")
-                            except Exception as e:
-                                if VERBOSE:
-                                    print(f"⚠️  Could not save backup: {str(e)}")
-                        elif VERBOSE:
-                            print(f"💾 Progress tracking (will save final file at end)")
-                        
-                        if VERBOSE:
-                            print(f"🏢 Found {len(page_agencies)} agencies on page {page}")
-                            print(f"📧 New unique emails: {len(new_emails)}")
-                            print(f"📊 Total agencies so far: {len(all_agencies)}")
-                            print(f"📊 Total emails so far: {len(all_emails)}")
+                        backlog.append([page, page_agencies, self.start_enrichment(page_agencies), None])
                     
                 else:
                     # Original email-only extraction
@@ -127,197 +143,464 @@ class FilmmakersScraper:
                     
                     if page_emails:
                         # Filter out duplicates while adding
-                        new_emails = [email for email in page_emails if email not in all_emails]
-                        all_emails.extend(new_emails)
+                        new_emails = all_emails.add_all(page_emails)
                         
-                        # PROGRESSIVE SAVE: Save after each page
-                        try:
-                            with open(progressive_filename, 'w', encoding='utf-8') as f:
-                                for email in all_emails:
-                                    f.write(f"{email}\n")
-                            if VERBOSE:
-                                print(f"💾 Progress saved to {progressive_filename}")
-                        except Exception as e:
-                            if VERBOSE:
-                                print(f"⚠️  Could not save progress: {str(e)}")
+                        # Progressive save: append only this page's new emails
+                        self.append_progress(progress, [{'email': email} for email in new_emails])
+                        metrics.count('records', len(new_emails), site='filmmakers')
                         
-                        if VERBOSE:
-                            print(f"📧 Found {len(page_emails)} emails on page {page}")
-                            print(f"📧 New unique emails: {len(new_emails)}")
-                            print(f"📊 Total emails so far: {len(all_emails)}")
+                        log.info("📧 Page %d: %d emails, %d new (total: %d)",
+                                 page, len(page_emails), len(new_emails), len(all_emails),
+                                 page=page, emails=len(page_emails), new_emails=len(new_emails),
+                                 total_emails=len(all_emails))
+                
+                # Incremental crawl: everything past an all-known page was seen on earlier runs
+                if not extract_full_data:
+                    page_fingerprints = [email_fingerprint(email) for email in page_emails or []]
+                if delta.should_stop(page_fingerprints):
+                    log.info("🛑 Page %d holds only known listings - stopping incremental crawl", page, page=page)
+                    stopped_early = True
+                    page += 1
+                    break
                 
                 # Check if we found any data on this page
                 if not (page_agencies if extract_full_data else page_emails):
-                    if VERBOSE:
-                        print(f"⚠️  No data found on page {page}")
+                    log.warning("⚠️  No data found on page %d", page, page=page)
                     # If several consecutive pages have no data, probably reached the end
                     if page > 3:
-                        if VERBOSE:
-                            print("🏁 Multiple pages with no data - probably reached the end")
+                        log.info("🏁 Multiple pages with no data - probably reached the end")
                         break
                 
-                # Try to navigate to next page using the next button (ORIGINAL WORKING METHOD)
-                try:
-                    # Look for the next button using the correct XPath
-                    next_button = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, "/html/body/main/div/div[3]/nav/ul/li[9]/a"))
-                    )
-                    
-                    # Check if the button is disabled or if we're at the end
-                    if "disabled" in next_button.get_attribute("class"):
-                        if VERBOSE:
-                            print("🏁 Next button is disabled - reached last page")
-                        break
-                    
-                    if VERBOSE:
-                        print(f"👆 Clicking next page button...")
-                    
-                    # Use JavaScript click to bypass element interception
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(3)  # Wait for page load
-                    
-                except (TimeoutException, NoSuchElementException):
-                    if VERBOSE:
-                        print("🏁 Next button not found - reached last page")
-                    break
-                except Exception as e:
-                    if VERBOSE:
-                        print(f"⚠️  Error clicking next button: {str(e)}")
+                # Try to navigate to next page
+                if not self.go_to_next_page(page):
                     break
                 
                 page += 1
+                state = self.checkpoint_state(page, extract_full_data, progress_path)
+                if backlog:
+                    # Valid once every page still in the backlog is recorded
+                    backlog[-1][3] = state
+                    self.record_finished(backlog, all_emails, all_agencies, progress, ENRICH_MAX_PAGES_BEHIND)
+                else:
+                    progress.sync()  # everything the checkpoint points at is on disk
+                    self.save_checkpoint(state)
+            
+            self.record_finished(backlog, all_emails, all_agencies, progress, max_behind=0)
+            self.checkpoint_for(extract_full_data).clear()  # finished: the next run in this mode starts from page 1
+            delta.finish(completed=not stopped_early)
+            progress.close()
+            
+            if self.ready and self.ready.timings:
+                log.info("⏱️  Waited %.1fs for %d page loads", self.ready.total_seconds(), len(self.ready.timings))
+            
+            # Shard crawls hand their results to the coordinator, which merges and saves them
+            if not save_results:
+                os.remove(progress_path)
+                return (all_agencies.items(), all_emails.items()) if extract_full_data else all_emails.items()
             
             # Final save
             if extract_full_data and all_agencies:
                 csv_filename = self.save_agencies_to_csv(all_agencies, timestamp)
-                print(f"\n🎉 Comprehensive scraping completed!")
-                print(f"📊 Total pages scraped: {page - 1}")
-                print(f"🏢 Total agencies found: {len(all_agencies)}")
-                print(f"📧 Total emails found: {len(all_emails)}")
+                log.info("🎉 Comprehensive scraping completed: %d pages, %d agencies, %d emails",
+                         page - 1, len(all_agencies), len(all_emails),
+                         pages=page - 1, agencies=len(all_agencies), emails=len(all_emails))
                 if csv_filename:
-                    print(f"📊 CSV file: {csv_filename}")
-                return all_agencies, all_emails
+                    os.remove(progress_path)  # compacted into the CSV
+                return all_agencies.items(), all_emails.items()
             
             else:
                 # Original email-only save
                 final_filename = self.save_emails_to_file(all_emails, f"filmmakers_emails_{timestamp}.txt")
                 
-                print(f"\n🎉 Email scraping completed!")
-                print(f"📊 Total pages scraped: {page - 1}")
-                print(f"📧 Total emails found: {len(all_emails)}")
-                if final_filename:
-                    print(f"📧 Final file: filmmakers_emails_{timestamp}.txt")
+                log.info("🎉 Email scraping completed: %d pages, %d emails", page - 1, len(all_emails),
+                         pages=page - 1, emails=len(all_emails))
+                if final_filename or not all_emails:
+                    os.remove(progress_path)  # compacted into the text file
                 
-                return all_emails
+                return all_emails.items()
                 
         except Exception as e:
-            print(f"❌ Error during scraping: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.error("❌ Error during scraping: %s", e, exc_info=True)
+            self.record_finished(backlog, all_emails, all_agencies, progress, max_behind=0)
+            delta.finish(completed=False)
+            progress.close()
+            log.info("💾 Progress log kept at %s (python filmmakers_scraper.py compact %s)", progress_path, progress_path)
             
             # Try to save what we have
             if extract_full_data:
                 if all_agencies:
                     self.save_agencies_to_csv(all_agencies, f"{timestamp}_emergency_save")
-                return all_agencies, all_emails
+                return all_agencies.items(), all_emails.items()
             else:
                 if all_emails:
                     self.save_emails_to_file(all_emails, f"filmmakers_emails_{timestamp}_emergency.txt")
-                    print(f"💾 Emergency save: filmmakers_emails_{timestamp}_emergency.txt")
-                return all_emails
-            
-            return ([], []) if extract_full_data else []
+                return all_emails.items()
 
-    def extract_emails_from_page(self):
-        """Extract ALL emails from the current page (backward compatibility)"""
-        emails = []
+    def start_enrichment(self, agencies):
+        """Start fetching profile pages for cards with missing fields; returns the handle `record_agencies` waits on"""
+        if not ENRICH_AGENCIES:
+            return []
+        if self.enricher is None:
+            self.enricher = AgencyEnricher()
+        return self.enricher.submit(agencies)
+    
+    def record_finished(self, backlog, all_emails, all_agencies, progress, max_behind):
+        """Record backlog pages, oldest first, whose profiles are in; waits only while more than `max_behind` remain"""
+        while backlog and (len(backlog) > max_behind or all(future.done() for _, future in backlog[0][2])):
+            page, page_agencies, enrichment, state = backlog.popleft()
+            self.record_agencies(page, page_agencies, enrichment, all_emails, all_agencies, progress)
+            if state:
+                progress.sync()  # everything the checkpoint points at is on disk
+                self.save_checkpoint(state)
+    
+    def record_agencies(self, page, page_agencies, enrichment, all_emails, all_agencies, progress):
+        """Finish a page once its profiles are in: dedup its agencies and append the new ones to the progress log"""
+        if enrichment:
+            gained = self.enricher.collect(enrichment)
+            log.debug("   🔎 Page %d: %d profiles read, %d agencies gained an email", page, len(enrichment), gained)
+        
+        # Extract just emails for compatibility (cards still without one are dropped here)
+        page_emails = [agency['email'] for agency in page_agencies if agency.get('email')]
+        
+        # Filter out duplicates (agencies are deduplicated by email)
+        new_emails = all_emails.add_all(page_emails)
+        new_agencies = all_agencies.add_all(page_agencies)
+        
+        # Progressive save: append only this page's new agencies
+        self.append_progress(progress, new_agencies)
+        metrics.count('records', len(new_agencies), site='filmmakers')
+        
+        log.info("🏢 Page %d: %d agencies, %d new emails (totals: %d agencies, %d emails)",
+                 page, len(page_emails), len(new_emails), len(all_agencies), len(all_emails),
+                 page=page, agencies=len(page_emails), new_emails=len(new_emails),
+                 total_agencies=len(all_agencies), total_emails=len(all_emails))
+    
+    def page_has_results(self):
+        """Check that the current page loaded and still lists agencies"""
+        if self.backend == 'http':
+            if not self.http.has_results():
+                log.info("🏁 Reached end - no more content or invalid page")
+                return False
+            return True
         
         try:
-            # Wait for page to be loaded
-            WebDriverWait(self.driver, WAIT_TIMEOUT).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # Look for the pagination container to verify page loaded
+            pagination = self.driver.find_element(By.XPATH, "/html/body/main/div/div[3]/nav/ul")
             
-            # Get all text on the page
+            # Check if page has agency content
             page_text = self.driver.find_element(By.TAG_NAME, "body").text
             
-            # Extract emails using regex
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            found_emails = re.findall(email_pattern, page_text)
-            
-            # Also look for mailto links
+            # If page shows no results or error, we've reached the end
+            if ("no results" in page_text.lower() or 
+                "not found" in page_text.lower() or
+                len(page_text.strip()) < 500):  # Very short page likely means no content
+                
+                log.info("🏁 Reached end - no more content or invalid page")
+                return False
+                
+        except Exception as e:
+            log.info("🏁 Cannot find pagination or page content: %s", e)
+            return False
+        
+        return True
+    
+    @metrics.timed('filmmakers.next_page')
+    def go_to_next_page(self, page):
+        """Move from `page` to the next page. Returns False when there is no next page."""
+        if self.backend == 'http':
             try:
-                email_links = self.driver.find_elements(By.XPATH, "//a[starts-with(@href, 'mailto:')]")
-                for link in email_links:
-                    email = link.get_attribute('href').replace('mailto:', '').strip()
+                if self.http.next_page():
+                    return True
+                log.info("🏁 Next button is disabled - reached last page")
+                return False
+            except Exception as e:
+                log.warning("⚠️  HTTP backend can't reach page %d (%s) - falling back to Chrome", page + 1, e)
+                return self.fall_back_to_browser(page + 1)
+        
+        # Navigate using the next button (ORIGINAL WORKING METHOD)
+        try:
+            # Look for the next button using the correct XPath
+            next_button = WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.XPATH, "/html/body/main/div/div[3]/nav/ul/li[9]/a"))
+            )
+            
+            # Check if the button is disabled or if we're at the end
+            if "disabled" in next_button.get_attribute("class"):
+                log.info("🏁 Next button is disabled - reached last page")
+                return False
+            
+            log.debug("👆 Clicking next page button...")
+            
+            # Remember the current listing so we can tell when it has been replaced
+            agency_selector = "h3 > a[href*='/agents/']"
+            markers = self.driver.find_elements(By.CSS_SELECTOR, agency_selector)[:1]
+            
+            # Use JavaScript click to bypass element interception
+            self.driver.execute_script("arguments[0].click();", next_button)
+            
+            # Wait for page load (returns as soon as the new page is rendered)
+            self.ready.wait(
+                f"Page {page + 1}",
+                StalenessOf(markers[0] if markers else None),
+                RecordCount(agency_selector),
+                DomQuiescence(quiet_ms=300)
+            )
+            return True
+            
+        except (TimeoutException, NoSuchElementException):
+            log.info("🏁 Next button not found - reached last page")
+            return False
+        except Exception as e:
+            log.warning("⚠️  Error clicking next button: %s", e)
+            return False
+    
+    def fall_back_to_browser(self, target_page):
+        """Switch to Chrome and click through to `target_page` (the site only paginates sequentially)"""
+        self.close_http()
+        self.backend = 'selenium'
+        if not self.navigate_and_setup_filters():
+            return False
+        
+        return self.skip_to_page(target_page)
+    
+    def skip_to_page(self, target_page):
+        """Click through from page 1 to `target_page` without extracting anything"""
+        for page in range(1, target_page):
+            log.debug("⏩ Replaying navigation: page %d → %d", page, page + 1)
+            if not self.go_to_next_page(page):
+                return False
+        return True
+    
+    def current_url(self):
+        return self.http.url if self.http else self.driver.current_url
+    
+    def current_cookies(self):
+        if self.http:
+            return [{'domain': host, 'name': name, 'value': value}
+                    for host, jar in self.http.fetcher.cookies.items() for name, value in jar.items()]
+        return [{'domain': cookie.get('domain', ''), 'name': cookie['name'], 'value': cookie['value']}
+                for cookie in self.driver.get_cookies()]
+    
+    def append_progress(self, progress, records):
+        """Append new records to the progress log; I/O is proportional to what this page added"""
+        if self.record_sink:
+            for record in records:
+                self.record_sink(record)
+        try:
+            for record in records:
+                progress.append(record)
+            if records:
+                log.debug("💾 Appended %d new records to %s", len(records), progress.path)
+        except Exception as e:
+            log.warning("⚠️  Could not save progress: %s", e)
+    
+    def checkpoint_state(self, page, extract_full_data, progress_path):
+        """Where the crawl is now, as `resume_from_checkpoint` needs it (None if the browser can't tell)"""
+        try:
+            return {
+                'page': page,
+                'url': self.current_url(),
+                'base_url': self.base_url,
+                'backend': self.backend,
+                'cookies': self.current_cookies(),
+                'extract_full_data': extract_full_data,
+                'progress_log': progress_path,
+            }
+        except Exception as e:
+            log.warning("⚠️  Could not read the crawl position for the checkpoint: %s", e)
+            return None
+    
+    def checkpoint_for(self, extract_full_data):
+        """The checkpoint of one extraction mode; each mode resumes from and clears only its own"""
+        mode = 'agencies' if extract_full_data else 'emails'
+        return Checkpoint(self.checkpoint_path.replace('.json', f"_{mode}.json"), max_age_hours=CHECKPOINT_MAX_AGE_HOURS)
+    
+    def save_checkpoint(self, state):
+        """Persist where the crawl is; what it collected so far lives in the progress log"""
+        if state is None:
+            return
+        try:
+            self.checkpoint_for(state['extract_full_data']).save(state)
+        except Exception as e:
+            log.warning("⚠️  Could not save checkpoint: %s", e)
+    
+    def jump_to_checkpoint(self, state):
+        """Open the checkpointed page directly by URL. Returns False if the page isn't addressable."""
+        url = state.get('url') or ''
+        if not url or url.split('#')[0] == self.base_url:
+            return False  # pagination didn't change the URL, so only replaying can get there
+        try:
+            if self.http:
+                for cookie in state.get('cookies', []):
+                    self.http.fetcher.cookies.setdefault(cookie['domain'].lstrip('.'), {})[cookie['name']] = cookie['value']
+                self.http.load(url)
+            else:
+                for cookie in state.get('cookies', []):
+                    try:
+                        self.driver.add_cookie({'name': cookie['name'], 'value': cookie['value']})
+                    except Exception:
+                        pass
+                self.driver.get(url)
+                self.ready.wait("Checkpoint page", RecordCount("h3 > a[href*='/agents/']"), DomQuiescence(quiet_ms=300))
+            return self.page_has_results()
+        except Exception as e:
+            log.warning("⚠️  Direct jump to %s failed (%s)", url, e)
+            return False
+    
+    def resume_from_checkpoint(self, extract_full_data):
+        """Return to the page a previous run stopped on, by URL or by replaying clicks. Call after navigating."""
+        state = self.checkpoint_for(extract_full_data).load()
+        if not state or state.get('extract_full_data') != extract_full_data or state.get('base_url') != self.base_url:
+            return False
+        if state['page'] <= 1:
+            return False
+        
+        start = time.perf_counter()
+        method = 'jump'
+        if not self.jump_to_checkpoint(state):
+            method = 'replay'
+            if not (self.navigate_and_setup_filters() and self.skip_to_page(state['page'])):
+                log.warning("⚠️  Could not get back to page %d - starting over from page 1", state['page'])
+                self.navigate_and_setup_filters()
+                return False
+        
+        self.start_page = state['page']
+        self.resumed = state
+        records = replay(state['progress_log'])
+        self.restored_records = [AgencyRecord.from_dict(record) for record in records] if extract_full_data else list(records)
+        self.resume_seconds = time.perf_counter() - start
+        log.info("♻️  Resumed at page %d in %.1fs (%s), %d records restored from %s", state['page'],
+                 self.resume_seconds, method, len(self.restored_records), state['progress_log'])
+        return True
+    
+    def close_http(self):
+        if self.http:
+            self.http.close()
+            self.http = None
+    
+    def close_enricher(self):
+        if self.enricher:
+            self.enricher.close()
+            self.enricher = None
+    
+    def close(self, delay_seconds=0):
+        """Release the HTTP session, the profile fetchers and the browser (if one was started)"""
+        from driver_manager import close_driver
+        self.close_http()
+        self.close_enricher()
+        if self.driver and self.driver_pool:
+            self.driver_pool.release(self.driver)
+            self.driver = None
+        elif self.driver:
+            close_driver(self.driver, delay_seconds)
+            self.driver = None
+    
+    @metrics.timed('filmmakers.extract')
+    def extract_emails_from_page(self):
+        """Extract ALL emails from the current page (backward compatibility)"""
+        emails = DedupState()
+        
+        try:
+            if self.backend != 'http':
+                # Wait for page to be loaded
+                WebDriverWait(self.driver, WAIT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+            
+            if self.backend == 'http' or self.extraction_mode in ('snapshot', 'js'):
+                # Body text and mailto links without per-element round-trips
+                if self.backend == 'http':
+                    page_text, mailto_hrefs = self.http.extract_emails()
+                elif self.extraction_mode == 'js':
+                    page_text, mailto_hrefs = extract_page_emails_js(self.driver)
+                else:
+                    page_text, mailto_hrefs = extract_page_emails(parse_html(self.driver.page_source))
+                found_emails = re.findall(EMAIL_PATTERN, page_text)
+                for href in mailto_hrefs:
+                    email = href.replace('mailto:', '').strip()
                     if email:
                         found_emails.append(email)
-            except:
-                pass
+            else:
+                # Get all text on the page
+                page_text = self.driver.find_element(By.TAG_NAME, "body").text
+                
+                # Extract emails using regex
+                found_emails = re.findall(EMAIL_PATTERN, page_text)
+                
+                # Also look for mailto links
+                try:
+                    email_links = self.driver.find_elements(By.XPATH, "//a[starts-with(@href, 'mailto:')]")
+                    for link in email_links:
+                        email = link.get_attribute('href').replace('mailto:', '').strip()
+                        if email:
+                            found_emails.append(email)
+                except:
+                    pass
             
             # Clean and validate emails
             for email in found_emails:
                 email = email.strip().lower()
-                if self.is_valid_email(email) and email not in emails:
-                    emails.append(email)
-                    if VERBOSE:
-                        print(f"   ✅ Found: {email}")
+                if self.is_valid_email(email) and emails.add(email):
+                    log.debug("   ✅ Found: %s", email)
             
-            return emails
+            return emails.items()
             
         except Exception as e:
-            if VERBOSE:
-                print(f"⚠️  Error extracting emails from page: {str(e)}")
-            return emails
+            metrics.count('errors', phase='filmmakers.extract')
+            log.error("⚠️  Error extracting emails from page: %s", e)
+            return emails.items()
 
+    @metrics.timed('filmmakers.extract')
     def extract_agencies_from_page(self):
-        """Extract ALL agency information from the current page"""
+        """Extract ALL agency cards from the current page, including those without an email"""
         agencies = []
         
         try:
-            # Wait for page to be loaded
-            WebDriverWait(self.driver, WAIT_TIMEOUT).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Find all agency sections - look for h3 elements with agency names (links)
-            agency_elements = self.driver.find_elements(By.XPATH, "//h3/a[contains(@href, '/agents/')]")
+            if self.backend != 'http':
+                # Wait for page to be loaded
+                WebDriverWait(self.driver, WAIT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+            
+            if self.backend == 'http' or self.extraction_mode in ('snapshot', 'js'):
+                # Every agency card on the page from one HTML document or one script call
+                if self.backend == 'http':
+                    agency_elements = self.http.extract_agencies()
+                elif self.extraction_mode == 'js':
+                    agency_elements = extract_agencies_js(self.driver)
+                else:
+                    agency_elements = parse_filmmakers_agencies(parse_html(self.driver.page_source), self.driver.current_url)
+                extract = lambda agency_data: agency_data
+            else:
+                # Find all agency sections - look for h3 elements with agency names (links)
+                agency_elements = self.driver.find_elements(By.XPATH, "//h3/a[contains(@href, '/agents/')]")
+                extract = self.extract_single_agency_data
             
-            if VERBOSE:
-                print(f"   🏢 Found {len(agency_elements)} agency elements")
+            log.debug("   🏢 Found %d agency elements", len(agency_elements))
             
             for agency_element in agency_elements:
                 try:
-                    agency_data = self.extract_single_agency_data(agency_element)
-                    if agency_data and agency_data.get('email'):  # Only include if we have an email
+                    agency_data = extract(agency_element)
+                    if agency_data:
+                        # Cards without an email are kept for now: their profile page may have one
                         agencies.append(agency_data)
-                        if VERBOSE:
-                            print(f"   ✅ {agency_data['name']}: {agency_data['email']}")
+                        log.debug("   ✅ %s: %s", agency_data['name'], agency_data['email'] or '(no email on card)')
                     
                 except Exception as e:
-                    if VERBOSE:
-                        print(f"   ⚠️  Error processing agency element: {str(e)}")
+                    metrics.count('errors', phase='filmmakers.extract')
+                    log.warning("   ⚠️  Error processing agency element: %s", e)
                     continue
             
             return agencies
             
         except Exception as e:
-            if VERBOSE:
-                print(f"⚠️  Error extracting agencies from page: {str(e)}")
+            metrics.count('errors', phase='filmmakers.extract')
+            log.error("⚠️  Error extracting agencies from page: %s", e)
             return agencies
     
     def extract_single_agency_data(self, agency_element):
         """Extract data from a single agency element"""
-        agency_data = {
-            'name': '',
-            'email': '',
-            'phone': '',
-            'address': '',
-            'country': '',
-            'website': '',
-            'regions': '',
-            'specialties': ''
-        }
+        agency_data = new_agency_data()
         
         try:
             # Get agency name from the link text
@@ -329,76 +612,10 @@ class FilmmakersScraper:
             # Find the parent container that holds all the agency info
             # Go up to find the main agency container
             parent = agency_element.find_element(By.XPATH, "../..")
-            agency_text = parent.text
-            
-            # Extract email using regex
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, agency_text)
-            if emails:
-                agency_data['email'] = emails[0].lower()
-            
-            # Extract phone using regex (various international formats)
-            phone_patterns = [
-                r'\+\d{1,4}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}',  # +49 30 403 01850
-                r'\+\d{2,3}\s?\d{1,4}\s?\d{2,4}\s?\d{2,4}',  # +44 20 7160 6333
-                r'\+\d{10,15}',  # +447789935248
-                r'\d{2,4}\s?\d{2,4}\s?\d{2,4}\s?\d{2,4}',  # 020 7160 6333
-            ]
-            
-            for pattern in phone_patterns:
-                phones = re.findall(pattern, agency_text)
-                if phones:
-                    agency_data['phone'] = phones[0].strip()
-                    break
-            
-            # Extract address and country
-            # Look for common country/city patterns
-            lines = agency_text.split('\n')
-            for i, line in enumerate(lines):
-                line_clean = line.strip()
-                
-                # Check if line contains country indicators
-                countries = ['Germany', 'Austria', 'Switzerland', 'France', 'Italy', 'Spain', 'United Kingdom', 
-                           'Netherlands', 'Belgium', 'Denmark', 'Sweden', 'Norway', 'Poland', 'Czech', 
-                           'Portugal', 'Greece', 'Ireland', 'Finland', 'Hungary', 'Slovakia', 'Slovenia',
-                           'Croatia', 'Bulgaria', 'Romania', 'Latvia', 'Lithuania', 'Estonia']
-                
-                for country in countries:
-                    if country in line_clean:
-                        agency_data['country'] = country
-                        # The line with country often contains address
-                        agency_data['address'] = line_clean
-                        break
-                
-                # Look for regions like D/A/CH, UK & Ireland, etc.
-                if any(region in line_clean for region in ['D/A/CH', 'UK & Ireland', 'Benelux', 'Nordic', 'Iberia']):
-                    agency_data['regions'] = line_clean
-                
-                # Look for specialties (Acting agency, Artist management, etc.)
-                specialties_keywords = ['Acting agency', 'Artist management', 'Model agency', 'Voice Agency', 
-                                      'Young talent', 'Casting', 'Management', 'Talent agency']
-                for keyword in specialties_keywords:
-                    if keyword.lower() in line_clean.lower():
-                        if agency_data['specialties']:
-                            agency_data['specialties'] += f", {keyword}"
-                        else:
-                            agency_data['specialties'] = keyword
-            
-            # Clean up address - remove email and phone if they got mixed in
-            if agency_data['address']:
-                # Remove email and phone from address
-                address_clean = agency_data['address']
-                if agency_data['email']:
-                    address_clean = address_clean.replace(agency_data['email'], '').strip()
-                if agency_data['phone']:
-                    address_clean = address_clean.replace(agency_data['phone'], '').strip()
-                agency_data['address'] = address_clean
-            
-            return agency_data
+            return parse_agency_text(agency_data['name'], agency_data['website'], parent.text)
             
         except Exception as e:
-            if VERBOSE:
-                print(f"   ⚠️  Error extracting data for {agency_data.get('name', 'unknown')}: {str(e)}")
+            log.warning("   ⚠️  Error extracting data for %s: %s", agency_data.get('name') or 'unknown', e)
             return agency_data
     
     def is_valid_email(self, email):
@@ -406,10 +623,11 @@ class FilmmakersScraper:
         pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$'
         return re.match(pattern, email) is not None
     
+    @metrics.timed('file_write')
     def save_agencies_to_csv(self, agencies, timestamp=None):
         """Save agencies data to a CSV file"""
         if not agencies:
-            print("📝 No agencies to save")
+            log.info("📝 No agencies to save")
             return None
         
         if timestamp is None:
@@ -419,27 +637,21 @@ class FilmmakersScraper:
         
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['name', 'email', 'phone', 'address', 'country', 'website', 'regions', 'specialties']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # Write header
-                writer.writeheader()
-                
-                # Write agency data
-                for agency in agencies:
-                    writer.writerow(agency)
+                write_csv(agencies, csvfile)
             
-            print(f"📊 Saved {len(agencies)} agencies to {filename}")
+            log.info("📊 Saved %d agencies to %s", len(agencies), filename, file=filename)
             return filename
             
         except Exception as e:
-            print(f"⚠️  Error saving agencies to CSV: {str(e)}")
+            metrics.count('errors', phase='file_write')
+            log.error("⚠️  Error saving agencies to CSV: %s", e)
             return None
 
+    @metrics.timed('file_write')
     def save_emails_to_file(self, emails, filename=None):
         """Save emails to a text file"""
         if not emails:
-            print("⚠️  No emails to save")
+            log.warning("⚠️  No emails to save")
             return False
         
         if not filename:
@@ -448,22 +660,50 @@ class FilmmakersScraper:
         
         try:
             # Remove duplicates
-            unique_emails = list(dict.fromkeys(emails))
+            unique_emails = DedupState(emails)
             
             with open(filename, 'w', encoding='utf-8') as f:
                 for email in unique_emails:
                     f.write(f"{email}\n")
             
-            print(f"💾 Saved {len(unique_emails)} unique emails to {filename}")
+            log.info("💾 Saved %d unique emails to %s", len(unique_emails), filename, file=filename)
             return True
             
         except Exception as e:
-            print(f"❌ Error saving emails: {str(e)}")
+            metrics.count('errors', phase='file_write')
+            log.error("❌ Error saving emails: %s", e)
             return False
 
+def compact_progress_log(progress_path):
+    """Turn a progress log left by an interrupted crawl into the usual CSV (agencies) or text (emails) file"""
+    records = list(replay(progress_path))
+    timestamp = os.path.basename(progress_path)[len('filmmakers_progress_'):].rsplit('.', 1)[0]
+    saver = FilmmakersScraper(None)
+    if records and 'name' in records[0]:
+        agencies = DedupState(records, key=agency_email)
+        return saver.save_agencies_to_csv(agencies, f"{timestamp}_recovered")
+    emails = DedupState(record['email'] for record in records)
+    filename = f"filmmakers_emails_{timestamp}_recovered.txt"
+    return filename if saver.save_emails_to_file(emails, filename) else None
+
+def scrape_filmmakers_emails(driver_pool=None):
+    """Run an email-only filmmakers.eu scrape and return the emails found (for unified runs).
+
+    An empty list means the crawl worked and found nothing new; None means it failed.
+    """
+    scraper = FilmmakersScraper(None, driver_pool=driver_pool)
+    try:
+        if not scraper.navigate_and_setup_filters():
+            log.error("❌ Filmmakers.eu navigation failed!")
+            return None
+        scraper.resume_from_checkpoint(extract_full_data=False)
+        return scraper.scrape_all_pages(extract_full_data=False)
+    finally:
+        scraper.close()
+
 def main():
     """Main function to run filmmakers.eu scraper"""
-    from driver_manager import create_chrome_driver, close_driver
+    from driver_manager import create_chrome_driver
     from config import KEEP_BROWSER_OPEN
     import sys
     
@@ -473,6 +713,15 @@ def main():
     print("2. Comprehensive agency data extraction (CSV format)")
     print()
     
+    # Recover the results of an interrupted crawl without scraping again
+    if len(sys.argv) > 2 and sys.argv[1] == 'compact':
+        return bool(compact_progress_log(sys.argv[2]))
+    
+    # --fresh ignores any checkpoint left by an interrupted run
+    fresh = '--fresh' in sys.argv
+    if fresh:
+        sys.argv.remove('--fresh')
+    
     # Check command line arguments for mode selection
     extract_full_data = False
     start_page = 1
@@ -515,11 +764,11 @@ def main():
             else:
                 print("Please enter 1 or 2")
     
-    driver = None
+    scraper = None
     
     try:
-        # Create driver
-        driver = create_chrome_driver()
+        # Create driver (the HTTP backend only starts Chrome if a page needs JavaScript)
+        driver = create_chrome_driver() if FETCH_BACKENDS['filmmakers'] != 'http' else None
         scraper = FilmmakersScraper(driver)
         
         # Navigate to page
@@ -528,15 +777,20 @@ def main():
         
         if not success:
             print("❌ Navigation failed!")
-            close_driver(driver, 10)
+            scraper.close(10)
             return False
         
-        # Note: Starting page > 1 not supported since site doesn't allow direct page URLs
-        # Must navigate sequentially using next button
-        if start_page > 1:
-            print(f"⚠️  Note: Starting page {start_page} not supported - must start from page 1")
-            print("   Site requires sequential navigation using next button")
-            start_page = 1
+        # Pick up where a crashed run stopped; otherwise click through to the requested start page
+        if fresh:
+            scraper.checkpoint_for(extract_full_data).clear()
+        if scraper.resume_from_checkpoint(extract_full_data):
+            start_page = scraper.start_page
+        elif start_page > 1:
+            print(f"⏩ Clicking through to page {start_page} (the site has no direct page URLs)")
+            if not scraper.skip_to_page(start_page):
+                print(f"⚠️  Could not reach page {start_page} - starting from page 1")
+                scraper.navigate_and_setup_filters()
+                start_page = 1
         
         # Scrape all pages
         if extract_full_data:
@@ -545,9 +799,9 @@ def main():
             agencies, emails = scraper.scrape_all_pages(extract_full_data=True)
             
             if not agencies:
-                print("❌ No agencies found")
-                close_driver(driver, 30)
-                return False
+                print("✅ No new agencies found")  # not a failure, like an empty Crew United run
+                scraper.close(KEEP_BROWSER_OPEN)
+                return True
             
             print("\n💾 STEP 3: Final Results")
             print(f"   🏢 Total agencies: {len(agencies)}")
@@ -560,27 +814,29 @@ def main():
             all_emails = scraper.scrape_all_pages(extract_full_data=False)
             
             if not all_emails:
-                print("❌ No emails found")
-                close_driver(driver, 30)
-                return False
+                print("✅ No new emails found")  # not a failure, like an empty Crew United run
+                scraper.close(KEEP_BROWSER_OPEN)
+                return True
             
             print("\n💾 STEP 3: Final Results")
             print(f"   📧 Total unique emails: {len(set(all_emails))}")
             print(f"   📄 Results saved to text file with progressive backup")
         
-        close_driver(driver, KEEP_BROWSER_OPEN)
+        scraper.close(KEEP_BROWSER_OPEN)
         return True
         
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
-        if driver:
-            close_driver(driver, 10)
+        if scraper:
+            scraper.close(10)
         return False
 
 if __name__ == '__main__':
-    success = main()
+    with maybe_profile('filmmakers', pop_profile_flag()):
+        success = main()
+    metrics.emit('filmmakers')
     
     if success:
         print("\n🎯 FILMMAKERS.EU SCRAPING COMPLETE!")
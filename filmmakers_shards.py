@@ -0,0 +1,125 @@
+# filmmakers_shards.py - Parallel filmmakers.eu crawl split by the search's country filter
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from config import FILMMAKERS_SHARD_COUNTRIES, SHARD_WORKERS
+from filmmakers_scraper import FilmmakersScraper
+from dedup import DedupState
+import metrics
+from log import get_logger
+
+log = get_logger('filmmakers_shards')
+
+
+def default_shards():
+    """One (name, query string) shard per country in the search form's filter"""
+    return [(country, f"country={country}") for country in FILMMAKERS_SHARD_COUNTRIES]
+
+
+def scrape_shard(shard, extract_full_data, driver_pool, base_url=None, save_results=False):
+    """Crawl one filtered slice of the search (shard None: the whole search); returns the scraper's results"""
+    scraper = FilmmakersScraper(None, driver_pool=driver_pool, shard=shard, base_url=base_url)
+    try:
+        if not scraper.navigate_and_setup_filters():
+            raise RuntimeError(f"navigation failed for shard {shard[0] if shard else 'all'}")
+        scraper.resume_from_checkpoint(extract_full_data)
+        return scraper.scrape_all_pages(extract_full_data=extract_full_data, save_results=save_results)
+    finally:
+        scraper.close()
+
+
+def first_page_listing(shard, driver_pool, base_url=None):
+    """Profile links of the agencies on the first page of a shard (None: the unfiltered search)"""
+    scraper = FilmmakersScraper(None, driver_pool=driver_pool, shard=shard, base_url=base_url)
+    try:
+        if not scraper.navigate_and_setup_filters():
+            return None
+        return [agency['website'] for agency in scraper.extract_agencies_from_page()]
+    finally:
+        scraper.close()
+
+
+def shard_filter_works(shards, driver_pool, base_url=None, probes=2):
+    """Whether the site honours the shard filter, judged by the first page of the first `probes` shards.
+
+    A site that ignores an unknown query parameter serves every shard the
+    full unfiltered listing, and each shard would crawl everything.
+    """
+    unfiltered = first_page_listing(None, driver_pool, base_url)
+    if not unfiltered:
+        return True  # nothing to compare against; the shard crawls report their own failures
+    return any(first_page_listing(shard, driver_pool, base_url) != unfiltered for shard in shards[:probes])
+
+
+def merge_shard_results(results, extract_full_data):
+    """Merge per-shard results in shard order, dropping agencies/emails already seen in an earlier shard"""
+    agencies = DedupState(key=lambda agency: agency.get('email', '').lower())
+    emails = DedupState(key=str.lower)
+    for result in results:
+        shard_agencies, shard_emails = result if extract_full_data else ([], result)
+        agencies.add_all(shard_agencies)
+        emails.add_all(shard_emails)
+    if extract_full_data:
+        return agencies.items(), emails.items()
+    return emails.items()
+
+
+def scrape_sharded(extract_full_data=False, shards=None, workers=SHARD_WORKERS, base_url=None):
+    """Crawl every shard in parallel, then merge, dedup and save once.
+
+    Agencies in countries missing from FILMMAKERS_SHARD_COUNTRIES are only
+    reached by the unsharded crawl. If the site turns out to ignore the
+    shard filter, the search is crawled once, unsharded, instead.
+    """
+    from driver_manager import DriverPool
+
+    shards = shards or default_shards()
+    driver_pool = DriverPool(workers)  # browsers start only for shards that fall back to Chrome
+    results = {}
+    start = time.perf_counter()
+
+    try:
+        if not shard_filter_works(shards, driver_pool, base_url):
+            log.warning("⚠️  The search ignores the shard filter (%s) - crawling it unsharded instead", shards[0][1])
+            return scrape_shard(None, extract_full_data, driver_pool, base_url, save_results=True)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scrape_shard, shard, extract_full_data, driver_pool, base_url): shard
+                       for shard in shards}
+            for future in as_completed(futures):
+                name = futures[future][0]
+                try:
+                    results[name] = future.result()
+                    count = len(results[name][0] if extract_full_data else results[name])
+                    log.info("✅ Shard '%s' done: %d %s", name, count, 'agencies' if extract_full_data else 'emails',
+                             shard=name, records=count)
+                except Exception as e:
+                    log.error("❌ Shard '%s' failed: %s", name, e, shard=name)
+    finally:
+        driver_pool.close_all()
+
+    merged = merge_shard_results([results[name] for name, _ in shards if name in results], extract_full_data)
+    elapsed = time.perf_counter() - start
+
+    saver = FilmmakersScraper(None)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log.info("🧩 %d/%d shards finished in %.1fs", len(results), len(shards), elapsed)
+    if extract_full_data:
+        agencies, emails = merged
+        log.info("🏢 Total agencies (deduplicated across shards): %d, emails: %d", len(agencies), len(emails),
+                 agencies=len(agencies), emails=len(emails))
+        saver.save_agencies_to_csv(agencies, timestamp)
+    else:
+        log.info("📧 Total emails (deduplicated across shards): %d", len(merged), emails=len(merged))
+        saver.save_emails_to_file(merged, f"filmmakers_emails_{timestamp}.txt")
+    return merged
+
+
+if __name__ == '__main__':
+    import sys
+
+    extract_full_data = len(sys.argv) > 1 and sys.argv[1].lower() in ['full', 'comprehensive', 'csv']
+    print(f"🎬 FILMMAKERS.EU SHARDED SCRAPER ({'comprehensive' if extract_full_data else 'email-only'})")
+    scrape_sharded(extract_full_data)
+    metrics.emit('filmmakers_sharded')
@@ -0,0 +1,167 @@
+# http_cache.py - On-disk HTTP response cache with conditional revalidation, TTL and LRU size bound
+
+import json
+import sqlite3
+import threading
+import time
+from config import HTTP_CACHE, HTTP_CACHE_PATH, HTTP_CACHE_TTL_HOURS, HTTP_CACHE_MAX_MB, HTTP_CACHE_MAX_AGE_DAYS
+
+
+class CachedEntry:
+    __slots__ = ('url', 'status', 'headers', 'body', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, url, status, headers, body, etag, last_modified, fetched_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def validators(self):
+        """Conditional-GET headers for revalidating this entry (empty if the server sent none)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """200 responses keyed by URL, stored in SQLite with their ETag / Last-Modified.
+
+    Entries younger than `ttl` seconds are served without touching the
+    network; older ones are revalidated with a conditional GET, so an
+    unchanged page costs a 304 instead of its body. The total body size is
+    kept under `max_bytes` by evicting least recently used entries, and
+    entries not fetched or revalidated for `max_age` seconds are dropped.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path=HTTP_CACHE_PATH, ttl=HTTP_CACHE_TTL_HOURS * 3600,
+                 max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024, max_age=HTTP_CACHE_MAX_AGE_DAYS * 86400):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        """)
+        self.expire()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def lookup(self, url):
+        """The stored entry for `url`, or None; marks it as recently used"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        url, status, headers, body, etag, last_modified, fetched_at = row
+        return CachedEntry(url, status, json.loads(headers), body, etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry, max_age=None):
+        return entry.age() < (self.ttl if max_age is None else max_age)
+
+    def store(self, url, status, headers, body):
+        """Cache a response unless the server forbids it; evicts LRU entries past the size bound"""
+        if status != 200 or 'no-store' in headers.get('cache-control', '') or len(body) > self.max_bytes:
+            return
+        # Bodies are stored decoded, so the transfer headers no longer describe them
+        headers = {name: value for name, value in headers.items()
+                   if name not in ('content-encoding', 'content-length', 'transfer-encoding', 'set-cookie')}
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              (url, status, json.dumps(headers), body, len(body),
+                               headers.get('etag'), headers.get('last-modified'), now, now))
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def refresh(self, entry, headers):
+        """Record a 304: the entry is fresh again, with any validators the server updated"""
+        entry.etag = headers.get('etag', entry.etag)
+        entry.last_modified = headers.get('last-modified', entry.last_modified)
+        entry.fetched_at = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE responses SET etag = ?, last_modified = ?, fetched_at = ?, last_used = ? "
+                              "WHERE url = ?", (entry.etag, entry.last_modified, entry.fetched_at,
+                                                entry.fetched_at, entry.url))
+            self.conn.commit()
+
+    def record(self, outcome, body_size=0):
+        """Count a request outcome: 'hits', 'revalidated' or 'misses'"""
+        with self.lock:
+            self.stats[outcome] += 1
+            if outcome != 'misses':
+                self.stats['bytes_saved'] += body_size
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.stats['evictions'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def expire(self):
+        """Drop entries that haven't been fetched or revalidated for `max_age` seconds"""
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM responses WHERE fetched_at < ?",
+                                        (time.time() - self.max_age,)).rowcount
+            self.stats['evictions'] += removed
+            self.conn.commit()
+
+    def hit_ratio(self):
+        """Share of lookups answered without downloading the body (fresh hits and 304s)"""
+        with self.lock:
+            served = self.stats['hits'] + self.stats['revalidated']
+            total = served + self.stats['misses']
+        return served / total if total else 0.0
+
+    def summary(self):
+        return (f"{self.stats['hits']} fresh hits, {self.stats['revalidated']} revalidated, "
+                f"{self.stats['misses']} misses ({self.hit_ratio():.0%} from cache, "
+                f"{self.stats['bytes_saved'] // 1024} KB not downloaded)")
+
+
+def open_cache():
+    """The on-disk cache, or None when HTTP_CACHE is turned off"""
+    return HttpCache() if HTTP_CACHE else None
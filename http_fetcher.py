@@ -0,0 +1,189 @@
+# http_fetcher.py - Pooled keep-alive HTTP client for pages that don't need a browser
+
+import gzip
+import http.client
+import threading
+import zlib
+import metrics
+from urllib.parse import urljoin, urlsplit
+from config import WAIT_TIMEOUT, USER_AGENT
+from log import get_logger
+
+log = get_logger('http_fetcher')
+
+# Connection errors that mean a pooled keep-alive socket went stale; the request is retried once
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class HttpResponse:
+    """A fully-read HTTP response"""
+
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers  # lower-cased names
+        self.body = body
+
+    @property
+    def text(self):
+        charset = 'utf-8'
+        content_type = self.headers.get('content-type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip() or charset
+        return self.body.decode(charset, errors='replace')
+
+
+class HttpFetcher:
+    """GET pages over a small per-host pool of persistent connections.
+
+    Safe to share between threads; idle connections are reused instead of
+    paying a TCP + TLS handshake for every page. With an HttpCache, fresh
+    pages are answered from disk and stale ones revalidated with a
+    conditional GET; the fetcher owns the cache and closes it. `throttle`,
+    if given, is called with the host before every request that goes out
+    over the network (cache hits skip it).
+    """
+
+    def __init__(self, max_idle_per_host=4, timeout=WAIT_TIMEOUT, user_agent=USER_AGENT, cache=None, throttle=None):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.cache = cache
+        self.throttle = throttle
+        self.cookies = {}  # host -> {name: value}
+        self._idle = {}    # (scheme, host, port) -> [connection, ...]
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections_opened': 0, 'bytes_received': 0}
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+            self.stats['connections_opened'] += 1
+
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn, reusable):
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _store_cookies(self, host, response):
+        for header in response.headers.get_all('Set-Cookie') or []:
+            name, _, value = header.split(';', 1)[0].partition('=')
+            if name.strip():
+                with self._lock:
+                    self.cookies.setdefault(host, {})[name.strip()] = value.strip()
+
+    def _request(self, url, headers):
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        request_headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,*/*;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        host_cookies = self.cookies.get(parts.hostname)
+        if host_cookies:
+            request_headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in host_cookies.items())
+        request_headers.update(headers or {})
+        if self.throttle:
+            self.throttle(parts.hostname)
+
+        for attempt in range(2):
+            conn = self._acquire(key)
+            try:
+                conn.request('GET', path, headers=request_headers)
+                response = conn.getresponse()
+                body = response.read()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+
+            self._release(key, conn, reusable=not response.will_close)
+            self._store_cookies(parts.hostname, response)
+            with self._lock:
+                self.stats['requests'] += 1
+                self.stats['bytes_received'] += len(body)
+
+            encoding = (response.getheader('Content-Encoding') or '').lower()
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                body = zlib.decompress(body)
+
+            response_headers = {name.lower(): value for name, value in response.getheaders()}
+            return HttpResponse(url, response.status, response_headers, body)
+
+    def _cached_request(self, url, headers, max_age):
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.is_fresh(entry, max_age):
+            outcome, response = 'hits', HttpResponse(url, entry.status, entry.headers, entry.body)
+        else:
+            response = self._request(url, dict(entry.validators() if entry else {}, **(headers or {})))
+            if response.status == 304 and entry is not None:
+                self.cache.refresh(entry, response.headers)
+                outcome, response = 'revalidated', HttpResponse(url, entry.status, entry.headers, entry.body)
+            else:
+                outcome = 'misses'
+                self.cache.store(url, response.status, response.headers, response.body)
+        self.cache.record(outcome, len(response.body) if outcome != 'misses' else 0)
+        metrics.count('http_cache', outcome=outcome)
+        return response
+
+    def get(self, url, headers=None, max_redirects=5, max_age=None):
+        """GET a URL, following redirects, and return an HttpResponse.
+
+        With a cache, `max_age` overrides its TTL for this request; listing
+        pages pass 0 so they are always revalidated.
+        """
+        for _ in range(max_redirects + 1):
+            if self.cache:
+                response = self._cached_request(url, headers, max_age)
+            else:
+                response = self._request(url, headers)
+            if response.status in (301, 302, 303, 307, 308) and 'location' in response.headers:
+                url = urljoin(url, response.headers['location'])
+                continue
+            return response
+        raise http.client.HTTPException(f"Too many redirects fetching {url}")
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for connections in pools.values():
+            for conn in connections:
+                conn.close()
+        log.debug("🔌 HTTP fetcher closed (%d requests over %d connections)",
+                  self.stats['requests'], self.stats['connections_opened'])
+        if self.cache:
+            log.debug("💾 HTTP cache: %s", self.cache.summary())
+            self.cache.close()
+            self.cache = None
@@ -1,51 +1,76 @@
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from config import WAIT_TIMEOUT, VERBOSE
+from config import WAIT_TIMEOUT, VERBOSE, EXTRACTION_MODE, TARGET_CATEGORIES, KEEP_RAW_TEXT
+from page_parser import parse_crew_jobs, email_from_onclick, extract_title, EMAIL_PATTERN
+from js_extractor import extract_crew_jobs_js
+from readiness import ReadinessWaiter, RecordCount, StalenessOf
+from delta_crawl import DeltaCrawl, job_fingerprint
+from dedup import DedupState
+from records import JobRecord
+import metrics
+from log import get_logger
 import re
-import json
 from datetime import datetime
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 
+log = get_logger('job_scraper')
+
 class CrewUnitedJobScraper:
     
-    def __init__(self, driver):
+    def __init__(self, driver, extraction_mode=None):
         self.driver = driver
+        self.ready = ReadinessWaiter(driver)
+        self.extraction_mode = extraction_mode or EXTRACTION_MODE  # 'snapshot', 'js' or 'selenium'
         
         # Target categories - any budget for actors/speakers
-        self.target_categories = [
-            "no budget (actors*actresses and speakers)",
-            "low budget (actors*actresses and speakers)",
-            "normal budget (actors*actresses and speakers)"
-        ]
+        self.target_categories = list(TARGET_CATEGORIES)
         
     def paginate_and_scrape(self):
         """Scrape all pages of job listings (up to page 5)"""
-        all_jobs = []
+        all_jobs = list(self.iter_jobs())
+        
+        # Save jobs to file
+        self.save_jobs_to_json(all_jobs)
+        return all_jobs
+    
+    def iter_jobs(self):
+        """Yield job listings page by page, so consumers can start before pagination finishes"""
+        jobs_found = 0
         page = 1
         has_next_page = True
         MAX_PAGES = 10
+        delta = DeltaCrawl('crew_united')
+        stopped_early = False
 
         while has_next_page and page <= MAX_PAGES:
-            if VERBOSE:
-                print(f"\n📖 Processing Page {page}")
-                print("=" * 30)
+            log.info("📖 Processing page %d", page, page=page)
 
             # Find jobs on current page
-            job_elements = self.find_target_job_elements()
+            with metrics.span('crew.extract'):
+                page_jobs, job_elements = self.extract_jobs_on_page()
+            metrics.count('pages', site='crew_united')
             
-            if job_elements:
-                for job_element in job_elements:
-                    job_data = self.extract_job_data(job_element)
+            page_fingerprints = [job_fingerprint(job) for job in page_jobs if job['raw_text']]
+            
+            if page_jobs:
+                for job_data in page_jobs:
                     if job_data['raw_text']:
-                        all_jobs.append(job_data)
+                        if not KEEP_RAW_TEXT:
+                            job_data.drop_raw_text()
+                        jobs_found += 1
+                        metrics.count('records', site='crew_united')
+                        yield job_data
                 
-                if VERBOSE:
-                    print(f"📊 Found {len(job_elements)} jobs on page {page}")
+                log.info("📊 Found %d jobs on page %d", len(page_jobs), page, page=page, jobs=len(page_jobs))
+            
+            # Incremental crawl: everything past an all-known page was seen on earlier runs
+            if delta.should_stop(page_fingerprints):
+                log.info("🛑 Page %d holds only known listings - stopping incremental crawl", page, page=page)
+                stopped_early = True
+                break
             
             # Try to go to next page
             try:
@@ -53,37 +78,35 @@ class CrewUnitedJobScraper:
                 next_page_button = self.driver.find_element(By.CSS_SELECTOR, 'a.btn.icon.icon-chevron-right')
                 
                 if next_page_button.is_enabled():
-                    if VERBOSE:
-                        print(f"⏭️  Moving to page {page + 1}...")
+                    log.debug("⏭️  Moving to page %d", page + 1)
                     next_page_button.click()
                     page += 1
                     
-                    # Wait for the new content to load
-                    if job_elements:  # Only if we found elements on this page
-                        WebDriverWait(self.driver, WAIT_TIMEOUT).until(
-                            EC.staleness_of(job_elements[0])
+                    # Wait for the old listings to go stale and the new ones to render
+                    with metrics.span('crew.page_wait'):
+                        loaded = self.ready.wait(
+                            f"Page {page}",
+                            StalenessOf(job_elements[0] if job_elements else None),
+                            RecordCount("span.cu-ui-common-breadcrumb-part"),
+                            timeout=WAIT_TIMEOUT
                         )
-                    # Additional wait for new content
-                    WebDriverWait(self.driver, WAIT_TIMEOUT).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "span.cu-ui-common-breadcrumb-part"))
-                    )
+                    if not loaded:
+                        log.warning("🏁 Next page never loaded", page=page)
+                        has_next_page = False
                 else:
-                    if VERBOSE:
-                        print("🏁 Reached last page")
+                    log.info("🏁 Reached last page", page=page)
                     has_next_page = False
                     
             except Exception as e:
-                if VERBOSE:
-                    print(f"🏁 No more pages available: {str(e)}")
+                log.info("🏁 No more pages available: %s", e, page=page)
                 has_next_page = False
         
-        if VERBOSE:
-            print(f"\n🎉 Completed scraping {page} pages")
-            print(f"📊 Total jobs found: {len(all_jobs)}")
+        delta.finish(completed=not stopped_early)
         
-        # Save jobs to file
-        self.save_jobs_to_json(all_jobs)
-        return all_jobs
+        log.info("🎉 Completed scraping %d pages", page, pages=page)
+        log.info("📊 Total jobs found: %d", jobs_found, jobs=jobs_found)
+        if self.ready.timings:
+            log.info("⏱️  Waited %.1fs for %d page loads", self.ready.total_seconds(), len(self.ready.timings))
         
     def send_test_email(self):
         """Send a test email to yourself using Zoho SMTP"""
@@ -130,6 +153,7 @@ Wilfredo"""
                 print(f"❌ Error sending test email: {str(e)}")
             return False
     
+    @metrics.timed('file_write')
     def save_jobs_to_json(self, jobs):
         """Save current scrape emails to a timestamped text file, one per line"""
         if not jobs:
@@ -140,18 +164,13 @@ Wilfredo"""
         filename = f'emails_{timestamp}.txt'
         
         # Extract only unique emails from current scrape
-        current_emails = []
-        for job in jobs:
-            if job['email'] and job['email'] not in current_emails:
-                current_emails.append(job['email'])
+        current_emails = DedupState(job['email'] for job in jobs)
         
-        if VERBOSE:
-            print(f"🔍 Found {len(current_emails)} unique emails in current scrape")
+        log.info("🔍 Found %d unique emails in current scrape", len(current_emails))
 
         # Only save if there are emails in this scrape
         if not current_emails:
-            print(f"✅ No emails found in this scrape")
-            print(f"📄 No email file created")
+            log.info("✅ No emails found in this scrape - no email file created")
             return True
         
         # Save current scrape emails, one per line
@@ -160,22 +179,54 @@ Wilfredo"""
                 for email in current_emails:
                     f.write(f"{email}\n")
             
-            if VERBOSE:
-                print(f"\n💾 Saved {len(current_emails)} emails to {filename}")
-                print("   (Includes all unique emails from this scrape)")
+            log.info("💾 Saved %d emails to %s", len(current_emails), filename, file=filename)
             return True
             
         except Exception as e:
-            if VERBOSE:
-                print(f"❌ Error saving emails: {str(e)}")
+            metrics.count('errors', phase='file_write')
+            log.error("❌ Error saving emails: %s", e)
             return False
     
+    def extract_jobs_on_page(self):
+        """Extract target jobs from the current page using the scraper's extraction mode.
+
+        Returns (jobs, elements) where elements can be used to wait for the page to go stale.
+        """
+        if self.extraction_mode in ('snapshot', 'js'):
+            jobs = self.extract_jobs_with_js() if self.extraction_mode == 'js' else self.extract_jobs_from_snapshot()
+            # One lookup for a staleness marker instead of one per job
+            marker = self.driver.find_elements(By.CSS_SELECTOR, "span.cu-ui-common-breadcrumb-part")[:1] if jobs else []
+            return jobs, marker
+        
+        job_elements = self.find_target_job_elements()
+        return [self.extract_job_data(job_element) for job_element in job_elements], job_elements
+    
+    def extract_jobs_from_snapshot(self):
+        """Grab page_source once and parse target jobs in-process (no per-element WebDriver calls)"""
+        try:
+            jobs = parse_crew_jobs(self.driver.page_source, self.target_categories)
+            log.info("   🎯 Total target jobs found: %d (page snapshot)", len(jobs), jobs=len(jobs))
+            return jobs
+        except Exception as e:
+            metrics.count('errors', phase='crew.extract')
+            log.error("   ❌ Error parsing page snapshot: %s", e)
+            return []
+    
+    def extract_jobs_with_js(self):
+        """Extract target jobs with one in-browser script that returns them all as JSON"""
+        try:
+            jobs = extract_crew_jobs_js(self.driver, self.target_categories)
+            log.info("   🎯 Total target jobs found: %d (in-browser script)", len(jobs), jobs=len(jobs))
+            return jobs
+        except Exception as e:
+            metrics.count('errors', phase='crew.extract')
+            log.error("   ❌ Error running extraction script: %s", e)
+            return []
+    
     def find_target_job_elements(self):
         """Find ONLY job elements that have our target category"""
         
-        if VERBOSE:
-            print("🔍 FINDING TARGET CATEGORY JOBS")
-            print("=" * 30)
+        log.info("🔍 Finding target category jobs")
         
         try:
             # Look specifically for breadcrumb elements containing our target text
@@ -184,48 +235,37 @@ Wilfredo"""
             
             target_job_elements = []
             
-            if VERBOSE:
-                print(f"   📋 Found {len(breadcrumb_elements)} breadcrumb elements")
+            log.debug("   📋 Found %d breadcrumb elements", len(breadcrumb_elements))
             
             for breadcrumb in breadcrumb_elements:
                 try:
                     breadcrumb_text = breadcrumb.text.strip().lower()
-                    
-                    if VERBOSE and breadcrumb_text:
-                        print(f"   🔍 Checking breadcrumb: {breadcrumb_text[:50]}...")
+                    log.debug("   🔍 Checking breadcrumb: %.50s", breadcrumb_text)
                     
                     if any(category.lower() in breadcrumb_text for category in self.target_categories):
                         # Find the parent job element (li element containing this breadcrumb)
                         job_element = breadcrumb.find_element(By.XPATH, "./ancestor::li[contains(@class, '') or not(@class)]")
-                        target_job_elements.append(job_element)
-                        
-                        if VERBOSE:
-                            print(f"   ✅ MATCH FOUND! Added job element")
+                        # A job listed under two target categories is one job (compares element ids, no round-trip)
+                        if job_element not in target_job_elements:
+                            target_job_elements.append(job_element)
+                        log.debug("   ✅ Match found: %.50s", breadcrumb_text)
                             
                 except Exception as e:
-                    if VERBOSE:
-                        print(f"   ⚠️  Error checking breadcrumb: {e}")
+                    log.warning("   ⚠️  Error checking breadcrumb: %s", e)
                     continue
             
-            if VERBOSE:
-                print(f"   🎯 Total target jobs found: {len(target_job_elements)}")
+            log.info("   🎯 Total target jobs found: %d", len(target_job_elements), jobs=len(target_job_elements))
             
             return target_job_elements
                 
         except Exception as e:
-            if VERBOSE:
-                print(f"   ❌ Error finding target job elements: {e}")
+            log.error("   ❌ Error finding target job elements: %s", e)
             return []
     
     def extract_job_data(self, job_element):
         """Extract data from a confirmed target job element"""
         
-        job_data = {
-            'title': None,
-            'email': None,
-            'raw_text': None,
-            'is_target_category': True  # We know it's target since we pre-filtered
-        }
+        job_data = JobRecord()  # target category: we pre-filtered
         
         try:
             # Get all text
@@ -235,20 +275,14 @@ Wilfredo"""
                 return job_data
             
             # Extract title from first meaningful line
-            lines = job_data['raw_text'].split('\n')
-            for line in lines[:5]:
-                line = line.strip()
-                if line and len(line) > 3 and len(line) < 100:
-                    if not any(skip in line.lower() for skip in ['new', 'budget', 'hours', 'eur', 'days old']):
-                        job_data['title'] = line
-                        break
+            job_data['title'] = extract_title(job_data['raw_text'])
             
             # Extract email
             job_data['email'] = self._extract_email(job_element, job_data['raw_text'])
                         
         except Exception as e:
-            if VERBOSE:
-                print(f"   ⚠️  Error extracting data: {e}")
+            metrics.count('errors', phase='crew.extract')
+            log.warning("   ⚠️  Error extracting data: %s", e)
         
         return job_data
     
@@ -259,14 +293,9 @@ Wilfredo"""
         try:
             email_links = element.find_elements(By.CSS_SELECTOR, "a[onclick*='putTogether']")
             for link in email_links:
-                onclick_attr = link.get_attribute('onclick')
-                if onclick_attr and 'putTogether' in onclick_attr:
-                    start = onclick_attr.find("'") + 1
-                    end = onclick_attr.find("'", start)
-                    if start > 0 and end > start:
-                        obfuscated = onclick_attr[start:end]
-                        actual_email = obfuscated.replace('$_isdot_$', '.').replace('$_isat_$', '@')
-                        return actual_email
+                actual_email = email_from_onclick(link.get_attribute('onclick'))
+                if actual_email:
+                    return actual_email
         except:
             pass
         
@@ -281,8 +310,7 @@ Wilfredo"""
             pass
         
         # Try regex on text
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = re.findall(EMAIL_PATTERN, text)
         return emails[0] if emails else None
     
     def display_target_jobs(self, target_jobs):
@@ -318,19 +346,13 @@ Wilfredo"""
             print("=" * 80)
         
         try:
-            # Find only target job elements (pre-filtered)
-            target_job_elements = self.find_target_job_elements()
+            # Find and extract only target jobs (pre-filtered)
+            target_jobs, _ = self.extract_jobs_on_page()
             
-            if not target_job_elements:
+            if not target_jobs:
                 print("❌ No target category jobs found on page")
                 return False, 0
             
-            # Extract data from confirmed target jobs
-            target_jobs = []
-            for job_element in target_job_elements:
-                job_data = self.extract_job_data(job_element)
-                target_jobs.append(job_data)
-            
             if VERBOSE:
                 print(f"📊 Found and processed {len(target_jobs)} target jobs")
             
@@ -0,0 +1,120 @@
+# js_extractor.py - One execute_script call per page that returns every record as JSON
+#
+# The scripts read textContent and walk the DOM themselves instead of using
+# element.text, which makes Chrome compute layout for every element.
+
+import json
+import re
+from page_parser import BLOCK_TAGS, HIDDEN_TAGS, EMAIL_PATTERN, extract_title, parse_agency_text
+from records import JobRecord
+
+# blockText(node) mirrors page_parser.Node.text so both extractors produce the same lines
+_TEXT_HELPERS = """
+var BLOCK = %s, HIDDEN = %s;
+function blockText(root) {
+    var lines = [], current = '', pending = 0;
+    function flush(breaks) {
+        var line = current.replace(/\\s+/g, ' ').trim();
+        if (line) {
+            if (lines.length) { for (var i = 1; i < pending; i++) lines.push(''); }
+            lines.push(line);
+            pending = 0;
+        }
+        current = '';
+        pending = Math.max(pending, breaks);
+    }
+    function walk(node) {
+        for (var child = node.firstChild; child; child = child.nextSibling) {
+            if (child.nodeType === 3) { current += child.nodeValue; continue; }
+            if (child.nodeType !== 1) continue;
+            var tag = child.tagName.toLowerCase();
+            if (HIDDEN[tag]) continue;
+            if (tag === 'br') { flush(1); continue; }
+            var breaks = tag === 'p' ? 2 : 1;
+            if (BLOCK[tag]) flush(breaks);
+            walk(child);
+            if (BLOCK[tag]) flush(breaks);
+        }
+    }
+    walk(root);
+    flush(0);
+    return lines.join('\\n');
+}
+function squash(text) { return (text || '').replace(/\\s+/g, ' ').trim(); }
+""" % (
+    json.dumps({tag: 1 for tag in sorted(BLOCK_TAGS)}),
+    json.dumps({tag: 1 for tag in sorted(HIDDEN_TAGS)}),
+)
+
+# Returns [[raw_text, email_or_null], ...] for jobs in the target categories
+CREW_JOBS_SCRIPT = _TEXT_HELPERS + """
+var targets = arguments[0], seen = [], rows = [];
+document.querySelectorAll('span.cu-ui-common-breadcrumb-part').forEach(function (span) {
+    var crumb = squash(blockText(span)).toLowerCase();
+    if (!targets.some(function (t) { return crumb.indexOf(t) !== -1; })) return;
+    var li = null;
+    for (var n = span.parentElement; n; n = n.parentElement) { if (n.tagName === 'LI') li = n; }
+    if (!li || seen.indexOf(li) !== -1) return;
+    seen.push(li);
+
+    var email = null;
+    li.querySelectorAll("a[onclick*='putTogether']").forEach(function (a) {
+        if (email) return;
+        var m = /'([^']+)'/.exec(a.getAttribute('onclick') || '');
+        if (m) email = m[1].split('$_isdot_$').join('.').split('$_isat_$').join('@');
+    });
+    if (!email) {
+        var mailto = li.querySelector("a[href*='mailto:']");
+        if (mailto) email = mailto.getAttribute('href').replace('mailto:', '');
+    }
+    rows.push([blockText(li).trim(), email]);
+});
+return JSON.stringify(rows);
+"""
+
+# Returns [[name, profile_url, card_text], ...] for each agency card
+FILMMAKERS_AGENCIES_SCRIPT = _TEXT_HELPERS + """
+var rows = [];
+document.querySelectorAll("h3 > a[href*='/agents/']").forEach(function (a) {
+    var card = a.parentElement && a.parentElement.parentElement;
+    rows.push([squash(a.textContent), a.href, card ? blockText(card) : '']);
+});
+return JSON.stringify(rows);
+"""
+
+# Returns [body_text, [mailto_href, ...]]
+PAGE_EMAILS_SCRIPT = _TEXT_HELPERS + """
+var links = [];
+document.querySelectorAll("a[href^='mailto:']").forEach(function (a) { links.push(a.getAttribute('href')); });
+return JSON.stringify([blockText(document.body), links]);
+"""
+
+
+def extract_crew_jobs_js(driver, target_categories):
+    """Return Crew United job records for the current page using a single execute_script"""
+    rows = json.loads(driver.execute_script(
+        CREW_JOBS_SCRIPT, [category.lower() for category in target_categories]
+    ))
+    jobs = []
+    for raw_text, email in rows:
+        job_data = JobRecord(raw_text=raw_text)
+        if raw_text:
+            job_data['title'] = extract_title(raw_text)
+            if not email:
+                emails = re.findall(EMAIL_PATTERN, raw_text)
+                email = emails[0] if emails else None
+            job_data['email'] = email
+        jobs.append(job_data)
+    return jobs
+
+
+def extract_agencies_js(driver):
+    """Return agency records (with or without email) for the current filmmakers.eu page"""
+    rows = json.loads(driver.execute_script(FILMMAKERS_AGENCIES_SCRIPT))
+    return [parse_agency_text(name, website, card_text) for name, website, card_text in rows]
+
+
+def extract_page_emails_js(driver):
+    """Return (body_text, mailto_hrefs) for the current page"""
+    body_text, mailto_hrefs = json.loads(driver.execute_script(PAGE_EMAILS_SCRIPT))
+    return body_text, mailto_hrefs
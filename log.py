@@ -0,0 +1,103 @@
+# log.py - Leveled, per-module structured logging (readable text, or JSON lines under AUTOMATED)
+
+import json
+import logging
+import sys
+import threading
+from config import LOG_LEVEL, LOG_MODULE_LEVELS, LOG_FORMAT, LOG_REPEAT_LIMIT
+
+ROOT_LOGGER = 'crew_scraper'
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """`log.debug("Found %s", email, page=3)`: %-args are formatted only if the level is enabled,
+    keyword arguments become fields of the JSON line.
+    """
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs)
+                  if key not in ('exc_info', 'stack_info', 'stacklevel', 'extra')}
+        if fields:
+            kwargs['extra'] = {'fields': fields}
+        return msg, kwargs
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname.lower(),
+            'module': record.name.rpartition('.')[2],
+            'msg': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RepeatLimiter(logging.Filter):
+    """Lets through the first `limit` debug lines from each call site, then a notice, then nothing.
+
+    Per-item lines on a 100-page crawl stay a few screens long even with
+    debug logging on; info and above are never dropped.
+    """
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or not self.limit:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            seen = self.counts[key] = self.counts.get(key, 0) + 1
+        if seen <= self.limit:
+            return True
+        if seen == self.limit + 1:
+            record.msg, record.args = f"{record.getMessage()} (further messages like this suppressed)", None
+            return True
+        return False
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at the time, like print (so redirects and auto_run.log keep working)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure(level=LOG_LEVEL, module_levels=LOG_MODULE_LEVELS, fmt=LOG_FORMAT, repeat_limit=LOG_REPEAT_LIMIT):
+    """Set up the handler and levels; called on first use, call again to reconfigure"""
+    global _configured
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = _StdoutHandler()
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter('%(message)s'))
+    handler.addFilter(RepeatLimiter(repeat_limit))
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    root.propagate = False
+    for module, module_level in module_levels.items():
+        logging.getLogger(f'{ROOT_LOGGER}.{module}').setLevel(module_level.upper())
+    _configured = True
+
+
+def get_logger(module):
+    """Logger for one module, e.g. `log = get_logger('job_scraper')`"""
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                configure()
+    return StructuredLogger(logging.getLogger(f'{ROOT_LOGGER}.{module}'), {})
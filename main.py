@@ -4,14 +4,34 @@ import os
 from driver_manager import create_chrome_driver, close_driver
 from navigator import CrewUnitedNavigator
 from job_scraper import CrewUnitedJobScraper
-from config import KEEP_BROWSER_OPEN, VERBOSE
+from config import KEEP_BROWSER_OPEN
+from dedup import DedupState
+import metrics
+from profiling import maybe_profile, pop_profile_flag
+from log import get_logger
+
+log = get_logger('main')
+
+def scrape_crew_united_emails(driver):
+    """Scrape Crew United with an existing driver and return the unique emails found (for unified runs).
+
+    An empty list means the crawl worked and found nothing new; None means it failed.
+    """
+    navigator = CrewUnitedNavigator(driver)
+    scraper = CrewUnitedJobScraper(driver)
+    
+    if not navigator.navigate_to_jobs_page():
+        log.error("❌ Crew-United navigation failed!")
+        return None
+    
+    all_jobs = scraper.paginate_and_scrape()
+    return DedupState(job['email'] for job in all_jobs).items()
+
 
 def main():
     """Phase 2: Navigate to jobs page and detect job listings with details"""
     
-    print("🎬 CREW UNITED SCRAPER - PHASE 2")
-    print("Goal: Navigate to jobs page and detect job listings")
-    print()
+    log.info("🎬 CREW UNITED SCRAPER - PHASE 2")
     
     # Archive existing email files before starting new scrape
     from utils import archive_email_files
@@ -25,53 +45,44 @@ def main():
         navigator = CrewUnitedNavigator(driver)
         scraper = CrewUnitedJobScraper(driver)
         
-        print("🚀 STEP 1: Navigation")
+        log.info("🚀 STEP 1: Navigation")
         success = navigator.navigate_to_jobs_page()
         
         if not success:
-            print("❌ Navigation failed!")
+            log.error("❌ Navigation failed!")
             close_driver(driver, 10)
             return False
         
         # STEP 2: Detect and extract jobs from all pages
-        print("\n🕵️ STEP 2: Job Detection")
+        log.info("🕵️ STEP 2: Job Detection")
         all_jobs = scraper.paginate_and_scrape()
         
         if not all_jobs:
-            print("❌ No job elements found")
-            close_driver(driver, 30)
-            return False
+            # Not a failure: there may be no open target jobs, or none new since the last run
+            log.info("✅ No new target jobs found")
+            close_driver(driver, KEEP_BROWSER_OPEN)
+            return True
         
         # Display the jobs
-        has_jobs = scraper.display_target_jobs(all_jobs)
-
-        if has_jobs:
-            print(f"\n🎉 PHASE 2 COMPLETED SUCCESSFULLY!")
-            print(f"   📊 Total jobs found: {len(all_jobs)}")
-            print(f"   📋 Jobs with content: {len(all_jobs)}")
-            
-            # Check if any new email file was created
-            import glob
-            current_email_files = glob.glob('emails_*.txt')
-            if current_email_files:
-                # Sort by modification time to get the newest
-                current_email_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-                newest_file = current_email_files[0]
-                print(f"   📄 New emails saved to: {newest_file}")
-                print(f"\n🚀 Ready to send emails! Run: make send")
-            else:
-                print(f"   📄 No new email file created (no new unique emails found)")
-                print(f"\n😎 All emails were duplicates from previous scrape - nothing to send!")
+        scraper.display_target_jobs(all_jobs)
+        log.info("🎉 PHASE 2 COMPLETED SUCCESSFULLY! %d jobs found", len(all_jobs), jobs=len(all_jobs))
+        
+        # Check if any new email file was created
+        import glob
+        current_email_files = glob.glob('emails_*.txt')
+        if current_email_files:
+            # Sort by modification time to get the newest
+            current_email_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+            newest_file = current_email_files[0]
+            log.info("📄 New emails saved to: %s - ready to send (make send)", newest_file, file=newest_file)
         else:
-            print(f"\n❌ NO TARGET JOBS FOUND")
-            print(f"   📊 Total jobs found: {len(all_jobs)}")
-            print(f"   📋 Jobs extracted: {len(all_jobs)}")
+            log.info("😎 No new email file created: all emails were duplicates from previous scrape")
 
         close_driver(driver, KEEP_BROWSER_OPEN)
-        return has_jobs
+        return True
 
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        log.error("❌ Unexpected error: %s", e, exc_info=True)
         if driver:
             close_driver(driver, 10)
         return False
@@ -80,7 +91,9 @@ def main():
 if __name__ == '__main__':
     print("\n" + "="*60)
     
-    success = main()
+    with maybe_profile('crew_united', pop_profile_flag()):
+        success = main()
+    metrics.emit('crew_united')
     
     if success:
         print("\n🎯 READY FOR PHASE 3!")
@@ -0,0 +1,130 @@
+# metrics.py - Per-phase timing spans and counters, emitted as a JSON summary and a Prometheus textfile
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from config import METRICS_DIR
+from log import get_logger
+
+log = get_logger('metrics')
+
+
+class RunMetrics:
+    """Durations per phase and labelled counters for one process run; safe to use from threads.
+
+    A span that raises counts as an error for its phase, so error counts
+    come for free wherever spans are placed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.phases = {}  # phase -> [count, total seconds, max seconds]
+        self.counters = {}  # (name, ((label, value), ...)) -> value
+
+    @contextlib.contextmanager
+    def span(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count('errors', phase=phase)
+            raise
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def observe(self, phase, seconds):
+        with self.lock:
+            stats = self.phases.setdefault(phase, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def count(self, name, n=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def summary(self, run):
+        with self.lock:
+            phases = {phase: {'count': count, 'total_s': round(total, 3), 'max_s': round(longest, 3)}
+                      for phase, (count, total, longest) in sorted(self.phases.items())}
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, {})[','.join(f"{k}={v}" for k, v in labels)] = value
+        return {
+            'run': run,
+            'started_at': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'duration_s': round(time.time() - self.started, 3),
+            'phases': phases,
+            'counters': counters,
+        }
+
+    def prometheus(self, run):
+        """Render the summary in the Prometheus text exposition format (node_exporter textfile collector)"""
+        summary = self.summary(run)
+        lines = [
+            '# HELP crew_scraper_phase_seconds Time spent in each phase of the run',
+            '# TYPE crew_scraper_phase_seconds summary',
+        ]
+        for phase, stats in summary['phases'].items():
+            labels = f'run="{run}",phase="{phase}"'
+            lines.append(f'crew_scraper_phase_seconds_sum{{{labels}}} {stats["total_s"]}')
+            lines.append(f'crew_scraper_phase_seconds_count{{{labels}}} {stats["count"]}')
+        lines += ['# HELP crew_scraper_phase_max_seconds Longest single span of each phase',
+                  '# TYPE crew_scraper_phase_max_seconds gauge']
+        lines += [f'crew_scraper_phase_max_seconds{{run="{run}",phase="{phase}"}} {stats["max_s"]}'
+                  for phase, stats in summary['phases'].items()]
+        with self.lock:
+            counters = sorted(self.counters.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f'# TYPE crew_scraper_{name}_total counter')
+            for (counter, labels), value in counters:
+                if counter == name:
+                    label_text = ','.join([f'run="{run}"'] + [f'{k}="{v}"' for k, v in labels])
+                    lines.append(f'crew_scraper_{name}_total{{{label_text}}} {value}')
+        lines += ['# TYPE crew_scraper_run_duration_seconds gauge',
+                  f'crew_scraper_run_duration_seconds{{run="{run}"}} {summary["duration_s"]}',
+                  '# TYPE crew_scraper_last_run_timestamp_seconds gauge',
+                  f'crew_scraper_last_run_timestamp_seconds{{run="{run}"}} {int(self.started)}']
+        return '\n'.join(lines) + '\n'
+
+    def emit(self, run, directory=METRICS_DIR):
+        """Write `<run>.json` and `<run>.prom` into `directory`; returns the JSON path"""
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f'{run}.json')
+        _write_atomic(json_path, json.dumps(self.summary(run), indent=2))
+        _write_atomic(os.path.join(directory, f'{run}.prom'), self.prometheus(run))
+        log.info("📈 Run metrics written to %s", json_path)
+        return json_path
+
+
+def _write_atomic(path, text):
+    # The textfile collector may read at any moment; never let it see a half-written file
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def timed(phase):
+    """Decorator: every call of the function is a span of `phase`"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# One collector per process; the module functions below are what the scrapers call
+METRICS = RunMetrics()
+span = METRICS.span
+observe = METRICS.observe
+count = METRICS.count
+emit = METRICS.emit
@@ -1,17 +1,26 @@
 # navigator.py - Phase 1: Navigation to Jobs Page
 
+import logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-import time
-from config import BASE_URL, JOBS_URL, WAIT_TIMEOUT, PAGE_LOAD_DELAY, VERBOSE
+from config import BASE_URL, JOBS_URL, WAIT_TIMEOUT, PAGE_LOAD_DELAY
+from readiness import ReadinessWaiter, DomQuiescence, RecordCount, NetworkIdle
+import metrics
+from log import get_logger
+
+log = get_logger('navigator')
 
 class CrewUnitedNavigator:
     
-    def __init__(self, driver):
+    def __init__(self, driver, base_url=BASE_URL, jobs_url=JOBS_URL):
         self.driver = driver
+        self.base_url = base_url
+        self.jobs_url = jobs_url  # point both at a local server to run against recorded pages
+        self.ready = ReadinessWaiter(driver)
 
+    @metrics.timed('crew.cookie_banner')
     def dismiss_cookie_banner(self):
         """
         Best-effort cookie/consent dismissal.
@@ -34,8 +43,7 @@ class CrewUnitedNavigator:
                     btn.click()
                 except Exception:
                     self.driver.execute_script("arguments[0].click();", btn)
-                if VERBOSE:
-                    print("🍪 Dismissed cookie/consent banner")
+                log.debug("🍪 Dismissed cookie/consent banner")
                 return True
             except Exception:
                 continue
@@ -44,30 +52,27 @@ class CrewUnitedNavigator:
 
     def go_to_jobs_page_direct(self):
         """Navigate directly to the jobs URL (more robust than clicking header links)."""
-        if VERBOSE:
-            print(f"🌍 Navigating directly to: {JOBS_URL}")
+        log.info("🌍 Navigating directly to: %s", self.jobs_url)
 
         try:
-            self.driver.get(JOBS_URL)
+            self.driver.get(self.jobs_url)
             WebDriverWait(self.driver, WAIT_TIMEOUT).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             self.dismiss_cookie_banner()
-            if VERBOSE:
-                print("   ✅ Jobs page loaded (direct navigation)")
+            log.debug("   ✅ Jobs page loaded (direct navigation)")
             return True
         except Exception as e:
-            print(f"   ❌ Failed to load jobs page directly: {e}")
+            log.warning("   ❌ Failed to load jobs page directly: %s", e)
             return False
     
     def go_to_main_page(self):
         """Navigate to the main Crew United page"""
         
-        if VERBOSE:
-            print(f"🌍 Navigating to: {BASE_URL}")
+        log.info("🌍 Navigating to: %s", self.base_url)
         
         try:
-            self.driver.get(BASE_URL)
+            self.driver.get(self.base_url)
             
             # Wait for page to load
             WebDriverWait(self.driver, WAIT_TIMEOUT).until(
@@ -76,20 +81,18 @@ class CrewUnitedNavigator:
 
             self.dismiss_cookie_banner()
             
-            if VERBOSE:
-                print("   ✅ Main page loaded successfully")
+            log.debug("   ✅ Main page loaded successfully")
             
             return True
             
         except Exception as e:
-            print(f"   ❌ Failed to load main page: {e}")
+            log.error("   ❌ Failed to load main page: %s", e)
             return False
     
     def click_jobs_link(self):
         """Find and click the Jobs link"""
         
-        if VERBOSE:
-            print("🔍 Looking for Jobs link...")
+        log.debug("🔍 Looking for Jobs link...")
         
         try:
             self.dismiss_cookie_banner()
@@ -119,9 +122,7 @@ class CrewUnitedNavigator:
             if jobs_link is None:
                 raise TimeoutException(str(last_err) if last_err else "Jobs link not found")
             
-            if VERBOSE:
-                print("   ✅ Found Jobs link")
-                print("🖱️  Clicking Jobs link...")
+            log.debug("   ✅ Found Jobs link, clicking it...")
             
             # Click the link (with JS fallback in case an overlay intercepts it)
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", jobs_link)
@@ -131,17 +132,16 @@ class CrewUnitedNavigator:
                 self.dismiss_cookie_banner()
                 self.driver.execute_script("arguments[0].click();", jobs_link)
             
-            if VERBOSE:
-                print("   ✅ Jobs link clicked")
+            log.debug("   ✅ Jobs link clicked")
             
             return True
             
         except Exception as e:
-            print(f"   ❌ Failed to find/click Jobs link: {e}")
-            if VERBOSE:
+            log.warning("   ❌ Failed to find/click Jobs link: %s", e)
+            if log.isEnabledFor(logging.DEBUG):
                 try:
-                    print(f"   🔎 Debug URL: {self.driver.current_url}")
-                    print(f"   🔎 Debug Title: {self.driver.title}")
+                    log.debug("   🔎 Debug URL: %s", self.driver.current_url)
+                    log.debug("   🔎 Debug Title: %s", self.driver.title)
                     anchors = self.driver.find_elements(By.TAG_NAME, "a")
                     jobish = []
                     for a in anchors:
@@ -153,73 +153,74 @@ class CrewUnitedNavigator:
                         except Exception:
                             continue
                     if jobish:
-                        print("   🔎 Links that look job-related (up to 8):")
-                        for txt, href in jobish[:8]:
-                            print(f"      - {txt[:60]} -> {href[:120]}")
+                        log.debug("   🔎 Links that look job-related: %s",
+                                  ', '.join(f"{txt[:60]} -> {href[:120]}" for txt, href in jobish[:8]))
                     else:
-                        print("   🔎 No job-like links found on page")
+                        log.debug("   🔎 No job-like links found on page")
                 except Exception:
                     pass
             return False
     
-    def wait_for_jobs_to_load(self):
+    def jobs_list_conditions(self):
+        """Readiness conditions for the jobs list; call before the navigation that loads it"""
+        return self.ready.prepare(
+            RecordCount("span.cu-ui-common-breadcrumb-part"),
+            NetworkIdle(idle_ms=500),
+            DomQuiescence(quiet_ms=300),
+        )
+    
+    @metrics.timed('crew.wait_for_jobs')
+    def wait_for_jobs_to_load(self, conditions=None):
         """Wait for the jobs page to fully load with JavaScript content"""
         
-        if VERBOSE:
-            print(f"⏳ Waiting {PAGE_LOAD_DELAY} seconds for jobs to load...")
-            print("   (JavaScript needs time to fetch and display jobs)")
+        log.debug("⏳ Waiting up to %s seconds for jobs to load...", PAGE_LOAD_DELAY)
         
-        time.sleep(PAGE_LOAD_DELAY)
+        # Jobs are in once listings are rendered and the fetches behind them have finished
+        self.ready.wait("Jobs list", *(conditions or self.jobs_list_conditions()), timeout=PAGE_LOAD_DELAY)
         
         # Check current URL
         current_url = self.driver.current_url
-        if VERBOSE:
-            print(f"   📍 Current URL: {current_url}")
+        log.debug("   📍 Current URL: %s", current_url)
         
         # Check if we're on a jobs-related page
         if "/jobs/" in current_url or "job" in current_url.lower():
-            if VERBOSE:
-                print("   ✅ Successfully on jobs page!")
+            log.info("✅ Successfully on jobs page!")
             return True
         else:
-            if VERBOSE:
-                print("   ⚠️  URL doesn't look like jobs page, but continuing...")
+            log.warning("   ⚠️  URL doesn't look like jobs page, but continuing...", url=current_url)
             return True  # Continue anyway, might still work
     
+    @metrics.timed('crew.navigation')
     def navigate_to_jobs_page(self):
         """Complete navigation flow to jobs page"""
         
-        if VERBOSE:
-            print("=" * 50)
-            print("🚀 STARTING NAVIGATION TO JOBS PAGE")
-            print("=" * 50)
+        log.info("🚀 STARTING NAVIGATION TO JOBS PAGE")
 
         # Prefer direct navigation: avoids brittle header selectors and click interception.
+        conditions = self.jobs_list_conditions()
         if self.go_to_jobs_page_direct():
-            if self.wait_for_jobs_to_load():
+            if self.wait_for_jobs_to_load(conditions):
                 return True
         
         # Step 1: Go to main page
         if not self.go_to_main_page():
             return False
         
-        # Small delay to let page settle
-        time.sleep(2)
+        # Let the page settle (returns early once the DOM stops changing)
+        self.ready.wait("Main page", DomQuiescence(quiet_ms=300), timeout=2)
         
         # Step 2: Click Jobs link
+        conditions = self.jobs_list_conditions()
         if not self.click_jobs_link():
             # As a final fallback, try direct navigation one more time.
+            conditions = self.jobs_list_conditions()
             if not self.go_to_jobs_page_direct():
                 return False
         
         # Step 3: Wait for jobs to load
-        if not self.wait_for_jobs_to_load():
+        if not self.wait_for_jobs_to_load(conditions):
             return False
         
-        if VERBOSE:
-            print("=" * 50)
-            print("🎉 NAVIGATION SUCCESSFUL!")
-            print("=" * 50)
-            print("The browser should now show the jobs page with loaded content.")
+        log.info("🎉 NAVIGATION SUCCESSFUL!")
         
         return True
@@ -0,0 +1,373 @@
+# page_parser.py - Parse listing pages from a single page_source snapshot
+
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import re
+from agency_classifier import AGENCY_CLASSIFIER
+from records import AgencyRecord, JobRecord
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+# Elements that never have children
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Elements whose content is never rendered as text
+HIDDEN_TAGS = {'head', 'script', 'style', 'template', 'noscript', 'title'}
+
+# Elements that start on their own line when rendered
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary',
+    'table', 'tr', 'ul'
+}
+
+# Open elements that are implicitly closed when a sibling of the same kind starts
+SELF_CLOSING_SIBLINGS = {'li', 'p', 'option', 'tr', 'td', 'th', 'dt', 'dd'}
+
+
+class Node:
+    """A minimal DOM element built from page_source"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+
+    def get(self, name, default=None):
+        """Return an attribute value (already entity-decoded)"""
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    def has_class(self, class_name):
+        return class_name in self.get('class', '').split()
+
+    def iter(self, tag=None):
+        """Yield descendant elements in document order"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                continue
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(reversed(node.children))
+
+    def ancestors(self):
+        """Yield ancestors from the nearest outwards"""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    @property
+    def text_content(self):
+        """Raw concatenated text, like DOM textContent"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return ''.join(parts)
+
+    @property
+    def text(self):
+        """Rendered text approximating Selenium's element.text"""
+        lines = []
+        current = []
+        pending_breaks = 0
+
+        def flush(breaks):
+            nonlocal current, pending_breaks
+            line = ' '.join(''.join(current).split())
+            if line:
+                if lines:
+                    lines.extend([''] * (pending_breaks - 1))
+                lines.append(line)
+                pending_breaks = 0
+            current = []
+            pending_breaks = max(pending_breaks, breaks)
+
+        def walk(node):
+            for child in node.children:
+                if isinstance(child, str):
+                    current.append(child)
+                    continue
+                if child.tag in HIDDEN_TAGS:
+                    continue
+                if child.tag == 'br':
+                    flush(1)
+                    continue
+                breaks = 2 if child.tag == 'p' else 1
+                if child.tag in BLOCK_TAGS:
+                    flush(breaks)
+                walk(child)
+                if child.tag in BLOCK_TAGS:
+                    flush(breaks)
+
+        walk(self)
+        flush(0)
+        return '\n'.join(lines)
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a Node tree, tolerating the unclosed tags real pages contain"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SELF_CLOSING_SIBLINGS and self.stack[-1].tag == tag:
+            self.stack.pop()
+        parent = self.stack[-1]
+        node = Node(tag, {name: (value or '') for name, value in attrs}, parent)
+        parent.children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        parent = self.stack[-1]
+        parent.children.append(Node(tag, {name: (value or '') for name, value in attrs}, parent))
+
+    def handle_endtag(self, tag):
+        # Pop up to the matching open element; ignore stray end tags
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(html):
+    """Parse an HTML string into a Node tree and return its root"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def decode_obfuscated_email(obfuscated):
+    """Decode Crew United's '$_isdot_$' / '$_isat_$' email obfuscation"""
+    return obfuscated.replace('$_isdot_$', '.').replace('$_isat_$', '@')
+
+
+def email_from_onclick(onclick_attr):
+    """Return the decoded email from a putTogether('...') onclick handler, or None"""
+    if not onclick_attr or 'putTogether' not in onclick_attr:
+        return None
+    start = onclick_attr.find("'") + 1
+    end = onclick_attr.find("'", start)
+    if start > 0 and end > start:
+        return decode_obfuscated_email(onclick_attr[start:end])
+    return None
+
+
+def extract_title(raw_text):
+    """Pick the job title from the first meaningful lines of a listing"""
+    lines = raw_text.split('\n')
+    for line in lines[:5]:
+        line = line.strip()
+        if line and len(line) > 3 and len(line) < 100:
+            if not any(skip in line.lower() for skip in ['new', 'budget', 'hours', 'eur', 'days old']):
+                return line
+    return None
+
+
+def extract_job_email(job_node, raw_text):
+    """Extract the contact email from a job listing element"""
+    # Obfuscated email first
+    for link in job_node.iter('a'):
+        email = email_from_onclick(link.get('onclick'))
+        if email:
+            return email
+
+    # Direct mailto
+    for link in job_node.iter('a'):
+        href = link.get('href', '')
+        if 'mailto:' in href:
+            return href.replace('mailto:', '')
+
+    # Regex on text
+    emails = re.findall(EMAIL_PATTERN, raw_text)
+    return emails[0] if emails else None
+
+
+def find_target_job_nodes(root, target_categories):
+    """Find the job <li> elements whose breadcrumb names one of the target categories.
+
+    Breadcrumbs are matched on their rendered text, like the element walk's
+    `.text`. A job listed under two target categories is returned once.
+    """
+    targets = [category.lower() for category in target_categories]
+    job_nodes = []
+    seen = set()
+
+    for span in root.iter('span'):
+        if not span.has_class('cu-ui-common-breadcrumb-part'):
+            continue
+        breadcrumb_text = ' '.join(span.text.split()).lower()
+        if not any(category in breadcrumb_text for category in targets):
+            continue
+
+        # Selenium's ancestor::li lookup returns the outermost <li> (document order)
+        job_node = None
+        for ancestor in span.ancestors():
+            if ancestor.tag == 'li':
+                job_node = ancestor
+        if job_node is not None and id(job_node) not in seen:
+            seen.add(id(job_node))
+            job_nodes.append(job_node)
+
+    return job_nodes
+
+
+def parse_crew_jobs(html, target_categories):
+    """Parse all target-category jobs from a Crew United listing page snapshot"""
+    jobs = []
+    for job_node in find_target_job_nodes(parse_html(html), target_categories):
+        job_data = JobRecord(raw_text=job_node.text.strip())
+        if job_data['raw_text']:
+            job_data['title'] = extract_title(job_data['raw_text'])
+            job_data['email'] = extract_job_email(job_node, job_data['raw_text'])
+        jobs.append(job_data)
+    return jobs
+
+
+def new_agency_data():
+    """Return an empty agency record with all CSV fields"""
+    return AgencyRecord()
+
+
+def parse_agency_text(name, website, agency_text, agency_data=None):
+    """Build an agency record from its name, profile link and the text of its listing card
+
+    Pass `agency_data` (any mapping with the CSV fields, e.g. a plain dict) to fill it instead.
+    """
+    if agency_data is None:
+        agency_data = new_agency_data()
+    agency_data['name'] = name
+    agency_data['website'] = website or ''
+
+    # Extract email using regex
+    emails = re.findall(EMAIL_PATTERN, agency_text)
+    if emails:
+        agency_data['email'] = emails[0].lower()
+
+    # Extract phone using regex (various international formats)
+    phone_patterns = [
+        r'\+\d{1,4}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}',  # +49 30 403 01850
+        r'\+\d{2,3}\s?\d{1,4}\s?\d{2,4}\s?\d{2,4}',  # +44 20 7160 6333
+        r'\+\d{10,15}',  # +447789935248
+        r'\d{2,4}\s?\d{2,4}\s?\d{2,4}\s?\d{2,4}',  # 020 7160 6333
+    ]
+
+    for pattern in phone_patterns:
+        phones = re.findall(pattern, agency_text)
+        if phones:
+            agency_data['phone'] = phones[0].strip()
+            break
+
+    # Country (with its line as the address), regions and specialties in one scan
+    agency_data.update(AGENCY_CLASSIFIER.classify(agency_text))
+
+    # Clean up address - remove email and phone if they got mixed in
+    if agency_data['address']:
+        # Remove email and phone from address
+        address_clean = agency_data['address']
+        if agency_data['email']:
+            address_clean = address_clean.replace(agency_data['email'], '').strip()
+        if agency_data['phone']:
+            address_clean = address_clean.replace(agency_data['phone'], '').strip()
+        agency_data['address'] = address_clean
+
+    return agency_data
+
+
+def parse_filmmakers_agencies(root, base_url=''):
+    """Parse every agency card (h3 > a[href*='/agents/']) on a filmmakers.eu listing page"""
+    agencies = []
+    for heading in root.iter('h3'):
+        for link in heading.children:
+            if isinstance(link, str) or link.tag != 'a' or '/agents/' not in link.get('href', ''):
+                continue
+            # Same container the Selenium path reads via the "../.." XPath
+            card = heading.parent
+            agencies.append(parse_agency_text(
+                ' '.join(link.text_content.split()),
+                urljoin(base_url, link.get('href')),
+                card.text if card is not None else ''
+            ))
+    return agencies
+
+
+def parse_agency_profile(root, name, profile_url):
+    """Build an agency record from its filmmakers.eu profile page (/agents/...).
+
+    Only <main> is read, so the site's own header and footer contacts are
+    never taken for the agency's. The first link to another host is the
+    agency's own website.
+    """
+    main = next(root.iter('main'), None) or next(root.iter('body'), root)
+    agency_data = parse_agency_text(name, '', main.text)
+    for link in main.iter('a'):
+        href = link.get('href', '')
+        if href.startswith('mailto:'):
+            agency_data['email'] = agency_data['email'] or href[len('mailto:'):].split('?')[0].strip().lower()
+            continue
+        url = urljoin(profile_url, href)
+        parts = urlsplit(url)
+        if not agency_data['website'] and parts.scheme in ('http', 'https') \
+                and parts.hostname != urlsplit(profile_url).hostname:
+            agency_data['website'] = url
+    return agency_data
+
+
+def extract_page_emails(root):
+    """Return (body_text, mailto_hrefs) for a parsed page"""
+    body = next(root.iter('body'), root)
+    mailto_hrefs = [link.get('href') for link in root.iter('a') if link.get('href', '').startswith('mailto:')]
+    return body.text, mailto_hrefs
+
+
+def find_filmmakers_pagination(root):
+    """Return the filmmakers.eu pagination <ul>, or None"""
+    for nav in root.iter('nav'):
+        for ul in nav.iter('ul'):
+            return ul
+    return None
+
+
+def find_filmmakers_next_link(root):
+    """Return the pagination 'next' <a> (the li[9] link the Selenium path clicks), or None"""
+    pagination = find_filmmakers_pagination(root)
+    if pagination is None:
+        return None
+    items = [child for child in pagination.children if not isinstance(child, str) and child.tag == 'li']
+    if len(items) >= 9:
+        return next(items[8].iter('a'), None)
+    for link in pagination.iter('a'):
+        if link.get('rel') == 'next':
+            return link
+    return None
+
+
+def filmmakers_page_has_results(root):
+    """Apply the Selenium path's end-of-results check to a parsed page"""
+    if find_filmmakers_pagination(root) is None:
+        return False
+    page_text, _ = extract_page_emails(root)
+    lowered = page_text.lower()
+    return not ("no results" in lowered or "not found" in lowered or len(page_text.strip()) < 500)
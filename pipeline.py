@@ -0,0 +1,142 @@
+# pipeline.py - Streaming pipeline: scrapers emit records, generator stages consume them as they arrive
+
+import queue
+import re
+import threading
+from config import PIPELINE_QUEUE_SIZE
+from dedup import DedupState
+from page_parser import EMAIL_PATTERN
+from log import get_logger
+
+log = get_logger('pipeline')
+
+_DONE = object()
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+
+class PipelineClosed(Exception):
+    """Raised inside a producer when the consumer has stopped reading"""
+
+
+class _Failure:
+    def __init__(self, source, error):
+        self.source = source
+        self.error = error
+
+
+def merge(producers, maxsize=PIPELINE_QUEUE_SIZE):
+    """Run each `producer(emit)` in its own thread and yield every record emitted, as it arrives.
+
+    `producers` maps a source label to a callable; each record is tagged
+    with its source. The queue between producers and the consumer is
+    bounded, so a scraper blocks in `emit` while downstream stages catch up
+    instead of piling records up in memory. A producer that raises is
+    reported and the others keep going.
+    """
+    records = queue.Queue(maxsize)
+    closed = threading.Event()
+
+    def run(source, producer):
+        def emit(record):
+            record = dict(record, source=source)
+            while True:
+                if closed.is_set():
+                    raise PipelineClosed()
+                try:
+                    records.put(record, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+        try:
+            producer(emit)
+        except PipelineClosed:
+            pass
+        except Exception as e:
+            records.put(_Failure(source, e))
+        records.put(_DONE)
+
+    threads = [threading.Thread(target=run, args=item, name=f"producer-{item[0]}", daemon=True)
+               for item in producers.items()]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(threads)
+    try:
+        while remaining:
+            item = records.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, _Failure):
+                log.error("❌ %s scraper crashed: %s", item.source, item.error, site=item.source)
+            else:
+                yield item
+    finally:
+        closed.set()  # consumer stopped early: unblock producers so their threads exit
+        while remaining:
+            if records.get() is _DONE:
+                remaining -= 1
+
+
+def validate(records):
+    """Drop records without a well-formed email; strips whitespace around the address"""
+    for record in records:
+        email = (record.get('email') or '').strip()
+        if _EMAIL_RE.fullmatch(email):
+            record['email'] = email
+            yield record
+
+
+def dedup(records, seen=None):
+    """Drop records whose email (case-insensitive) was already yielded"""
+    seen = seen if seen is not None else DedupState(key=lambda record: record['email'].lower())
+    for record in records:
+        if seen.add(record):
+            yield record
+
+
+def filter_known(records, store):
+    """Drop emails seen in any previous scrape and record the new ones in the contact store"""
+    for record in records:
+        if store.filter_new([record['email']], record.get('source', 'scrape')):
+            yield record
+
+
+def enrich(records, fn):
+    """Pass each record through `fn`, which returns the (updated) record or None to drop it"""
+    for record in records:
+        record = fn(record)
+        if record is not None:
+            yield record
+
+
+def write_emails(records, path):
+    """Append each record's email to `path` as it passes; the file only exists once one arrives"""
+    f = None
+    try:
+        for record in records:
+            if f is None:
+                f = open(path, 'w', encoding='utf-8')
+            f.write(f"{record['email']}\n")
+            f.flush()
+            yield record
+    finally:
+        if f is not None:
+            f.close()
+
+
+def enqueue_for_send(records, journal):
+    """Queue each email in the send journal so `email_sender.py send` picks it up"""
+    from send_journal import QUEUED
+    for record in records:
+        if journal.state(record['email']) is None:
+            journal.mark(record['email'], QUEUED)
+        yield record
+
+
+def drain(records):
+    """Pull records through the pipeline; returns how many came out the end per source"""
+    counts = {}
+    for record in records:
+        source = record.get('source', '')
+        counts[source] = counts.get(source, 0) + 1
+    return counts
@@ -0,0 +1,178 @@
+# profiling.py - `--profile` support: flat top-N report and flamegraph stacks for one run
+
+import cProfile
+import collections
+import contextlib
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+from config import PROFILE_DIR, PROFILE_TOP_N, PROFILE_SAMPLE_INTERVAL
+from log import get_logger
+
+log = get_logger('profiling')
+
+# From 3.12 cProfile sits on sys.monitoring, which allows one active profiler per process
+PER_THREAD_CPROFILE = sys.version_info < (3, 12)
+
+
+def pop_profile_flag(argv=None):
+    """Remove `--profile` from argv (sys.argv by default) so the usual argument parsing is unchanged"""
+    argv = sys.argv if argv is None else argv
+    if '--profile' in argv:
+        argv.remove('--profile')
+        return True
+    return False
+
+
+class RunProfiler:
+    """Profiles every thread of a run two ways.
+
+    cProfile (deterministic, one profile per thread, merged) gives the flat
+    top-N report and sees C calls, so regex matching, socket reads and file
+    writes show up by name. A sampling thread records Python stacks of all
+    threads every PROFILE_SAMPLE_INTERVAL seconds and writes them in the
+    collapsed format flamegraph.pl and speedscope read. Each thread turns
+    its own profile into stats as it finishes, so threads still running
+    when the run ends are left out of the report. On Python 3.12+ only the
+    main thread can be cProfiled; worker threads then show up in the stack
+    samples only.
+    """
+
+    def __init__(self, run, directory=PROFILE_DIR, top=PROFILE_TOP_N, interval=PROFILE_SAMPLE_INTERVAL):
+        self.run = run
+        self.directory = directory
+        self.top = top
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread_stats = []  # pstats.Stats of each finished thread
+        self.stacks = collections.Counter()
+        self.stopped = threading.Event()
+        self.report_path = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self.sampler.start()
+        if PER_THREAD_CPROFILE:
+            # Threads started during the run profile themselves
+            self.thread_run = threading.Thread.run
+            threading.Thread.run = self._profiled(self.thread_run)
+        self.main_profile = cProfile.Profile()
+        self.main_profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.main_profile.disable()
+        self._collect(self.main_profile)
+        if PER_THREAD_CPROFILE:
+            threading.Thread.run = self.thread_run
+        self.stopped.set()
+        self.sampler.join()
+        self.elapsed = time.perf_counter() - self.started
+        self.write()
+
+    def _profiled(self, run):
+        """Wrap Thread.run so each thread profiles itself and hands in its stats when it finishes"""
+        @functools.wraps(run)
+        def profiled_run(thread):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                return run(thread)  # another profiler is active; never let that kill the thread
+            try:
+                return run(thread)
+            finally:
+                profile.disable()
+                self._collect(profile)
+        return profiled_run
+
+    def _collect(self, profile):
+        # Called from the profiled thread itself, once its profile is disabled
+        try:
+            stats = pstats.Stats(profile, stream=io.StringIO())
+        except TypeError:
+            return  # a thread that never made a call
+        with self.lock:
+            self.thread_stats.append(stats)
+
+    def _sample(self):
+        me = threading.get_ident()
+        names = {}
+        while not self.stopped.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stats(self):
+        """Merged stats of the main thread and every thread that has finished"""
+        stats = pstats.Stats(stream=io.StringIO())
+        with self.lock:
+            for thread_stats in self.thread_stats:
+                stats.add(thread_stats)
+        return stats
+
+    def write(self):
+        """Write `<run>_profile_<timestamp>.txt` (report) and `.collapsed` (flamegraph stacks)"""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{self.run}_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        stats = self.stats()
+        report = io.StringIO()
+        report.write(f"Profile of '{self.run}' - {self.elapsed:.1f}s wall, {len(self.thread_stats)} threads\n")
+        if not PER_THREAD_CPROFILE:
+            report.write("(main thread only: worker threads appear in the .collapsed stack samples)\n")
+        report.write("\n")
+        report.write("Where the time went (overlapping buckets, seconds):\n")
+        for label, seconds in time_by_category(stats).items():
+            report.write(f"  {label:<28} {seconds:9.3f}\n")
+        for order in ('tottime', 'cumulative'):
+            report.write(f"\nTop {self.top} functions by {order}:\n")
+            stats.stream = report
+            stats.sort_stats(order).print_stats(self.top)
+        self.report_path = base + '.txt'
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+        log.info("🔬 Profile written to %s (flamegraph stacks: %s.collapsed)", self.report_path, base)
+
+
+def time_by_category(stats):
+    """Seconds spent in chromedriver RPC, SMTP, regex, file I/O, network reads and sleeps"""
+    buckets = collections.OrderedDict((label, 0.0) for label in (
+        'chromedriver RPC', 'SMTP', 'regex', 'file I/O', 'socket I/O', 'sleeping/waiting'))
+    for (filename, line, name), (calls, primitive, tottime, cumtime, callers) in stats.stats.items():
+        path = filename.replace('\\', '/')
+        if path.endswith('selenium/webdriver/remote/webdriver.py') and name == 'execute':
+            buckets['chromedriver RPC'] += cumtime  # every WebDriver command goes through execute()
+        elif path.endswith('email_sender.py') and name in ('_connect', '_deliver'):
+            buckets['SMTP'] += cumtime
+        elif "re.Pattern" in name or path.endswith(('/re/__init__.py', '/re.py')):
+            buckets['regex'] += tottime
+        elif "_io." in name or 'posix.fsync' in name or name == '<built-in method io.open>':
+            buckets['file I/O'] += tottime
+        elif "_socket.socket" in name or "_ssl._SSLSocket" in name:
+            buckets['socket I/O'] += tottime
+        elif name in ('<built-in method time.sleep>', "<method 'acquire' of '_thread.lock' objects>"):
+            buckets['sleeping/waiting'] += tottime
+    return buckets
+
+
+def maybe_profile(run, enabled):
+    """`with maybe_profile('unified', pop_profile_flag()):` around an entry point's work"""
+    return RunProfiler(run) if enabled else contextlib.nullcontext()
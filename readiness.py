@@ -0,0 +1,181 @@
+# readiness.py - Adaptive page-readiness detection instead of fixed sleeps
+
+import json
+import time
+from selenium.webdriver.support import expected_conditions as EC
+from config import READY_TIMEOUT, READY_POLL_INTERVAL
+from log import get_logger
+
+log = get_logger('readiness')
+
+
+class ReadinessCondition:
+    """Base class: `prepare` runs before the action that changes the page, `is_ready` is polled after"""
+
+    name = 'condition'
+
+    def prepare(self, driver):
+        pass
+
+    def is_ready(self, driver):
+        raise NotImplementedError
+
+
+class DomQuiescence(ReadinessCondition):
+    """Ready once a MutationObserver has seen no DOM changes for `quiet_ms`"""
+
+    name = 'dom quiet'
+
+    INSTALL_SCRIPT = """
+    if (!window.__cuDomWatch) {
+        window.__cuDomWatch = {last: performance.now()};
+        new MutationObserver(function () { window.__cuDomWatch.last = performance.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        return -1;
+    }
+    return performance.now() - window.__cuDomWatch.last;
+    """
+
+    def __init__(self, quiet_ms=500):
+        self.quiet_ms = quiet_ms
+
+    def is_ready(self, driver):
+        # A new document has no observer yet: the first poll installs it and counts as "not quiet"
+        quiet_for = driver.execute_script(self.INSTALL_SCRIPT)
+        return quiet_for >= self.quiet_ms
+
+
+class RecordCount(ReadinessCondition):
+    """Ready once at least `minimum` elements match `css_selector`"""
+
+    name = 'records'
+
+    def __init__(self, css_selector, minimum=1):
+        self.css_selector = css_selector
+        self.minimum = minimum
+
+    def is_ready(self, driver):
+        count = driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;", self.css_selector
+        )
+        return count >= self.minimum
+
+
+class StalenessOf(ReadinessCondition):
+    """Ready once the previous page's marker element has been detached"""
+
+    name = 'previous page stale'
+
+    def __init__(self, element):
+        self.element = element
+
+    def is_ready(self, driver):
+        if self.element is None:
+            return True
+        return EC.staleness_of(self.element)(driver)
+
+
+class NetworkIdle(ReadinessCondition):
+    """Ready once no requests have been in flight for `idle_ms`.
+
+    Tracks CDP Network events from Chrome's performance log (enabled via
+    CDP_PERFORMANCE_LOG in config.py). Without that log it falls back to
+    watching the Resource Timing buffer stop growing.
+    """
+
+    name = 'network idle'
+
+    def __init__(self, idle_ms=500):
+        self.idle_ms = idle_ms
+        self.in_flight = set()
+        self.last_activity = time.perf_counter()
+        self.use_cdp = True
+        self.resource_count = -1
+
+    def prepare(self, driver):
+        self.in_flight.clear()
+        self.last_activity = time.perf_counter()
+        try:
+            driver.get_log('performance')  # drain events from before the action
+        except Exception:
+            self.use_cdp = False
+
+    def _poll_cdp(self, driver):
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method', '')
+            request_id = message.get('params', {}).get('requestId')
+            if method == 'Network.requestWillBeSent':
+                self.in_flight.add(request_id)
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                self.in_flight.discard(request_id)
+            else:
+                continue
+            self.last_activity = time.perf_counter()
+
+    def _poll_resource_timing(self, driver):
+        count = driver.execute_script("return performance.getEntriesByType('resource').length;")
+        if count != self.resource_count:
+            self.resource_count = count
+            self.last_activity = time.perf_counter()
+
+    def is_ready(self, driver):
+        if self.use_cdp:
+            try:
+                self._poll_cdp(driver)
+            except Exception:
+                self.use_cdp = False
+        if not self.use_cdp:
+            self._poll_resource_timing(driver)
+        idle_for = (time.perf_counter() - self.last_activity) * 1000
+        return not self.in_flight and idle_for >= self.idle_ms
+
+
+class ReadinessWaiter:
+    """Polls readiness conditions and records how long every wait actually took"""
+
+    def __init__(self, driver, timeout=READY_TIMEOUT, poll_interval=READY_POLL_INTERVAL):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.timings = []  # [{'label', 'seconds', 'ready'}, ...]
+
+    def prepare(self, *conditions):
+        """Call before the click/navigation so conditions can snapshot the old page"""
+        for condition in conditions:
+            condition.prepare(self.driver)
+        return conditions
+
+    def wait(self, label, *conditions, timeout=None):
+        """Return True as soon as every condition holds on the same poll, or False after the timeout.
+
+        Conditions are checked in the order given and all of them on every
+        poll, so `StalenessOf(old), RecordCount(...)` only passes once the
+        records counted belong to the new page.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        pending = list(conditions)
+
+        while True:
+            try:
+                pending = [condition for condition in conditions if not condition.is_ready(self.driver)]
+            except Exception as e:
+                log.debug("   ⚠️  Readiness check failed (%s), retrying...", e)
+            elapsed = time.perf_counter() - start
+            if not pending or elapsed >= timeout:
+                break
+            time.sleep(self.poll_interval)
+
+        ready = not pending
+        self.timings.append({'label': label, 'seconds': round(elapsed, 3), 'ready': ready})
+        if ready:
+            log.debug("   ⚡ %s ready after %.2fs", label, elapsed, seconds=round(elapsed, 3))
+        else:
+            waiting_on = ', '.join(condition.name for condition in pending)
+            log.debug("   ⏰ %s not ready after %.2fs (waiting on: %s) - continuing", label, elapsed, waiting_on,
+                      seconds=round(elapsed, 3))
+        return ready
+
+    def total_seconds(self):
+        return sum(timing['seconds'] for timing in self.timings)
@@ -0,0 +1,104 @@
+# record_log.py - Append-only JSON-lines log with batched fsync
+
+import json
+import os
+import threading
+import time
+from records import json_default
+
+
+class AppendOnlyLog:
+    """One JSON record per line, appended and never rewritten in place.
+
+    Writes go through to the OS on every append; fsync happens once per
+    `fsync_every` records or `fsync_interval` seconds, so a crash loses at
+    most that last batch. A torn final line from a crash is skipped on replay
+    and cut off when the log is reopened for appending.
+    """
+
+    def __init__(self, path, fsync_every=20, fsync_interval=1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        _drop_torn_tail(path)
+        self.file = open(path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=json_default) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            self.unsynced += 1
+            if self.unsynced >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def sync(self):
+        with self.lock:
+            if self.unsynced:
+                self._sync()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                if self.unsynced:
+                    self._sync()
+                self.file.close()
+
+    def compact(self, records):
+        """Atomically replace the log with `records` (e.g. only the latest state per key)"""
+        with self.lock:
+            self.file.close()
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=json_default) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            self.unsynced = 0
+
+
+def _drop_torn_tail(path):
+    """Cut a half-written last line left by a crash, so new records start on a fresh line"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        f.seek(0)
+        data = f.read()
+        f.truncate(data.rfind(b'\n') + 1)
+
+
+def replay(path):
+    """Yield every complete record in the log at `path` (nothing if it does not exist)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break  # torn write from a crash
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,124 @@
+# records.py - Compact slotted record types for scraped jobs and agencies
+
+import csv
+import json
+import sys
+
+
+class Record:
+    """Base for slotted records that still read like the dicts they replace.
+
+    `record['email']`, `record.get(...)`, `dict(record)` and comparing with a
+    dict keep working, so existing callers need no changes. Fields listed in
+    `INTERNED` have few distinct values (countries, regions...) and are
+    interned so every record shares one string object.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    INTERNED = ()
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __setitem__(self, field, value):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        if field in self.INTERNED and value:
+            value = sys.intern(value)
+        setattr(self, field, value)
+
+    def __contains__(self, field):
+        return field in self.FIELDS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_row() == other.to_row()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # mutable, like the dicts they replace
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{field}={getattr(self, field)!r}' for field in self.FIELDS)})"
+
+    def get(self, field, default=None):
+        return getattr(self, field, default) if field in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+    def to_row(self):
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def to_dict(self):
+        return dict(zip(self.FIELDS, self.to_row()))
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        record.update({field: data[field] for field in cls.FIELDS if field in data})
+        return record
+
+
+class JobRecord(Record):
+    """A Crew United job listing"""
+
+    __slots__ = FIELDS = ('title', 'email', 'raw_text', 'is_target_category')
+
+    def __init__(self, title=None, email=None, raw_text=None, is_target_category=True):
+        self.title = title
+        self.email = email
+        self.raw_text = raw_text
+        self.is_target_category = is_target_category
+
+    def drop_raw_text(self):
+        """Release the listing text once title, email and fingerprint have been taken from it"""
+        self.raw_text = None
+
+
+class AgencyRecord(Record):
+    """A filmmakers.eu talent agency; field order is the CSV column order"""
+
+    __slots__ = FIELDS = ('name', 'email', 'phone', 'address', 'country', 'website', 'regions', 'specialties')
+    INTERNED = ('country', 'regions', 'specialties')
+
+    def __init__(self, name='', email='', phone='', address='', country='', website='', regions='', specialties=''):
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.address = address
+        self.country = sys.intern(country)
+        self.website = website
+        self.regions = sys.intern(regions)
+        self.specialties = sys.intern(specialties)
+
+
+def write_csv(records, f, record_type=AgencyRecord):
+    """Write a header and one row per record (plain dicts are accepted too) to an open file"""
+    writer = csv.writer(f)
+    writer.writerow(record_type.FIELDS)
+    writer.writerows(record.to_row() if isinstance(record, Record) else
+                     [record.get(field, '') for field in record_type.FIELDS]
+                     for record in records)
+
+
+def json_default(obj):
+    """`json.dumps(..., default=json_default)` serializes records as plain objects"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
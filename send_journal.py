@@ -0,0 +1,80 @@
+# send_journal.py - Durable per-recipient outbox state so an interrupted send resumes where it stopped
+
+from datetime import datetime
+from record_log import AppendOnlyLog, replay
+from config import SEND_MAX_ATTEMPTS, SEND_JOURNAL_FSYNC_EVERY
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in-flight'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class SendJournal:
+    """Outbox journal next to an email file: `<email_file>.journal`.
+
+    Every state change is one appended line; the latest line per recipient
+    wins on replay. Recipients left in-flight by a crash are retried.
+    """
+
+    def __init__(self, path, fsync_every=SEND_JOURNAL_FSYNC_EVERY):
+        self.path = path
+        self.entries = {}  # email -> {'email', 'state', 'attempts', 'at', 'error'}
+        for record in replay(path):
+            self.entries[record['email']] = record
+        self.log = AppendOnlyLog(path, fsync_every=fsync_every)
+
+    @classmethod
+    def for_file(cls, email_file):
+        return cls(email_file + '.journal')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def state(self, email):
+        entry = self.entries.get(email)
+        return entry['state'] if entry else None
+
+    def attempts(self, email):
+        entry = self.entries.get(email)
+        return entry['attempts'] if entry else 0
+
+    def mark(self, email, state, error=None):
+        attempts = self.attempts(email) + (1 if state == IN_FLIGHT else 0)
+        record = {
+            'email': email,
+            'state': state,
+            'attempts': attempts,
+            'at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if error:
+            record['error'] = error
+        self.entries[email] = record
+        self.log.append(record)
+
+    def resume(self, emails, max_attempts=SEND_MAX_ATTEMPTS):
+        """Return the recipients still to send, queueing any the journal has not seen yet"""
+        pending = []
+        for email in emails:
+            state = self.state(email)
+            if state == SENT or (state in (FAILED, IN_FLIGHT) and self.attempts(email) >= max_attempts):
+                continue
+            if state is None:
+                self.mark(email, QUEUED)
+            pending.append(email)
+        self.log.sync()
+        return pending
+
+    def counts(self):
+        counts = {QUEUED: 0, IN_FLIGHT: 0, SENT: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry['state']] += 1
+        return counts
+
+    def close(self):
+        """Collapse the journal to one line per recipient and close it"""
+        self.log.compact(self.entries.values())
+        self.log.close()
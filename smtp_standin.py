@@ -0,0 +1,92 @@
+# smtp_standin.py - Minimal local SMTP server for testing and benchmarking the email sender
+#
+# Speaks just enough SMTP for smtplib (EHLO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT),
+# can simulate handshake and per-message latency and a per-connection message limit, and keeps
+# nothing but counters - no mail is stored or relayed.
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.connect_delay)  # TCP + TLS handshake stand-in
+        self.reply("220 localhost SMTP stand-in ready")
+        messages_on_connection = 0
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self.reply("250-localhost")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif verb == 'HELO':
+                self.reply("250 localhost")
+            elif verb == 'AUTH':
+                time.sleep(server.auth_delay)
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == 'MAIL':
+                if server.max_messages_per_connection and messages_on_connection >= server.max_messages_per_connection:
+                    self.reply("421 4.7.0 Too many messages on this connection")
+                    return
+                self.reply("250 OK")
+            elif verb == 'RCPT':
+                self.reply("250 OK")
+            elif verb == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                time.sleep(server.message_delay)  # provider-side queueing/scanning
+                messages_on_connection += 1
+                with server.lock:
+                    server.messages += 1
+                self.reply("250 OK queued")
+            elif verb in ('RSET', 'NOOP'):
+                self.reply("250 OK")
+            elif verb == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Local SMTP server on 127.0.0.1; use as a context manager"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay=0.0, auth_delay=0.0, message_delay=0.0, max_messages_per_connection=0):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.connect_delay = connect_delay
+        self.auth_delay = auth_delay
+        self.message_delay = message_delay
+        self.max_messages_per_connection = max_messages_per_connection
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for filmmakers.eu checkpoint/resume
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from agency_enricher import needs_profile
+from filmmakers_scraper import FilmmakersScraper, compact_progress_log
+from record_log import replay
+from test_filmmakers_http import serve_fixtures
+
+
+def local_scraper(base_url):
+    scraper = FilmmakersScraper(None, backend='http')
+    scraper.base_url = base_url + 'page1.html'
+    return scraper
+
+
+def test_crash_resumes_on_the_checkpointed_page():
+    server, base_url = serve_fixtures('filmmakers')
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            # First run dies while extracting page 2
+            crashing = local_scraper(base_url)
+            extract = crashing.extract_agencies_from_page
+            calls = []
+
+            def extract_then_crash():
+                calls.append(1)
+                if len(calls) == 2:
+                    raise ConnectionError("network dropped")
+                return extract()
+
+            crashing.extract_agencies_from_page = extract_then_crash
+            assert crashing.navigate_and_setup_filters()
+            crashing.scrape_all_pages(extract_full_data=True)
+            crashing.close()
+            state = crashing.checkpoint_for(True).load()
+            assert state['page'] == 2 and state['url'].endswith('page2.html')
+            assert len(list(replay(state['progress_log']))) == 4  # page 1's new agencies, appended as found
+
+            # The log left behind can be turned into the usual CSV without re-scraping
+            recovered = compact_progress_log(state['progress_log'])
+            with open(recovered) as f:
+                assert len(f.readlines()) == 1 + 4
+
+            # Restart jumps straight to page 2 with page 1's agencies restored
+            scraper = local_scraper(base_url)
+            assert scraper.navigate_and_setup_filters()
+            assert scraper.resume_from_checkpoint(extract_full_data=True)
+            assert scraper.start_page == 2 and scraper.resume_seconds is not None
+            agencies, emails = scraper.scrape_all_pages(extract_full_data=True)
+            assert len(agencies) == 6 and len(emails) == 6
+            assert scraper.http.fetcher.stats['requests'] == 2  # page 1, then page 2 directly
+            assert scraper.checkpoint_for(True).load() is None  # cleared once the crawl finished
+            assert not os.path.exists(state['progress_log'])  # compacted into the final CSV
+            scraper.close()
+
+            # A checkpoint from the other mode is neither picked up nor cleared
+            crashing.save_checkpoint(dict(state, extract_full_data=False))
+            scraper = local_scraper(base_url)
+            scraper.navigate_and_setup_filters()
+            assert not scraper.resume_from_checkpoint(extract_full_data=True)
+            scraper.scrape_all_pages(extract_full_data=True)
+            assert scraper.checkpoint_for(False).load()['page'] == 2
+            scraper.close()
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+
+class HeldEnricher:
+    """Profile fetches that don't finish until `release` is set"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.pool = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, agencies):
+        return [(agency, self.pool.submit(self.release.wait, 10)) for agency in agencies if needs_profile(agency)]
+
+    def collect(self, pending):
+        for _, future in pending:
+            future.result()
+        return 0
+
+    def close(self):
+        self.release.set()
+        self.pool.shutdown()
+
+
+def test_pagination_runs_ahead_of_profile_fetches():
+    server, base_url = serve_fixtures('filmmakers')
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            scraper = local_scraper(base_url)
+            scraper.enricher = enricher = HeldEnricher()
+            extract = scraper.extract_agencies_from_page
+            on_page_two = []
+
+            def extract_page():
+                if scraper.http.url.endswith('page2.html'):
+                    # Page 1's profile is still loading, so nothing of it is recorded or checkpointed yet
+                    on_page_two.append(scraper.checkpoint_for(True).load())
+                    enricher.release.set()
+                return extract()
+
+            scraper.extract_agencies_from_page = extract_page
+            assert scraper.navigate_and_setup_filters()
+            agencies, emails = scraper.scrape_all_pages(extract_full_data=True, save_results=False)
+            assert on_page_two == [None]
+            assert len(agencies) == 5  # all recorded in the end; the held profile filled in no email
+            scraper.close()
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    test_crash_resumes_on_the_checkpointed_page()
+    test_pagination_runs_ahead_of_profile_fetches()
+    print("🎉 Checkpoint tests PASSED!")
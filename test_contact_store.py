@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite contact store used for email dedup
+"""
+
+import os
+import tempfile
+from contact_store import ContactStore
+from utils import filter_new_emails
+
+
+def test_dedup_covers_full_history():
+    """An email seen two runs ago is still not new"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with ContactStore(os.path.join(tmp, 'contacts.db')) as store:
+            assert store.filter_new(['a@x.de', 'b@x.de'], 'crew_united') == ['a@x.de', 'b@x.de']
+            assert store.filter_new(['c@x.de'], 'filmmakers') == ['c@x.de']
+            assert store.filter_new(['A@x.de ', 'c@x.de', 'd@x.de', 'd@x.de'], 'crew_united') == ['d@x.de']
+
+            source, first_seen, last_seen, times_seen = store.conn.execute(
+                "SELECT source, first_seen, last_seen, times_seen FROM contacts WHERE email = 'a@x.de'"
+            ).fetchone()
+            assert source == 'crew_united' and times_seen == 2 and first_seen <= last_seen
+            assert store.count() == 4
+
+
+def test_one_time_archive_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            os.makedirs(os.path.join('archived_scrapes', 'September 23, 2025'))
+            with open(os.path.join('archived_scrapes', 'September 23, 2025', 'filmmakers_emails_20250923.txt'), 'w') as f:
+                f.write("old@agency.de\nother@agency.de\n")
+            with open('notes.txt', 'w') as f:
+                f.write("not-an-export@x.de\n")
+
+            with ContactStore('contacts.db') as store:
+                assert store.import_archive() == 2
+                assert store.import_archive() == 0  # already imported
+                assert store.known(['OLD@agency.de', 'new@agency.de', 'not-an-export@x.de']) == {'old@agency.de'}
+                assert store.conn.execute("SELECT source FROM contacts").fetchone()[0] == 'filmmakers'
+        finally:
+            os.chdir(cwd)
+
+
+def test_this_runs_files_are_not_imported_as_history():
+    """The first dedup runs after the scrapers wrote this run's files; those addresses are still new"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            os.makedirs('archived_scrapes')
+            with open(os.path.join('archived_scrapes', 'emails_20250101_000000.txt'), 'w') as f:
+                f.write("old@x.de\n")
+            with open('emails_20261018_090000.txt', 'w') as f:
+                f.write("new1@x.de\nold@x.de\n")
+
+            assert filter_new_emails(['new1@x.de', 'old@x.de']) == ['new1@x.de']
+        finally:
+            os.chdir(cwd)
+
+
+def test_repeated_emails_are_counted_normalized(caplog):
+    """Scraped addresses with stray whitespace or capitals still count as repeats, not as new"""
+    caplog.set_level('INFO', logger='crew_scraper.utils')
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            assert filter_new_emails(['old@x.de']) == ['old@x.de']
+            assert filter_new_emails([' OLD@x.de\n', 'new@x.de ', 'New@x.de']) == ['new@x.de']
+        finally:
+            os.chdir(cwd)
+    assert filter_new_emails([' Old@x.de', 'new@x.de'], previous_emails={'old@x.de '}) == ['new@x.de']
+    results = [record.fields for record in caplog.records if 'repeated' in getattr(record, 'fields', {})]
+    assert [(fields['new_emails'], fields['repeated']) for fields in results] == [(1, 0), (1, 1), (1, 1)]
+
+
+if __name__ == '__main__':
+    test_dedup_covers_full_history()
+    test_one_time_archive_import()
+    test_this_runs_files_are_not_imported_as_history()
+    print("🎉 Contact store tests PASSED!")
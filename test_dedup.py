@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared dedup state
+"""
+
+import json
+from dedup import DedupState, agency_email
+
+
+def test_keeps_first_seen_in_order():
+    emails = DedupState(['b@x.de', 'a@x.de'])
+    assert emails.add_all(['a@x.de', 'c@x.de', 'b@x.de', 'c@x.de']) == ['c@x.de']
+    assert emails.items() == ['b@x.de', 'a@x.de', 'c@x.de']
+    assert 'a@x.de' in emails and len(emails) == 3
+
+
+def test_keyed_records_and_snapshot_round_trip():
+    agencies = DedupState(key=agency_email)
+    agencies.add_all([
+        {'name': 'A', 'email': 'info@a.de'},
+        {'name': 'No email', 'email': ''},  # no key: never kept
+        {'name': 'A again', 'email': 'info@a.de'},
+        {'name': 'B', 'email': 'b@b.de'},
+    ])
+    assert [agency['name'] for agency in agencies] == ['A', 'B']
+
+    restored = DedupState.restore(json.loads(json.dumps(agencies.snapshot())), key=agency_email)
+    assert not restored.add({'name': 'B again', 'email': 'b@b.de'})
+    assert restored.items() == agencies.items()
+
+
+if __name__ == '__main__':
+    test_keeps_first_seen_in_order()
+    test_keyed_records_and_snapshot_round_trip()
+    print("🎉 Dedup tests PASSED!")
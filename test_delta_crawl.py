@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental (delta) crawling
+"""
+
+import os
+import re
+import tempfile
+from config import TARGET_CATEGORIES
+from contact_store import ContactStore
+from delta_crawl import DeltaCrawl, job_fingerprint
+from page_parser import parse_crew_jobs
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'crew_united', 'jobs_page1.html')
+
+PAGES = [
+    [{'email': f'job{page}{i}@prod.de', 'title': f'Role {page}{i}', 'raw_text': f'Actor wanted {page}{i}'}
+     for i in range(3)]
+    for page in range(5)
+]
+
+
+def crawl(store, pages, **kwargs):
+    """Walk `pages` the way paginate_and_scrape does; return how many were visited"""
+    delta = DeltaCrawl('crew_united', store=store, **kwargs)
+    visited = 0
+    stopped_early = False
+    for page_jobs in pages:
+        visited += 1
+        if delta.should_stop([job_fingerprint(job) for job in page_jobs]):
+            stopped_early = True
+            break
+    delta.finish(completed=not stopped_early)
+    return visited
+
+
+def test_routine_run_stops_at_first_known_page():
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    page = parse_crew_jobs(html, TARGET_CATEGORIES)
+    # The same postings a day later: ages moved on and the NEW badges are gone
+    aged = re.sub(r'\d+ (hours|days?) old', '3 days old', html.replace('<div class="cu-job-badge">NEW</div>', ''))
+    assert aged != html
+    with tempfile.TemporaryDirectory() as tmp:
+        with ContactStore(os.path.join(tmp, 'contacts.db')) as store:
+            assert crawl(store, [page] + PAGES) == 6  # first run is a full crawl
+            assert crawl(store, [parse_crew_jobs(aged, TARGET_CATEGORIES)] + PAGES) == 1
+
+            # A new posting pushed onto page 1 means page 2 is read too
+            new_jobs = [{'email': 'new@prod.de', 'title': 'Lead', 'raw_text': 'New lead role\n2 hours old'}]
+            assert crawl(store, [new_jobs + page[:-1], page[-1:] + PAGES[0]] + PAGES[1:]) == 2
+
+
+def test_forced_full_refresh():
+    with tempfile.TemporaryDirectory() as tmp:
+        with ContactStore(os.path.join(tmp, 'contacts.db')) as store:
+            crawl(store, PAGES)
+            assert crawl(store, PAGES, refresh_days=0) == 5
+            assert crawl(store, PAGES, incremental=False) == 5
+            # A complete crawl older than FULL_REFRESH_DAYS forces the next one
+            store.set_meta('full_crawl:crew_united', '2000-01-01T00:00:00')
+            assert crawl(store, PAGES) == 5
+
+
+if __name__ == '__main__':
+    test_routine_run_stops_at_first_known_page()
+    test_forced_full_refresh()
+    print("🎉 Delta crawl tests PASSED!")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for chromedriver resolution and its cache, attach mode and the driver pool
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import webdriver_manager.chrome
+from selenium.common.exceptions import SessionNotCreatedException
+import driver_manager
+
+
+class FakeChrome:
+    """webdriver.Chrome stand-in that only accepts the driver matching the installed browser"""
+
+    def __init__(self, service, options):
+        if service.path != '/drivers/chromedriver-131':
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 130")
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+
+class RecordingChrome:
+    """webdriver.Chrome/Remote stand-in that keeps the options and CDP commands it was given"""
+
+    def __init__(self, options, service=None, command_executor=None):
+        self.options = options
+        self.command_executor = command_executor
+        self.cdp = []
+        self.quit_calls = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeDriverManager:
+    def install(self):
+        return '/drivers/chromedriver-131'
+
+
+def test_stale_cached_driver_is_resolved_again(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, 'chromedriver_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump({'path': '/bin/sh', 'resolved_at': time.time()}, f)  # fresh, executable, outdated
+        monkeypatch.setattr(driver_manager, 'DRIVER_CACHE_FILE', cache_file)
+        monkeypatch.setattr(driver_manager.webdriver, 'Chrome', FakeChrome)
+        monkeypatch.setattr(webdriver_manager.chrome, 'ChromeDriverManager', FakeDriverManager)
+
+        assert isinstance(driver_manager.create_chrome_driver(), FakeChrome)
+        with open(cache_file) as f:
+            assert json.load(f)['path'] == '/drivers/chromedriver-131'
+
+
+def test_pool_holds_one_driver_when_attaching(monkeypatch):
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', '127.0.0.1:9222')
+    assert driver_manager.DriverPool(size=2).size == 1
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', None)
+    assert driver_manager.DriverPool(size=2).size == 2
+
+
+def test_attach_mode_skips_launch_switches(monkeypatch):
+    monkeypatch.setattr(driver_manager.webdriver, 'Chrome', RecordingChrome)
+    monkeypatch.setattr(driver_manager, 'CHROMEDRIVER_PATH', '/drivers/chromedriver')
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', '127.0.0.1:9222')
+    driver = driver_manager.create_chrome_driver(profile='normal', headless=True)
+    assert driver.options.experimental_options == {'debuggerAddress': '127.0.0.1:9222'}
+    assert driver.options.arguments == []  # an already running browser ignores them
+    assert driver_manager.startup_timings[-1]['mode'] == 'attach'
+    driver_manager.close_driver(driver)
+    assert driver.quit_calls == 1  # ends the session; the browser keeps running
+
+    # An already running chromedriver is driven remotely, with no binary to resolve
+    monkeypatch.setattr(driver_manager.webdriver, 'Remote', RecordingChrome)
+    monkeypatch.setattr(driver_manager, 'CHROMEDRIVER_URL', 'http://127.0.0.1:9515')
+    monkeypatch.setattr(driver_manager, 'resolve_chromedriver_path', None)
+    driver = driver_manager.create_chrome_driver(profile='normal')
+    assert driver.command_executor == 'http://127.0.0.1:9515'
+    assert driver_manager.startup_timings[-1]['mode'] == 'attach+remote-chromedriver'
+
+    monkeypatch.setattr(driver_manager, 'CHROMEDRIVER_URL', None)
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', None)
+    monkeypatch.setattr(driver_manager, 'resolve_chromedriver_path', lambda refresh=False: '/drivers/chromedriver')
+    driver = driver_manager.create_chrome_driver(profile='normal', headless=True)
+    assert 'debuggerAddress' not in driver.options.experimental_options and '--headless' in driver.options.arguments
+    assert driver_manager.startup_timings[-1]['mode'] == 'launch'
+
+
+def test_pool_reuses_drivers_and_blocks_when_all_are_out(monkeypatch):
+    created = []
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', None)
+    monkeypatch.setattr(driver_manager, 'create_chrome_driver', lambda: created.append(RecordingChrome(None)) or created[-1])
+    pool = driver_manager.DriverPool(size=2)
+    first, second = pool.acquire(), pool.acquire()
+    assert len(created) == 2
+
+    third = []
+    waiter = threading.Thread(target=lambda: third.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.2)
+    assert not third  # both drivers are out
+    pool.release(first)
+    waiter.join(5)
+    assert third == [first] and len(created) == 2  # handed on, not started again
+
+    pool.close_all()
+    assert first.quit_calls == second.quit_calls == 1
+
+
+def test_pool_frees_the_slot_when_chrome_fails_to_start(monkeypatch):
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', None)
+
+    def failing():
+        raise SessionNotCreatedException("Chrome failed to start")
+
+    monkeypatch.setattr(driver_manager, 'create_chrome_driver', failing)
+    pool = driver_manager.DriverPool(size=1)
+    for _ in range(2):  # would block on the second try if the slot leaked
+        try:
+            pool.acquire()
+        except SessionNotCreatedException:
+            pass
+        else:
+            raise AssertionError("expected the start failure to propagate")
+
+
+def test_lite_profile_blocks_resources_and_loads_eagerly(monkeypatch):
+    monkeypatch.setattr(driver_manager.webdriver, 'Chrome', RecordingChrome)
+    monkeypatch.setattr(driver_manager, 'CHROMEDRIVER_PATH', '/drivers/chromedriver')
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', None)
+    monkeypatch.setattr(driver_manager, 'CHROMEDRIVER_URL', None)
+
+    lite = driver_manager.create_chrome_driver(profile='lite')
+    assert lite.cdp == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': driver_manager.BLOCKED_URL_PATTERNS})]
+    assert {'*.png', '*.woff2', '*google-analytics.com*'} <= set(driver_manager.BLOCKED_URL_PATTERNS)
+    assert set(driver_manager.LITE_CHROME_ARGS) <= set(lite.options.arguments)
+    assert lite.options.page_load_strategy == 'eager'
+    assert driver_manager.startup_timings[-1]['profile'] == 'lite'
+
+    normal = driver_manager.create_chrome_driver(profile='normal')
+    assert normal.cdp == []
+    assert not set(driver_manager.LITE_CHROME_ARGS) & set(normal.options.arguments)
+    assert normal.options.page_load_strategy == 'normal'
+
+    # Attached browsers can't take launch switches, but still block resources and load eagerly
+    monkeypatch.setattr(driver_manager, 'CHROME_DEBUGGER_ADDRESS', '127.0.0.1:9222')
+    attached = driver_manager.create_chrome_driver(profile='lite')
+    assert attached.options.arguments == [] and attached.options.page_load_strategy == 'eager'
+    assert ('Network.setBlockedURLs', {'urls': driver_manager.BLOCKED_URL_PATTERNS}) in attached.cdp
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline end-to-end benchmark harness
+"""
+
+from e2e_benchmark import run_benchmark, report
+
+
+def test_http_crawl_of_recorded_pages():
+    record = run_benchmark(pages=3, backends=('http',))
+    run = record['runs']['filmmakers[http]']
+    assert run['pages'] == 3
+    # 3 agencies with an email per page, distinct on every page, plus the agency whose email is
+    # only on its profile (listed on pages 1 and 3; the second time it comes from the cache)
+    assert run['records'] == 10 and run['profiles'] == 1
+    report(record, previous={'commit': 'abc1234', 'runs': {'filmmakers[http]': dict(run, pages_per_sec=1.0)}})
+
+
+if __name__ == '__main__':
+    test_http_crawl_of_recorded_pages()
+    print("🎉 E2E benchmark tests PASSED!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for SMTP connection reuse in the email sender
+Runs against the local stand-in server in smtp_standin.py
+"""
+
+import os
+import tempfile
+import time
+import pytest
+
+pytest.importorskip("dotenv")
+
+from email_sender import EmailSender
+from smtp_standin import SMTPStandIn
+from rate_limiter import TokenBucket
+
+
+def _sender(server):
+    sender = EmailSender('127.0.0.1', server.port, use_tls=False)
+    sender.sender_email, sender.password = 'test@localhost', 'secret'
+    return sender
+
+
+def test_reuses_one_connection():
+    with SMTPStandIn() as server:
+        sender = _sender(server)
+        for i in range(5):
+            sender._send_email(to_email=f"agency{i}@example.com")
+        sender.close()
+        assert server.messages == 5
+        assert server.connections == 1
+
+
+def test_reconnects_when_server_hits_its_limit():
+    with SMTPStandIn(max_messages_per_connection=2) as server:
+        sender = _sender(server)
+        for i in range(5):
+            sender._send_email(to_email=f"agency{i}@example.com")
+        sender.close()
+        assert server.messages == 5
+        assert server.connections == 3
+
+
+def test_concurrent_send_respects_rate_limit():
+    with tempfile.TemporaryDirectory() as tmp, SMTPStandIn(message_delay=0.05) as server:
+        email_file = os.path.join(tmp, 'emails.txt')
+        with open(email_file, 'w') as f:
+            f.write('\n'.join(f"agency{i}@example.com" for i in range(12)))
+
+        start = time.perf_counter()
+        assert _sender(server).send_emails_from_file(email_file, rate=20, burst=2, concurrency=4)
+        elapsed = time.perf_counter() - start
+
+        assert server.messages == 12
+        assert server.connections <= 4
+        assert elapsed >= (12 - 2) / 20 * 0.9  # burst of 2, then 20/sec
+
+
+def test_token_bucket_burst_then_paced():
+    bucket = TokenBucket(rate=100, burst=3)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.acquire() > 0
+
+
+if __name__ == '__main__':
+    test_reuses_one_connection()
+    test_reconnects_when_server_hits_its_limit()
+    test_concurrent_send_respects_rate_limit()
+    test_token_bucket_burst_then_paced()
+    print("🎉 Email sender tests PASSED!")
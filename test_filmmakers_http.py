@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the browserless filmmakers.eu backend
+Serves the recorded pages in fixtures/filmmakers from a local HTTP server
+"""
+
+import functools
+import os
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from filmmakers_http import FilmmakersHttpSession, NeedsJavaScript
+from agency_enricher import AgencyEnricher, needs_profile
+from http_fetcher import HttpFetcher
+from rate_limiter import PerHostLimiter
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real site
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(subdir):
+    """Start a local server for a fixtures subdirectory; returns (server, base_url)"""
+    handler = functools.partial(QuietHandler, directory=os.path.join(FIXTURES, subdir))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_walks_all_pages_over_one_connection():
+    server, base_url = serve_fixtures('filmmakers')
+    session = FilmmakersHttpSession(base_url + 'page1.html')
+    try:
+        session.open_first_page()
+        pages = []
+        while True:
+            assert session.has_results()
+            pages.append(session.extract_agencies())
+            if not session.next_page():
+                break
+
+        assert [len(agencies) for agencies in pages] == [4, 3]
+        first = pages[0][0]
+        assert first['name'] == 'Agentur Lichtblick'
+        assert first['email'] == 'info@agentur-lichtblick.de'
+        assert first['phone'] == '+49 30 403 01850'
+        assert first['country'] == 'Germany'
+        assert first['website'] == base_url + 'agents/lichtblick'
+        assert first['regions'] == 'Regions: D/A/CH'
+        # Agency without a listed email is still parsed; the scraper decides whether to keep it
+        assert pages[0][3]['name'] == 'Stimmwerk Voices' and pages[0][3]['email'] == ''
+
+        page_text, mailto_hrefs = session.extract_emails()
+        assert 'mailto:booking@nordicfaces.dk' in mailto_hrefs
+        assert session.fetcher.stats['connections_opened'] == 1
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def test_javascript_only_page_requests_fallback():
+    server, base_url = serve_fixtures('filmmakers')
+    session = FilmmakersHttpSession(base_url + 'js_shell.html')
+    try:
+        session.open_first_page()
+        assert False, "expected NeedsJavaScript"
+    except NeedsJavaScript:
+        pass
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def test_profile_pages_fill_agencies_without_email():
+    server, base_url = serve_fixtures('filmmakers')
+    session = FilmmakersHttpSession(base_url + 'page1.html')
+    enricher = AgencyEnricher(workers=2, fetcher=HttpFetcher(throttle=PerHostLimiter(rate=100).acquire))
+    try:
+        session.open_first_page()
+        agencies = session.extract_agencies()
+        # Every card links its profile; only the one without an email is worth fetching
+        assert [agency['name'] for agency in agencies if needs_profile(agency)] == ['Stimmwerk Voices']
+        voices = agencies[3]
+        gone = dict(voices, name='Gone', website=base_url + 'agents/gone')
+        # A card that has an email but no phone is completed too, its own email kept
+        partial = dict(voices, email='office@stimmwerk-voices.at', phone='')
+        complete = dict(voices, email='x@y.at')  # nothing missing but its own website: never fetched
+        pending = enricher.submit([voices, gone, partial, complete])
+        assert len(pending) == 3
+        assert enricher.collect(pending) == 1
+        assert partial['email'] == 'office@stimmwerk-voices.at' and partial['phone'] == '+43 1 523 88 90'
+        assert partial['website'] == 'https://www.stimmwerk-voices.at'
+        # The site's own support address in the header is not taken for the agency's
+        assert voices['email'] == 'booking@stimmwerk-voices.at'
+        assert voices['website'] == 'https://www.stimmwerk-voices.at'
+        assert voices['phone'] == '+43 1 523 88 90' and voices['country'] == 'Austria'
+        assert gone['email'] == '' and gone['website'].endswith('/agents/gone')  # 404 leaves it as it was
+    finally:
+        enricher.close()
+        session.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    test_walks_all_pages_over_one_connection()
+    test_javascript_only_page_requests_fallback()
+    test_profile_pages_fill_agencies_without_email()
+    print("🎉 Filmmakers HTTP backend tests PASSED!")
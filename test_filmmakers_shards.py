@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the country-sharded filmmakers.eu crawl
+"""
+
+import functools
+import glob
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from filmmakers_scraper import FilmmakersScraper
+from filmmakers_shards import merge_shard_results, scrape_sharded
+from test_filmmakers_http import FIXTURES, QuietHandler, serve_fixtures
+
+
+def test_merge_dedups_across_shards_in_shard_order():
+    de = ([{'name': 'A', 'email': 'info@a.de'}, {'name': 'B', 'email': 'b@b.de'}], ['info@a.de', 'b@b.de'])
+    at = ([{'name': 'A (Wien)', 'email': 'INFO@a.de'}, {'name': 'C', 'email': 'c@c.at'}], ['INFO@a.de', 'c@c.at'])
+    agencies, emails = merge_shard_results([de, at], extract_full_data=True)
+    assert [agency['name'] for agency in agencies] == ['A', 'B', 'C']
+    assert emails == ['info@a.de', 'b@b.de', 'c@c.at']
+    assert merge_shard_results([['x@y.de'], ['X@y.de', 'z@y.de']], extract_full_data=False) == ['x@y.de', 'z@y.de']
+
+
+def test_shard_crawls_its_filtered_listing_without_saving():
+    server, base_url = serve_fixtures('filmmakers')
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        scraper = FilmmakersScraper(None, backend='http', shard=('de', 'country=de'))
+        scraper.base_url = scraper.base_url.replace('https://www.filmmakers.eu/talent_agency_search/new',
+                                                    base_url + 'page1.html')
+        try:
+            assert scraper.navigate_and_setup_filters()
+            agencies, emails = scraper.scrape_all_pages(extract_full_data=True, save_results=False)
+            assert scraper.http.url.endswith('page2.html')
+            assert len(agencies) == 6 and len(emails) == 6  # one email is only on a profile page, one agency is listed twice
+            assert not [name for name in os.listdir('.') if name.endswith('.csv')]
+        finally:
+            scraper.close()
+            os.chdir(cwd)
+            server.shutdown()
+
+
+class CountryFilterHandler(QuietHandler):
+    """Records every request; with `honour_filter`, serves `?country=at` as the recorded page 2"""
+
+    requests = []
+    honour_filter = True
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.honour_filter and self.path.endswith('country=at'):
+            self.path = '/page2.html'
+        super().do_GET()
+
+
+def serve_with_filter(honour_filter):
+    CountryFilterHandler.requests = []
+    CountryFilterHandler.honour_filter = honour_filter
+    handler = functools.partial(CountryFilterHandler, directory=os.path.join(FIXTURES, 'filmmakers'))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_falls_back_to_one_crawl_when_the_site_ignores_the_filter():
+    shards = [('de', 'country=de'), ('at', 'country=at')]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            # Like the recorded pages, the search ignores the filter: every shard would get the full listing
+            server, base_url = serve_with_filter(honour_filter=False)
+            try:
+                agencies, emails = scrape_sharded(True, shards, workers=2, base_url=base_url + 'page1.html')
+            finally:
+                server.shutdown()
+            assert len(agencies) == 6 and len(emails) == 6
+            assert [path for path in CountryFilterHandler.requests if '?' in path] == \
+                ['/page1.html?country=de', '/page1.html?country=at']  # the probes only
+            assert len(glob.glob('filmmakers_agencies_*.csv')) == 1  # saved by the unsharded crawl
+
+            # A filter that changes the listing is sharded as usual
+            server, base_url = serve_with_filter(honour_filter=True)
+            try:
+                agencies, emails = scrape_sharded(True, shards, workers=2, base_url=base_url + 'page1.html')
+            finally:
+                server.shutdown()
+            assert len(agencies) == 6 and len(emails) == 6  # Austria's page is a subset, deduplicated
+            assert CountryFilterHandler.requests.count('/page1.html?country=at') == 2  # probed, then crawled
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    test_merge_dedups_across_shards_in_shard_order()
+    test_shard_crawls_its_filtered_listing_without_saving()
+    test_falls_back_to_one_crawl_when_the_site_ignores_the_filter()
+    print("🎉 Sharded crawl tests PASSED!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk HTTP response cache under HttpFetcher
+"""
+
+import functools
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http_cache import HttpCache
+from http_fetcher import HttpFetcher
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """/agents/<name> pages with an ETag; counts full bodies sent and 304s"""
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, served, **kwargs):
+        self.served = served
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        etag = f'"{self.path}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.served['304'] = self.served.get('304', 0) + 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.served['200'] = self.served.get('200', 0) + 1
+        body = f'<html><body>{self.path} {"x" * 1000}</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(served):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(EtagHandler, served=served))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_fresh_hits_then_conditional_revalidation():
+    served = {}
+    server, base_url = serve(served)
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = HttpFetcher(cache=HttpCache(os.path.join(tmp, 'cache.db'), ttl=3600))
+        try:
+            first = fetcher.get(base_url + 'agents/a')
+            again = fetcher.get(base_url + 'agents/a')
+            assert again.text == first.text and served == {'200': 1}
+
+            revalidated = fetcher.get(base_url + 'agents/a', max_age=0)
+            assert revalidated.status == 200 and revalidated.text == first.text
+            assert served == {'200': 1, '304': 1}
+            assert fetcher.cache.stats['hits'] == 1 and fetcher.cache.stats['revalidated'] == 1
+            assert fetcher.cache.stats['misses'] == 1 and fetcher.cache.hit_ratio() == 2 / 3
+        finally:
+            fetcher.close()
+            server.shutdown()
+
+
+def test_lru_eviction_keeps_size_bound():
+    served = {}
+    server, base_url = serve(served)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(os.path.join(tmp, 'cache.db'), max_bytes=2500)
+        fetcher = HttpFetcher(cache=cache)
+        try:
+            for name in ('a', 'b', 'a', 'c'):  # 'a' is used again, so 'b' is least recently used
+                fetcher.get(base_url + 'agents/' + name)
+            assert cache.lookup(base_url + 'agents/b') is None
+            assert cache.lookup(base_url + 'agents/a') and cache.lookup(base_url + 'agents/c')
+            assert cache.stats['evictions'] == 1
+        finally:
+            fetcher.close()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    test_fresh_hits_then_conditional_revalidation()
+    test_lru_eviction_keeps_size_bound()
+    print("🎉 HTTP cache tests PASSED!")
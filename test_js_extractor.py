@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the one-shot in-browser extraction scripts
+The scripts run in Node against a small DOM built from the recorded pages in fixtures/,
+and must return the same records as the snapshot parser
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from config import TARGET_CATEGORIES
+from js_extractor import extract_crew_jobs_js, extract_agencies_js, extract_page_emails_js
+from page_parser import parse_html, parse_crew_jobs, parse_filmmakers_agencies, extract_page_emails
+from test_page_parser import EDGE_CASES_PAGE
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Just enough DOM for the extraction scripts: childNodes/sibling links, textContent, getAttribute,
+# a.href, and querySelectorAll for compound selectors (tag, .class, [attr=|*=|^=value]) joined by '>'
+DOM_SHIM = r"""
+function Element(tag, attrs, parent) {
+    this.nodeType = 1; this.tagName = tag.toUpperCase(); this.attrs = attrs; this.parentElement = parent;
+}
+function build(spec, parent, base) {
+    if (typeof spec === 'string') return {nodeType: 3, nodeValue: spec, parentElement: parent};
+    var el = new Element(spec[0], spec[1], parent);
+    el.childNodes = spec[2].map(function (child) { return build(child, el, base); });
+    el.childNodes.forEach(function (child, i) { child.nextSibling = el.childNodes[i + 1] || null; });
+    el.firstChild = el.childNodes[0] || null;
+    if (el.tagName === 'A' && el.getAttribute('href') !== null) el.href = new URL(el.getAttribute('href'), base).href;
+    return el;
+}
+Element.prototype.getAttribute = function (name) { return name in this.attrs ? this.attrs[name] : null; };
+Object.defineProperty(Element.prototype, 'textContent', {get: function () {
+    return this.childNodes.map(function (c) { return c.nodeType === 3 ? c.nodeValue : c.textContent; }).join('');
+}});
+function matches(el, compound) {
+    var m = /^([a-z0-9]*)((?:\.[\w-]+)*)((?:\[[^\]]+\])*)$/.exec(compound);
+    if (m[1] && el.tagName.toLowerCase() !== m[1]) return false;
+    var classes = (el.getAttribute('class') || '').split(/\s+/);
+    if (!m[2].split('.').slice(1).every(function (c) { return classes.indexOf(c) !== -1; })) return false;
+    var attr = /\[([\w-]+)([*^]?=)'([^']*)'\]/g, a;
+    while ((a = attr.exec(m[3]))) {
+        var value = el.getAttribute(a[1]);
+        if (value === null) return false;
+        if (a[2] === '*=' ? value.indexOf(a[3]) === -1 : a[2] === '^=' ? value.indexOf(a[3]) !== 0 : value !== a[3]) return false;
+    }
+    return true;
+}
+Element.prototype.querySelectorAll = function (selector) {
+    var parts = selector.split('>').map(function (part) { return part.trim(); }), found = [];
+    (function walk(node) {
+        node.childNodes.forEach(function (child) {
+            if (child.nodeType !== 1) return;
+            var el = child, ok = true;
+            for (var i = parts.length - 1; i >= 0 && ok; i--, el = el && el.parentElement) ok = !!el && matches(el, parts[i]);
+            if (ok) found.push(child);
+            walk(child);
+        });
+    })(this);
+    return found;
+};
+Element.prototype.querySelector = function (selector) { return this.querySelectorAll(selector)[0] || null; };
+"""
+
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _spec(node):
+    """page_parser tree as nested [tag, attrs, children] lists for DOM_SHIM"""
+    return node if isinstance(node, str) else [node.tag, node.attrs, [_spec(child) for child in node.children]]
+
+
+class NodeDriver:
+    """execute_script runs the script in Node against the page, like a browser would"""
+
+    def __init__(self, html, url):
+        self.tree = _spec(parse_html(html))
+        self.url = url
+
+    def execute_script(self, script, *args):
+        program = (DOM_SHIM
+                   + f"var document = build({json.dumps(self.tree)}, null, {json.dumps(self.url)});\n"
+                   + "document.body = document.querySelector('body');\n"
+                   + f"process.stdout.write(String((function () {{\n{script}\n}}).apply(null, {json.dumps(list(args))})));\n")
+        return subprocess.run(['node'], input=program, capture_output=True, text=True, check=True).stdout
+
+
+class CannedDriver:
+    """execute_script returns a fixed result and records the arguments it was called with"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def test_script_results_map_to_records():
+    driver = CannedDriver(json.dumps([
+        ["No budget (actors*actresses and speakers)\nLead role\nDetails: write to casting@film.de", None],
+        ["Low budget (actors*actresses and speakers)\nExtra", "extra@film.de"],
+        ["", None],
+    ]))
+    jobs = extract_crew_jobs_js(driver, ['No Budget (Actors*Actresses and Speakers)'])
+    assert driver.calls == [(['no budget (actors*actresses and speakers)'],)]
+    assert [job['email'] for job in jobs] == ['casting@film.de', 'extra@film.de', None]  # text regex as fallback
+    assert jobs[0]['title'] == 'Lead role' and jobs[2]['title'] is None
+
+    driver = CannedDriver(json.dumps([["Nordic Faces", "https://x/agents/nordic-faces",
+                                       "Nordic Faces\nbooking@nordicfaces.dk\n+45 33 21 40 50"]]))
+    agency = extract_agencies_js(driver)[0]
+    assert agency['email'] == 'booking@nordicfaces.dk' and agency['phone'] == '+45 33 21 40 50'
+    assert agency['website'] == 'https://x/agents/nordic-faces'
+
+    assert extract_page_emails_js(CannedDriver('["Body text", ["mailto:a@b.de"]]')) == ("Body text", ["mailto:a@b.de"])
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs Node to run the extraction scripts")
+def test_scripts_match_snapshot_parser_on_recorded_pages():
+    for html, count in ((read_fixture('crew_united', 'jobs_page1.html'), 4), (EDGE_CASES_PAGE, 1)):
+        js_jobs = extract_crew_jobs_js(NodeDriver(html, 'https://www.crew-united.com/en/jobs/'), TARGET_CATEGORIES)
+        assert len(js_jobs) == count
+        assert [job.to_dict() for job in js_jobs] == [job.to_dict() for job in parse_crew_jobs(html, TARGET_CATEGORIES)]
+
+    url = 'https://www.filmmakers.eu/talent_agency_search/new'
+    for page in ('page1.html', 'page2.html'):
+        html = read_fixture('filmmakers', page)
+        js_agencies = extract_agencies_js(NodeDriver(html, url))
+        assert [agency.to_dict() for agency in js_agencies] == \
+            [agency.to_dict() for agency in parse_filmmakers_agencies(parse_html(html), url)]
+        assert js_agencies and all(agency['website'].startswith(url.split('/talent')[0]) for agency in js_agencies)
+        assert extract_page_emails_js(NodeDriver(html, url)) == tuple(extract_page_emails(parse_html(html)))
+
+
+if __name__ == '__main__':
+    test_script_results_map_to_records()
+    if shutil.which('node'):
+        test_scripts_match_snapshot_parser_on_recorded_pages()
+    print("🎉 JS extractor tests PASSED!")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for leveled structured logging
+"""
+
+import contextlib
+import io
+import json
+import log
+
+
+class _Explodes:
+    def __str__(self):
+        raise AssertionError("formatted although debug is off")
+
+
+def _capture(**options):
+    log.configure(**options)
+    out = io.StringIO()
+    return out, contextlib.redirect_stdout(out)
+
+
+def test_json_lines_carry_fields_and_debug_is_lazy():
+    out, redirect = _capture(level='INFO', module_levels={}, fmt='json', repeat_limit=20)
+    logger = log.get_logger('unit')
+    try:
+        with redirect:
+            logger.debug("Found %s", _Explodes())
+            logger.info("🏢 Page %d done", 3, page=3, agencies=12)
+    finally:
+        log.configure()
+    entry = json.loads(out.getvalue())
+    assert entry['level'] == 'info' and entry['module'] == 'unit'
+    assert entry['msg'] == '🏢 Page 3 done' and entry['page'] == 3 and entry['agencies'] == 12
+
+
+def test_module_levels_and_repeat_limit():
+    out, redirect = _capture(level='INFO', module_levels={'noisy': 'DEBUG'}, fmt='text', repeat_limit=2)
+    noisy, quiet = log.get_logger('noisy'), log.get_logger('quiet')
+    try:
+        with redirect:
+            for i in range(5):
+                noisy.debug("hit %d", i)
+                quiet.debug("hidden %d", i)
+            noisy.info("summary")
+    finally:
+        log.configure(module_levels={'noisy': 'NOTSET'})
+    assert out.getvalue().splitlines() == [
+        'hit 0', 'hit 1', 'hit 2 (further messages like this suppressed)', 'summary']
+
+
+if __name__ == '__main__':
+    test_json_lines_carry_fields_and_debug_is_lazy()
+    test_module_levels_and_repeat_limit()
+    print("🎉 Logging tests PASSED!")
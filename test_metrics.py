@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for run metrics (spans, counters, JSON and Prometheus output)
+"""
+
+import json
+import os
+import tempfile
+from metrics import RunMetrics
+
+
+def test_spans_counters_and_outputs():
+    run = RunMetrics()
+    for _ in range(2):
+        with run.span('crew.extract'):
+            pass
+    try:
+        with run.span('smtp.send'):
+            raise ConnectionError('dropped')
+    except ConnectionError:
+        pass
+    run.count('pages', 3, site='filmmakers')
+
+    summary = run.summary('unified')
+    assert summary['phases']['crew.extract']['count'] == 2
+    assert summary['counters']['errors'] == {'phase=smtp.send': 1}
+    assert summary['counters']['pages'] == {'site=filmmakers': 3}
+
+    prom = run.prometheus('unified')
+    assert 'crew_scraper_phase_seconds_count{run="unified",phase="crew.extract"} 2' in prom
+    assert 'crew_scraper_pages_total{run="unified",site="filmmakers"} 3' in prom
+    assert 'crew_scraper_errors_total{run="unified",phase="smtp.send"} 1' in prom
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = run.emit('unified', tmp)
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f)['run'] == 'unified'
+        assert sorted(os.listdir(tmp)) == ['unified.json', 'unified.prom']
+
+
+if __name__ == '__main__':
+    test_spans_counters_and_outputs()
+    print("🎉 Metrics tests PASSED!")
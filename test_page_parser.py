@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for snapshot-based page parsing
+Runs against the recorded pages in fixtures/ - no browser needed
+"""
+
+import os
+import re
+from selenium.common.exceptions import NoSuchElementException
+from config import TARGET_CATEGORIES
+from job_scraper import CrewUnitedJobScraper
+from page_parser import parse_html, parse_crew_jobs, email_from_onclick, extract_title, parse_agency_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_crew_jobs_from_snapshot():
+    """Target jobs are filtered by category and match the Selenium job dicts"""
+    jobs = parse_crew_jobs(read_fixture('crew_united', 'jobs_page1.html'), TARGET_CATEGORIES)
+
+    assert [job['title'] for job in jobs] == [
+        'Schauspieler für Dramedy Spot', 'on account', 'Co-Hauptrolle Elias', 'Stand Ins gesucht'
+    ]
+    # putTogether obfuscation, mailto link, text regex, no email at all
+    assert [job['email'] for job in jobs] == [
+        'pictureplay@mail.com', 'casting@oneday-film.de', 'carla.hahn@ymail.com', None
+    ]
+    assert all(job['is_target_category'] for job in jobs)
+    assert set(jobs[0]) == {'title', 'email', 'raw_text', 'is_target_category'}
+    assert jobs[0]['raw_text'].startswith('No budget (actors*actresses and speakers)\nNEW\n')
+    assert '\n\nDetails: 1 Drehtag' in jobs[0]['raw_text']
+
+
+def test_rendered_text_skips_hidden_content():
+    root = parse_html("<div><script>var x = 1;</script><p>One<br>Two</p><p>Three &amp; four</p></div>")
+    assert root.text == 'One\nTwo\n\nThree & four'
+
+
+# One job under two target categories, and a breadcrumb whose only match is in text that isn't rendered
+EDGE_CASES_PAGE = """<html><body><ul class="cu-jobs-list">
+<li><span class="cu-ui-common-breadcrumb-part">No budget (actors*actresses and speakers)</span>
+<span class="cu-ui-common-breadcrumb-part">Low budget (actors*actresses and speakers)</span>
+<h3>Listed twice</h3><a href="mailto:twice@film.de">Send e-mail</a></li>
+<li><span class="cu-ui-common-breadcrumb-part">Camera<template>No budget (actors*actresses and speakers)</template></span>
+<h3>Camera assistant</h3><p>crew@film.de</p></li>
+</ul></body></html>"""
+
+
+class NodeElement:
+    """WebElement stand-in over a parsed node, so the element walk runs without a browser"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def __eq__(self, other):
+        return isinstance(other, NodeElement) and other.node is self.node
+
+    @property
+    def text(self):
+        return self.node.text
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def find_element(self, by, xpath):
+        # ./ancestor::li resolves to the outermost <li>, the first in document order
+        items = [ancestor for ancestor in self.node.ancestors() if ancestor.tag == 'li']
+        if not items:
+            raise NoSuchElementException(xpath)
+        return NodeElement(items[-1])
+
+    def find_elements(self, by, selector):
+        tag, attr, needle = re.fullmatch(r"(\w+)\[(\w+)\*='([^']+)'\]", selector).groups()
+        return [NodeElement(node) for node in self.node.iter(tag) if needle in node.get(attr, '')]
+
+
+class NodeDriver:
+    def __init__(self, html):
+        self.root = parse_html(html)
+
+    def find_elements(self, by, selector):
+        tag, class_name = selector.split('.')
+        return [NodeElement(node) for node in self.root.iter(tag) if node.has_class(class_name)]
+
+
+def test_snapshot_and_element_walk_give_the_same_jobs():
+    for html in (read_fixture('crew_united', 'jobs_page1.html'), EDGE_CASES_PAGE):
+        walked, _ = CrewUnitedJobScraper(NodeDriver(html), extraction_mode='selenium').extract_jobs_on_page()
+        parsed = parse_crew_jobs(html, TARGET_CATEGORIES)
+        assert [job.to_dict() for job in walked] == [job.to_dict() for job in parsed]
+    assert [job['title'] for job in parsed] == ['Listed twice']
+
+
+def test_helpers():
+    assert email_from_onclick("putTogether('a$_isdot_$b$_isat_$c$_isdot_$de'); return false;") == 'a.b@c.de'
+    assert email_from_onclick("doSomethingElse()") is None
+    assert extract_title("NEW\nLow budget\nLead role\nBerlin") == 'Lead role'
+
+
+def test_agency_fields_in_one_scan():
+    text = ("Agentur Nord\nHauptstr. 1, 10115 Berlin, Deutschland\nRegions: D/A/CH\n"
+            "Künstlermanagement, Casting\nYoung Talent agency\ninfo@nord.de")
+    agency = parse_agency_text('Agentur Nord', '', text)
+    assert agency['country'] == 'Germany'
+    assert agency['address'] == 'Hauptstr. 1, 10115 Berlin, Deutschland'
+    assert agency['regions'] == 'Regions: D/A/CH'
+    # Overlapping keywords all count, per line and in keyword order, like the old substring checks
+    assert agency['specialties'] == 'Artist management, Casting, Management, Young talent, Talent agency'
+
+    # Within a line the first country in list order wins; a later line overrides
+    agency = parse_agency_text('X', '', "Paris, France / Germany office\nUK & Ireland")
+    assert agency['country'] == 'Ireland' and agency['address'] == 'UK & Ireland'
+    assert agency['regions'] == 'UK & Ireland'
+
+
+if __name__ == '__main__':
+    test_crew_jobs_from_snapshot()
+    test_rendered_text_skips_hidden_content()
+    test_snapshot_and_element_walk_give_the_same_jobs()
+    test_helpers()
+    test_agency_fields_in_one_scan()
+    print("🎉 Page parser tests PASSED!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming pipeline
+"""
+
+import os
+import tempfile
+import threading
+import time
+import pipeline
+from send_journal import SendJournal, QUEUED
+
+
+def test_records_flow_before_producer_finishes():
+    first_consumed = threading.Event()
+
+    def producer(emit):
+        emit({'email': 'a@x.de'})
+        # Only finishes once the consumer has seen the first record
+        assert first_consumed.wait(5)
+        emit({'email': 'b@x.de'})
+
+    records = pipeline.merge({'Site': producer})
+    assert next(records) == {'email': 'a@x.de', 'source': 'Site'}
+    first_consumed.set()
+    assert [record['email'] for record in records] == ['b@x.de']
+
+
+def test_bounded_queue_blocks_producer():
+    emitted = []
+
+    def producer(emit):
+        for i in range(50):
+            emit({'email': f'{i}@x.de'})
+            emitted.append(i)
+
+    records = pipeline.merge({'Site': producer}, maxsize=2)
+    next(records)
+    time.sleep(0.2)
+    assert len(emitted) <= 4  # the rest wait until the consumer catches up
+    assert len(list(records)) == 49
+
+
+def test_stages_validate_dedup_write_and_enqueue():
+    def site_a(emit):
+        for email in ['Info@A.de', ' not-an-email ', 'b@b.de ']:
+            emit({'email': email})
+
+    def site_b(emit):
+        emit({'email': 'info@a.de'})
+        raise RuntimeError('boom')  # reported; other sources keep flowing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'combined_emails.txt')
+        with SendJournal.for_file(path) as journal:
+            records = pipeline.merge({'A': site_a, 'B': site_b})
+            records = pipeline.dedup(pipeline.validate(records))
+            records = pipeline.enqueue_for_send(pipeline.write_emails(records, path), journal)
+            counts = pipeline.drain(records)
+            assert sum(counts.values()) == 2
+            assert journal.state('b@b.de') == QUEUED
+
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().split()
+        assert sorted(email.lower() for email in lines) == ['b@b.de', 'info@a.de']
+
+
+if __name__ == '__main__':
+    test_records_flow_before_producer_finishes()
+    test_bounded_queue_blocks_producer()
+    test_stages_validate_dedup_write_and_enqueue()
+    print("🎉 Pipeline tests PASSED!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the --profile run profiler
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+pytest.importorskip("dotenv")
+
+from email_sender import EmailSender
+from profiling import RunProfiler, pop_profile_flag, PER_THREAD_CPROFILE
+from smtp_standin import SMTPStandIn
+
+
+def test_profiles_worker_threads_of_a_send():
+    with tempfile.TemporaryDirectory() as tmp, SMTPStandIn(message_delay=0.02) as server:
+        email_file = os.path.join(tmp, 'emails.txt')
+        with open(email_file, 'w') as f:
+            f.write('\n'.join(f"agency{i}@example.com" for i in range(6)))
+        sender = EmailSender('127.0.0.1', server.port, use_tls=False)
+        sender.sender_email, sender.password = 'test@localhost', 'secret'
+
+        with RunProfiler('send', directory=tmp, interval=0.002) as profiler:
+            assert sender.send_emails_from_file(email_file, rate=float('inf'), concurrency=2)
+
+        with open(profiler.report_path, encoding='utf-8') as f:
+            report = f.read()
+        if PER_THREAD_CPROFILE:
+            smtp_seconds = float(report.split('SMTP')[1].split()[0])
+            assert smtp_seconds > 0.1  # 6 messages at 20 ms each, measured in the worker threads
+        assert 'Top 30 functions by tottime' in report
+        with open(profiler.report_path.replace('.txt', '.collapsed'), encoding='utf-8') as f:
+            assert any('email_sender.py:_deliver' in line for line in f)
+
+
+def _nap(i):
+    time.sleep(0.01)
+    return i
+
+
+def test_thread_pool_runs_to_completion_under_the_profiler():
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunProfiler('pool', directory=tmp, interval=0.002) as profiler:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                assert list(pool.map(_nap, range(12))) == list(range(12))
+        with open(profiler.report_path.replace('.txt', '.collapsed'), encoding='utf-8') as f:
+            assert any('test_profiling.py:_nap' in line for line in f)
+
+
+@pytest.mark.skipif(not PER_THREAD_CPROFILE, reason="worker threads are only cProfiled before Python 3.12")
+def test_threads_hand_in_their_own_stats():
+    release = threading.Event()
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunProfiler('threads', directory=tmp, interval=0.002) as profiler:
+            finished = threading.Thread(target=_nap, args=(1,))
+            finished.start()
+            finished.join()
+            # Still running when the report is written: left alone, not stopped from the main thread
+            running = threading.Thread(target=release.wait, args=(5,))
+            running.start()
+        with open(profiler.report_path, encoding='utf-8') as f:
+            assert ", 2 threads" in f.readline()  # main and the finished thread
+        assert any(name == '_nap' for _, _, name in profiler.stats().stats)
+        release.set()
+        running.join()
+    assert threading.Thread.run.__name__ == 'run' and not hasattr(threading.Thread.run, '__wrapped__')
+
+
+def test_pop_profile_flag():
+    argv = ['email_sender.py', 'send', '--profile', 'emails.txt']
+    assert pop_profile_flag(argv) and argv == ['email_sender.py', 'send', 'emails.txt']
+    assert not pop_profile_flag(argv)
+
+
+if __name__ == '__main__':
+    test_profiles_worker_threads_of_a_send()
+    test_thread_pool_runs_to_completion_under_the_profiler()
+    if PER_THREAD_CPROFILE:
+        test_threads_hand_in_their_own_stats()
+    test_pop_profile_flag()
+    print("🎉 Profiling tests PASSED!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for page-readiness waits, against a fake driver that changes pages over a few polls
+"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+from readiness import ReadinessWaiter, RecordCount, StalenessOf
+from navigator import CrewUnitedNavigator
+
+
+class FakePage:
+    """Old listing for 2 polls, then an empty new document for 2 polls, then the new listing"""
+
+    def __init__(self):
+        self.polls = 0
+
+    @property
+    def phase(self):
+        return 'old' if self.polls < 2 else 'loading' if self.polls < 4 else 'new'
+
+
+class FakeElement:
+    def __init__(self, page):
+        self.page = page
+
+    def is_enabled(self):
+        if self.page.phase != 'old':
+            raise StaleElementReferenceException("detached")
+        return True
+
+
+class FakeDriver:
+    def __init__(self, page):
+        self.page = page
+        self.log_reads = 0
+
+    def execute_script(self, script, *args):
+        self.page.polls += 1
+        return 0 if self.page.phase == 'loading' else 5
+
+    def get_log(self, kind):
+        self.log_reads += 1
+        return []
+
+
+def test_records_are_counted_on_the_new_page():
+    page = FakePage()
+    driver = FakeDriver(page)
+    waiter = ReadinessWaiter(driver, timeout=5, poll_interval=0)
+    assert waiter.wait("Page 2", StalenessOf(FakeElement(page)), RecordCount("li"))
+    assert page.phase == 'new'  # not while the new page was still empty
+
+
+def test_jobs_list_network_idle_ignores_events_from_before_navigation():
+    driver = FakeDriver(FakePage())
+    conditions = CrewUnitedNavigator(driver).jobs_list_conditions()
+    assert driver.log_reads == 1  # performance log drained before the navigation starts
+    assert [condition.name for condition in conditions] == ['records', 'network idle', 'dom quiet']
+
+
+if __name__ == '__main__':
+    test_records_are_counted_on_the_new_page()
+    test_jobs_list_network_idle_ignores_events_from_before_navigation()
+    print("🎉 Readiness tests PASSED!")
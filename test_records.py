@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted job and agency records
+"""
+
+import io
+import json
+from records import AgencyRecord, JobRecord, write_csv, json_default
+
+
+def test_records_read_like_dicts():
+    agency = AgencyRecord(name='A', email='info@a.de', country='Germany')
+    assert agency['email'] == agency.get('email') == 'info@a.de'
+    assert agency.get('missing', 'x') == 'x'
+    assert dict(agency, source='S')['source'] == 'S'
+    assert agency == {'name': 'A', 'email': 'info@a.de', 'phone': '', 'address': '', 'country': 'Germany',
+                      'website': '', 'regions': '', 'specialties': ''}
+
+    agency['specialties'] = ''.join(['Acting ', 'agency'])
+    assert agency.specialties is AgencyRecord(specialties='Acting agency').specialties  # interned
+
+    job = JobRecord(raw_text='Title\ntext')
+    job.drop_raw_text()
+    assert job['raw_text'] is None and job['is_target_category']
+
+
+def test_csv_and_json_round_trip():
+    agencies = [AgencyRecord(name='A, "quoted"', email='a@a.de'), {'name': 'B', 'email': 'b@b.de'}]
+    out = io.StringIO()
+    write_csv(agencies, out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == 'name,email,phone,address,country,website,regions,specialties'
+    assert lines[1].startswith('"A, ""quoted""",a@a.de') and lines[2].startswith('B,b@b.de')
+
+    restored = AgencyRecord.from_dict(json.loads(json.dumps(agencies[0], default=json_default)))
+    assert restored == agencies[0]
+
+
+if __name__ == '__main__':
+    test_records_read_like_dicts()
+    test_csv_and_json_round_trip()
+    print("🎉 Record tests PASSED!")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable send journal
+"""
+
+import os
+import tempfile
+from send_journal import SendJournal, IN_FLIGHT, SENT, FAILED
+
+
+def test_restart_resumes_where_it_stopped():
+    emails = ['a@x.de', 'b@x.de', 'c@x.de', 'd@x.de']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'emails.txt.journal')
+
+        # First run: a sent, b failed, c in flight when the process died
+        journal = SendJournal(path)
+        assert journal.resume(emails) == emails
+        journal.mark('a@x.de', IN_FLIGHT)
+        journal.mark('a@x.de', SENT)
+        journal.mark('b@x.de', IN_FLIGHT)
+        journal.mark('b@x.de', FAILED, error='550 mailbox unavailable')
+        journal.mark('c@x.de', IN_FLIGHT)
+        journal.log.close()  # no compaction: simulate a kill
+        with open(path, 'a') as f:
+            f.write('{"email": "d@x.de", "sta')  # torn last write
+
+        with SendJournal(path) as journal:
+            assert journal.resume(emails) == ['b@x.de', 'c@x.de', 'd@x.de']
+            assert journal.attempts('b@x.de') == 1 and journal.attempts('c@x.de') == 1
+
+        # Closing compacts to one line per recipient
+        with open(path) as f:
+            assert len(f.readlines()) == 4
+
+
+def test_gives_up_after_max_attempts():
+    with tempfile.TemporaryDirectory() as tmp:
+        with SendJournal(os.path.join(tmp, 'j')) as journal:
+            journal.resume(['a@x.de'])
+            for _ in range(2):
+                journal.mark('a@x.de', IN_FLIGHT)
+                journal.mark('a@x.de', FAILED, error='timeout')
+            assert journal.resume(['a@x.de'], max_attempts=3) == ['a@x.de']
+            journal.mark('a@x.de', IN_FLIGHT)
+            journal.mark('a@x.de', FAILED, error='timeout')
+            assert journal.resume(['a@x.de'], max_attempts=3) == []
+
+
+if __name__ == '__main__':
+    test_restart_resumes_where_it_stopped()
+    test_gives_up_after_max_attempts()
+    print("🎉 Send journal tests PASSED!")
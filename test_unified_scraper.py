@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for combining the results of several scrapers
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import threading
+import pytest
+import driver_manager
+import filmmakers_scraper
+import main
+import unified_scraper
+from contact_store import ContactStore
+from unified_scraper import combine_emails
+
+
+def test_sites_are_merged_as_they_finish():
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            def finishing_sites():
+                yield 'Filmmakers.eu', ['a@x.de', 'b@x.de']
+                # The first site is already deduplicated while the second is still running
+                with ContactStore() as store:
+                    assert store.known(['a@x.de', 'b@x.de']) == {'a@x.de', 'b@x.de'}
+                yield 'Crew-United', None  # crashed
+                yield 'Crew-United', ['b@x.de', 'c@x.de']
+
+            assert combine_emails(finishing_sites())
+            with open(glob.glob('combined_emails_*.txt')[0]) as f:
+                assert f.read().split() == ['a@x.de', 'b@x.de', 'c@x.de']
+        finally:
+            os.chdir(cwd)
+
+
+class FakePool:
+    """DriverPool stand-in handing out placeholder drivers"""
+
+    def __init__(self, size):
+        self.size = size
+        self.borrowed = []
+        self.released = []
+        self.closed = False
+
+    def acquire(self):
+        driver = object()
+        self.borrowed.append(driver)
+        return driver
+
+    def release(self, driver):
+        self.released.append(driver)
+
+    def close_all(self):
+        self.closed = True
+
+
+def test_sites_run_at_once_and_yield_in_finishing_order(monkeypatch):
+    pools = []
+    monkeypatch.setattr(driver_manager, 'DriverPool', lambda size: pools.append(FakePool(size)) or pools[-1])
+    crew_started, first_merged = threading.Event(), threading.Event()
+
+    def crew_united(driver):
+        # Still running until filmmakers.eu's result has been handed on
+        crew_started.set()
+        assert first_merged.wait(5)
+        return ['crew@x.de']
+
+    def filmmakers(driver_pool):
+        assert driver_pool is pools[0]
+        assert crew_started.wait(5)  # both sites are running at the same time
+        return ['agency@x.de']
+
+    monkeypatch.setattr(main, 'scrape_crew_united_emails', crew_united)
+    monkeypatch.setattr(filmmakers_scraper, 'scrape_filmmakers_emails', filmmakers)
+    results = []
+    for result in unified_scraper.run_sites_concurrently(['Crew-United', 'Filmmakers.eu']):
+        results.append(result)
+        first_merged.set()
+    assert results == [('Filmmakers.eu', ['agency@x.de']), ('Crew-United', ['crew@x.de'])]
+    pool, = pools
+    assert pool.size == 2 and pool.borrowed == pool.released and pool.closed
+
+    # A crashing site yields None and doesn't stop the other
+    first_merged.set()
+
+    def crashing(driver_pool):
+        raise RuntimeError("navigation failed")
+
+    monkeypatch.setattr(filmmakers_scraper, 'scrape_filmmakers_emails', crashing)
+    results = dict(unified_scraper.run_sites_concurrently(['Crew-United', 'Filmmakers.eu']))
+    assert results == {'Crew-United': ['crew@x.de'], 'Filmmakers.eu': None}
+    assert pools[1].borrowed == pools[1].released and pools[1].closed
+
+
+@pytest.mark.parametrize('flag', ['--sequential', None])
+def test_sites_that_find_nothing_are_a_successful_run(monkeypatch, tmp_path, flag):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['unified_scraper.py'] + ([flag] if flag else []))
+    # Sequential runs call each site's main(), which returns True for a crawl that found nothing
+    monkeypatch.setattr(unified_scraper, 'run_crew_united_scraper', lambda: True)
+    monkeypatch.setattr(unified_scraper, 'run_filmmakers_scraper', lambda: True)
+    monkeypatch.setattr(unified_scraper, 'run_sites_concurrently', lambda sites: iter([(site, []) for site in sites]))
+    assert unified_scraper.main()
+    assert not glob.glob('combined_emails_*.txt')
+
+    # Sites that failed still fail the run
+    monkeypatch.setattr(unified_scraper, 'run_crew_united_scraper', lambda: False)
+    monkeypatch.setattr(unified_scraper, 'run_filmmakers_scraper', lambda: False)
+    monkeypatch.setattr(unified_scraper, 'run_sites_concurrently', lambda sites: iter([(site, None) for site in sites]))
+    assert not unified_scraper.main()
+
+
+if __name__ == '__main__':
+    test_sites_are_merged_as_they_finish()
+    print("🎉 Unified scraper tests PASSED!")
@@ -3,68 +3,163 @@
 import sys
 from datetime import datetime
 from utils import filter_new_emails, archive_email_files
+from dedup import DedupState
+import metrics
+from profiling import maybe_profile, pop_profile_flag
+from log import get_logger
 import os
 
+log = get_logger('unified_scraper')
+
+@metrics.timed('scrape.crew_united')
 def run_crew_united_scraper():
     """Run the crew-united scraper"""
-    print("🎬 STARTING CREW-UNITED SCRAPER")
-    print("="*50)
+    log.info("🎬 STARTING CREW-UNITED SCRAPER")
     
     from main import main as crew_main
     return crew_main()
 
+@metrics.timed('scrape.filmmakers')
 def run_filmmakers_scraper():
     """Run the filmmakers.eu scraper"""
-    print("\n🌐 STARTING FILMMAKERS.EU SCRAPER")
-    print("="*50)
+    log.info("🌐 STARTING FILMMAKERS.EU SCRAPER")
     
     from filmmakers_scraper import main as filmmakers_main
     return filmmakers_main()
 
-def combine_email_files():
-    """Combine emails from both scrapers into one deduplicated file"""
-    import glob
+def run_sites_concurrently(sites):
+    """Run several site scrapers at once, each borrowing a driver from a bounded pool.
+
+    Yields (source_label, emails) as each site finishes so results can be merged
+    while the slower site is still running. `emails` is None for a site that
+    failed; an empty list is a successful run that found nothing.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from driver_manager import DriverPool
+    from main import scrape_crew_united_emails
+    from filmmakers_scraper import scrape_filmmakers_emails
     
-    # Find the most recent email files
-    crew_files = glob.glob('emails_*.txt')
-    filmmakers_files = glob.glob('filmmakers_emails_*.txt')
+    def crew_united(pool):
+        driver = pool.acquire()
+        try:
+            return scrape_crew_united_emails(driver)
+        finally:
+            pool.release(driver)
     
-    all_emails = []
-    sources = []
+    runners = {
+        'Crew-United': metrics.timed('scrape.crew_united')(crew_united),
+        'Filmmakers.eu': metrics.timed('scrape.filmmakers')(scrape_filmmakers_emails),
+    }
+    
+    pool = DriverPool(size=len(sites))
+    try:
+        with ThreadPoolExecutor(max_workers=len(sites), thread_name_prefix='scraper') as executor:
+            futures = {executor.submit(runners[site], pool): site for site in sites}
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    emails = future.result()
+                except Exception as e:
+                    log.error("❌ %s scraper crashed: %s", site, e, site=site, exc_info=True)
+                    emails = None
+                log.info("📥 %s finished: %d emails", site, len(emails) if emails else 0,
+                         site=site, emails=len(emails) if emails else 0)
+                yield site, emails
+    finally:
+        pool.close_all()
+
+
+@metrics.timed('scrape.stream')
+def stream_sites(sites):
+    """Scrape several sites at once and stream their emails through the pipeline as pages come in.
+
+    Each new email is validated, deduplicated across sites and against every
+    previous scrape, appended to a combined_emails file and queued in its
+    send journal while the scrapers are still paginating.
+    """
+    import pipeline
+    from driver_manager import DriverPool
+    from navigator import CrewUnitedNavigator
+    from job_scraper import CrewUnitedJobScraper
+    from filmmakers_scraper import FilmmakersScraper
+    from contact_store import ContactStore
+    from send_journal import SendJournal
     
-    # Get emails from crew-united files
-    if crew_files:
-        crew_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        latest_crew = crew_files[0]
+    pool = DriverPool(size=len(sites))
+    
+    def crew_united(emit):
+        driver = pool.acquire()
         try:
-            with open(latest_crew, 'r', encoding='utf-8') as f:
-                crew_emails = [line.strip() for line in f if line.strip()]
-            all_emails.extend(crew_emails)
-            sources.append(f"Crew-United: {len(crew_emails)} emails from {latest_crew}")
-        except Exception as e:
-            print(f"⚠️  Error reading {latest_crew}: {str(e)}")
+            if not CrewUnitedNavigator(driver).navigate_to_jobs_page():
+                raise RuntimeError("navigation failed")
+            for job in CrewUnitedJobScraper(driver).iter_jobs():
+                emit(job)
+        finally:
+            pool.release(driver)
     
-    # Get emails from filmmakers files
-    if filmmakers_files:
-        filmmakers_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        latest_filmmakers = filmmakers_files[0]
+    def filmmakers(emit):
+        scraper = FilmmakersScraper(None, driver_pool=pool)
+        scraper.record_sink = emit
         try:
-            with open(latest_filmmakers, 'r', encoding='utf-8') as f:
-                filmmakers_emails = [line.strip() for line in f if line.strip()]
-            all_emails.extend(filmmakers_emails)
-            sources.append(f"Filmmakers.eu: {len(filmmakers_emails)} emails from {latest_filmmakers}")
-        except Exception as e:
-            print(f"⚠️  Error reading {latest_filmmakers}: {str(e)}")
+            if not scraper.navigate_and_setup_filters():
+                raise RuntimeError("navigation failed")
+            scraper.resume_from_checkpoint(extract_full_data=False)
+            scraper.scrape_all_pages(extract_full_data=False)
+        finally:
+            scraper.close()
     
-    if not all_emails:
-        print("⚠️  No email files found to combine")
-        return False
+    producers = {'Crew-United': crew_united, 'Filmmakers.eu': filmmakers}
+    combined_filename = f"combined_emails_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    
+    try:
+        with ContactStore() as store, SendJournal.for_file(combined_filename) as journal:
+            store.import_archive()
+            records = pipeline.merge({site: producers[site] for site in sites})
+            records = pipeline.validate(records)
+            records = pipeline.dedup(records)
+            records = pipeline.filter_known(records, store)
+            records = pipeline.write_emails(records, combined_filename)
+            records = pipeline.enqueue_for_send(records, journal)
+            counts = pipeline.drain(records)
+    finally:
+        pool.close_all()
+    
+    if not counts:
+        os.remove(combined_filename + '.journal')  # nothing was queued
+        log.info("✅ No new emails found after deduplication")
+        return True
+    
+    for site in sites:
+        log.info("📊 %s: %d new emails", site, counts.get(site, 0), site=site, new_emails=counts.get(site, 0))
+    log.info("📧 Total unique new emails: %d, saved to %s (queued for sending)", sum(counts.values()),
+             combined_filename, new_emails=sum(counts.values()), file=combined_filename)
+    return True
+
+@metrics.timed('combine')
+def combine_emails(sources):
+    """Combine (source_label, emails) pairs into one deduplicated file of new emails.
+
+    `sources` may be a generator such as run_sites_concurrently: each site is
+    deduplicated as soon as it arrives, while the slower one is still running.
+    """
+    source_summaries = []
+    
+    # Apply deduplication against every previous scrape, recording where each email came from
+    new_emails = DedupState()
+    for label, emails in sources:
+        if not emails:
+            continue
+        source_summaries.append(f"{label}: {len(emails)} emails")
+        new_emails.add_all(filter_new_emails(emails, source=label.split(' (')[0]))
+        log.info("🔗 Merged %s: %d unique new emails so far", label, len(new_emails))
     
-    # Apply deduplication against previous combined scrapes
-    new_emails = filter_new_emails(all_emails)
+    if not source_summaries:
+        # Sites that failed are reported by the caller; finding nothing is not a failure
+        log.info("✅ No emails found to combine")
+        return True
     
     if not new_emails:
-        print("✅ No new emails found after deduplication")
+        log.info("✅ No new emails found after deduplication")
         return True
     
     # Save combined deduplicated emails
@@ -72,72 +167,102 @@ def combine_email_files():
     combined_filename = f'combined_emails_{timestamp}.txt'
     
     try:
-        # Remove duplicates within current batch while preserving order
-        unique_emails = list(dict.fromkeys(new_emails))
+        # Duplicates across sources were already dropped, order preserved
+        unique_emails = new_emails.items()
         
         with open(combined_filename, 'w', encoding='utf-8') as f:
             for email in unique_emails:
                 f.write(f"{email}\n")
         
-        print(f"\n📊 COMBINATION RESULTS:")
-        print("="*50)
-        for source in sources:
-            print(f"   {source}")
-        print(f"   📧 Total unique new emails: {len(unique_emails)}")
-        print(f"   📄 Saved to: {combined_filename}")
+        for source in source_summaries:
+            log.info("📊 %s", source)
+        log.info("📧 Total unique new emails: %d, saved to %s", len(unique_emails), combined_filename,
+                 new_emails=len(unique_emails), file=combined_filename)
         
         return True
         
     except Exception as e:
-        print(f"❌ Error saving combined emails: {str(e)}")
+        log.error("❌ Error saving combined emails: %s", e)
         return False
 
+def combine_email_files():
+    """Combine emails from the newest file of each scraper into one deduplicated file"""
+    import glob
+    
+    sources = []
+    for label, pattern in [('Crew-United', 'emails_*.txt'), ('Filmmakers.eu', 'filmmakers_emails_*.txt')]:
+        files = glob.glob(pattern)
+        if not files:
+            continue
+        latest = max(files, key=os.path.getmtime)
+        try:
+            with open(latest, 'r', encoding='utf-8') as f:
+                sources.append((f"{label} ({latest})", [line.strip() for line in f if line.strip()]))
+        except Exception as e:
+            log.warning("⚠️  Error reading %s: %s", latest, e)
+    
+    return combine_emails(sources)
+
 def main():
     """Main function to run unified scraping"""
-    print("🚀 UNIFIED EMAIL SCRAPER")
-    print("Scraping emails from Crew-United AND Filmmakers.eu")
-    print("="*60)
+    log.info("🚀 UNIFIED EMAIL SCRAPER")
     
     # Archive existing email files first
     archive_email_files()
     
     # Parse command line arguments
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('--'):
         scraper_choice = sys.argv[1].lower()
     else:
         scraper_choice = "both"
     
+    sequential = '--sequential' in sys.argv
+    stream = '--stream' in sys.argv
+    
     crew_success = False
     filmmakers_success = False
     
-    if scraper_choice in ["both", "crew", "crew-united"]:
-        crew_success = run_crew_united_scraper()
-    
-    if scraper_choice in ["both", "filmmakers", "filmmakers.eu"]:
-        filmmakers_success = run_filmmakers_scraper()
-    
-    if scraper_choice == "both" and (crew_success or filmmakers_success):
-        print(f"\n🔗 COMBINING RESULTS")
-        print("="*50)
-        combine_success = combine_email_files()
+    if scraper_choice == "both" and stream:
+        # Emails flow to the combined file and send journal while both sites are still paginating
+        log.info("🌊 Streaming both scrapers through the pipeline")
+        crew_success = filmmakers_success = combine_success = stream_sites(['Crew-United', 'Filmmakers.eu'])
+    elif scraper_choice == "both" and not sequential:
+        # Both sites in parallel; results are merged in memory as each one finishes
+        log.info("⚡ Running both scrapers concurrently (use --sequential to run one after the other)")
+        finished = {}
+        
+        def track(results):
+            for site, emails in results:
+                finished[site] = emails is not None
+                yield site, emails
+        
+        log.info("🔗 COMBINING RESULTS AS EACH SITE FINISHES")
+        combine_success = combine_emails(track(run_sites_concurrently(['Crew-United', 'Filmmakers.eu'])))
+        crew_success = finished.get('Crew-United', False)
+        filmmakers_success = finished.get('Filmmakers.eu', False)
     else:
-        combine_success = True  # Don't fail if only running one scraper
+        if scraper_choice in ["both", "crew", "crew-united"]:
+            crew_success = run_crew_united_scraper()
+        
+        if scraper_choice in ["both", "filmmakers", "filmmakers.eu"]:
+            filmmakers_success = run_filmmakers_scraper()
+        
+        if scraper_choice == "both" and (crew_success or filmmakers_success):
+            log.info("🔗 COMBINING RESULTS")
+            combine_success = combine_email_files()
+        else:
+            combine_success = True  # Don't fail if only running one scraper
     
     # Summary
-    print(f"\n📊 FINAL SUMMARY")
-    print("="*50)
-    
     if scraper_choice in ["both", "crew", "crew-united"]:
-        status = "✅ Success" if crew_success else "❌ Failed"
-        print(f"   Crew-United: {status}")
+        log.info("📊 Crew-United: %s", "✅ Success" if crew_success else "❌ Failed", site='Crew-United', ok=bool(crew_success))
     
     if scraper_choice in ["both", "filmmakers", "filmmakers.eu"]:
-        status = "✅ Success" if filmmakers_success else "❌ Failed"
-        print(f"   Filmmakers.eu: {status}")
+        log.info("📊 Filmmakers.eu: %s", "✅ Success" if filmmakers_success else "❌ Failed",
+                 site='Filmmakers.eu', ok=bool(filmmakers_success))
     
     if scraper_choice == "both":
-        status = "✅ Success" if combine_success else "❌ Failed"
-        print(f"   Combination: {status}")
+        log.info("📊 Combination: %s", "✅ Success" if combine_success else "❌ Failed", ok=bool(combine_success))
     
     overall_success = (
         (scraper_choice in ["both", "crew", "crew-united"] and crew_success) or
@@ -145,13 +270,13 @@ def main():
     ) and combine_success
     
     if overall_success:
-        print(f"\n🎉 ALL SCRAPING COMPLETED SUCCESSFULLY!")
-        print(f"🚀 Ready to send emails! Run: make send")
+        log.info("🎉 ALL SCRAPING COMPLETED SUCCESSFULLY! Ready to send emails: make send")
     else:
-        print(f"\n⚠️  SOME ISSUES OCCURRED")
-        print(f"Check the output above for details")
+        log.warning("⚠️  SOME ISSUES OCCURRED - check the output above for details")
     
     return overall_success
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    with maybe_profile('unified', pop_profile_flag()):
+        main()
+    metrics.emit('unified')
\ No newline at end of file
@@ -2,6 +2,9 @@ import os
 import glob
 from datetime import datetime
 import shutil
+from log import get_logger
+
+log = get_logger('utils')
 
 def archive_email_files():
     """Move existing email files to dated archive folders"""
@@ -27,10 +30,10 @@ def archive_email_files():
             
             # Move file to dated folder
             shutil.move(file, os.path.join(date_folder, file))
-            print(f"Archived {file} to {readable_date}/")
+            log.info("Archived %s to %s/", file, readable_date)
             
         except Exception as e:
-            print(f"Error archiving {file}: {str(e)}")
+            log.warning("Error archiving %s: %s", file, e)
 
 
 def get_most_recent_email_file():
@@ -66,47 +69,64 @@ def load_previous_emails():
     recent_file = get_most_recent_email_file()
     
     if not recent_file:
-        print("📧 No previous email files found - all emails will be considered new")
+        log.info("📧 No previous email files found - all emails will be considered new")
         return set()
     
     try:
         with open(recent_file, 'r', encoding='utf-8') as f:
             previous_emails = set(line.strip() for line in f if line.strip())
         
-        print(f"📧 Loaded {len(previous_emails)} emails from previous scrape: {os.path.basename(recent_file)}")
+        log.info("📧 Loaded %d emails from previous scrape: %s", len(previous_emails), os.path.basename(recent_file))
         return previous_emails
         
     except Exception as e:
-        print(f"❌ Error loading previous emails from {recent_file}: {str(e)}")
+        log.error("❌ Error loading previous emails from %s: %s", recent_file, e)
         return set()
 
 
-def filter_new_emails(current_emails, previous_emails=None):
-    """Filter out emails that were in the previous scrape"""
+def filter_new_emails(current_emails, previous_emails=None, source='scrape'):
+    """Filter out emails that were seen in any previous scrape.
+
+    Checks the full history in the contact store (importing archived_scrapes
+    the first time). Passing `previous_emails` compares against that set instead.
+    Addresses are compared normalized (stripped, lowercased), like the store does.
+    """
+    from contact_store import ContactStore, normalize_email
+    current_keys = {normalize_email(email) for email in current_emails if email.strip()}
     if previous_emails is None:
-        previous_emails = load_previous_emails()
-    
-    if not previous_emails:
-        print(f"✨ All {len(current_emails)} emails are new (no previous scrape to compare)")
-        return current_emails
-    
-    # Convert current emails to set for efficient comparison
-    current_email_set = set(current_emails)
-    
-    # Find new emails (not in previous scrape)
-    new_emails = current_email_set - previous_emails
-    
-    # Find repeated emails (for reporting)
-    repeated_emails = current_email_set & previous_emails
+        with ContactStore() as store:
+            imported = store.import_archive()
+            if imported:
+                log.info("📥 Imported %d archived emails into the contact store", imported)
+            history_size = store.count()
+            new_emails = store.filter_new(current_emails, source)
+        repeated_emails = current_keys - {normalize_email(email) for email in new_emails}
+        log.info("📇 Compared against %d previously scraped emails", history_size)
+    else:
+        if not previous_emails:
+            log.info("✨ All %d emails are new (no previous scrape to compare)", len(current_emails))
+            return current_emails
+        
+        previous_keys = {normalize_email(email) for email in previous_emails}
+        
+        # Find new emails (not in previous scrape), first spelling of each kept, in order
+        new_emails = []
+        seen = set(previous_keys)
+        for email in current_emails:
+            key = normalize_email(email)
+            if key and key not in seen:
+                seen.add(key)
+                new_emails.append(email.strip())
+        
+        # Find repeated emails (for reporting)
+        repeated_emails = current_keys & previous_keys
     
-    print(f"📊 Email comparison results:")
-    print(f"   🆕 New emails: {len(new_emails)}")
-    print(f"   🔄 Repeated emails: {len(repeated_emails)}")
-    print(f"   📧 Total current emails: {len(current_emails)}")
+    log.info("📊 Email comparison results: %d new, %d repeated, %d total", len(new_emails), len(repeated_emails),
+             len(current_emails), source=source, new_emails=len(new_emails), repeated=len(repeated_emails))
     
     if repeated_emails and len(repeated_emails) <= 5:
-        print(f"   🔄 Repeated: {', '.join(sorted(repeated_emails))}")
+        log.debug("   🔄 Repeated: %s", ', '.join(sorted(repeated_emails)))
     elif repeated_emails:
-        print(f"   🔄 Repeated: {', '.join(sorted(list(repeated_emails)[:3]))} and {len(repeated_emails)-3} more...")
+        log.debug("   🔄 Repeated: %s and %d more...", ', '.join(sorted(list(repeated_emails)[:3])), len(repeated_emails) - 3)
     
-    return list(new_emails)
+    return new_emails